@@ -0,0 +1,110 @@
+"""
+Microbenchmark: CameraCapture ring buffer vs the previous copy-on-write / copy-on-read capture.
+Uses a synthetic source (no webcam needed). Run with: python benchmarks/bench_camera_ring.py
+"""
+
+import argparse
+import threading
+import time
+import tracemalloc
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from src.vision.camera import CameraCapture
+
+
+class SyntheticSource:
+    """Stands in for cv2.VideoCapture: 'decodes' a fixed frame into the caller's buffer when given one."""
+
+    def __init__(self, width, height):
+        self._frame = np.random.default_rng(0).integers(0, 255, (height, width, 3), dtype=np.uint8)
+
+    def isOpened(self):
+        return True
+
+    def set(self, prop, value):
+        return True
+
+    def read(self, image=None):
+        if image is not None and image.shape == self._frame.shape:
+            np.copyto(image, self._frame)
+            return True, image
+        return True, self._frame.copy()
+
+    def release(self):
+        pass
+
+
+class LegacyCapture:
+    """The pre-ring implementation: copy under the lock on capture, copy again on read."""
+
+    def __init__(self, source):
+        self._cap = source
+        self._frame = None
+        self._lock = threading.Lock()
+
+    def _grab(self):
+        ret, frame = self._cap.read()
+        if ret:
+            with self._lock:
+                self._frame = frame.copy()
+        return ret
+
+    def read(self):
+        with self._lock:
+            return self._frame.copy() if self._frame is not None else None
+
+
+def _measure(fn, iterations):
+    """Mean latency (us) and allocated bytes per call, from tracemalloc peaks."""
+    fn()
+    total_bytes = 0
+    allocs = 0
+    t_total = 0.0
+    tracemalloc.start()
+    for _ in range(iterations):
+        before = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        t0 = time.perf_counter()
+        fn()
+        t_total += time.perf_counter() - t0
+        grown = tracemalloc.get_traced_memory()[1] - before
+        if grown > 4096:
+            allocs += 1
+            total_bytes += grown
+    tracemalloc.stop()
+    return 1e6 * t_total / iterations, allocs / iterations, total_bytes / iterations
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--width", type=int, default=640)
+    parser.add_argument("--height", type=int, default=480)
+    parser.add_argument("--iterations", type=int, default=500)
+    parser.add_argument("--fps", type=float, default=30.0, help="camera rate used to express allocations/sec")
+    args = parser.parse_args()
+
+    legacy = LegacyCapture(SyntheticSource(args.width, args.height))
+    ring = CameraCapture(width=args.width, height=args.height, source=SyntheticSource(args.width, args.height))
+    ring.open()
+
+    rows = [
+        ("legacy capture", _measure(legacy._grab, args.iterations)),
+        ("legacy read()", _measure(legacy.read, args.iterations)),
+        ("ring capture", _measure(ring.grab, args.iterations)),
+        ("ring read() copy", _measure(ring.read, args.iterations)),
+        ("ring borrow()", _measure(ring.borrow, args.iterations)),
+    ]
+    print(f"{args.width}x{args.height} BGR, {args.iterations} iterations, allocations/sec at {args.fps:.0f} fps")
+    print(f"{'path':<18}{'latency us':>12}{'allocs/call':>13}{'KB/call':>10}{'allocs/s':>10}{'MB/s':>8}")
+    for name, (lat_us, allocs, nbytes) in rows:
+        print(
+            f"{name:<18}{lat_us:>12.1f}{allocs:>13.2f}{nbytes / 1024:>10.0f}"
+            f"{allocs * args.fps:>10.1f}{nbytes * args.fps / 1e6:>8.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Benchmark: cloud scroll and wrap, one CloudField vs per-cloud CloudEntity updates.
+The per-cloud loop reproduces the old GameScene.update (x drift and wrap per entity,
+then a second pass wrapping clouds that fell behind the camera) with a minimal entity
+stand-in; on the real renderer each of those clouds is also its own draw call. The
+CloudField path times the vectorized step plus copying the vertex rows of clouds
+that wrapped. The stand-in entity has plain attributes, so the per-cloud column
+understates the real cost (each Ursina x/z write goes through the scene graph).
+No window needed.
+Run with: python benchmarks/bench_clouds.py [--clouds 30 300 3000] [--frames 600]
+"""
+
+import argparse
+import time
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from src.graphics.scene import CloudField
+
+
+class _Entity:
+    __slots__ = ("x", "y", "z")
+
+    def __init__(self, x, y, z):
+        self.x, self.y, self.z = x, y, z
+
+
+def bench_entities(n, frames, dt, fly_speed):
+    rng = np.random.default_rng(0)
+    clouds = [_Entity(*p) for p in rng.uniform((-60, 5, 20), (60, 40, 200), (n, 3)).tolist()]
+    cam_z = 0.0
+    t0 = time.perf_counter()
+    for _ in range(frames):
+        for c in clouds:
+            c.x -= 2.0 * dt
+            if c.x < -80:
+                c.x = 80
+        cam_z += fly_speed * dt
+        for c in clouds:
+            if c.z < cam_z - 30:
+                c.z += 230
+    return 1000.0 * (time.perf_counter() - t0) / frames
+
+
+def bench_field(n, frames, dt, fly_speed):
+    field = CloudField(count=n, rng=np.random.default_rng(0))
+    vertices = field.vertices()
+    cam_z = 0.0
+    t0 = time.perf_counter()
+    for _ in range(frames):
+        cam_z += fly_speed * dt
+        for slot in field.step(dt, cam_z).tolist():
+            start, stop = field.cloud_rows(slot)
+            vertices[start:stop].tobytes()  # stands in for CloudMesh's per-cloud subdata copy
+    return 1000.0 * (time.perf_counter() - t0) / frames, field.rewrites
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--clouds", type=int, nargs="+", default=[30, 300, 3000])
+    parser.add_argument("--frames", type=int, default=600)
+    parser.add_argument("--dt", type=float, default=1 / 60)
+    parser.add_argument("--fly-speed", type=float, default=20.0)
+    args = parser.parse_args()
+
+    print(f"{args.frames} frames at fly speed {args.fly_speed}")
+    print(f"{'clouds':>8}{'entities ms':>13}{'field ms':>10}{'speedup':>9}{'rewrites':>10}{'draw calls':>12}")
+    for n in args.clouds:
+        ent_ms = bench_entities(n, args.frames, args.dt, args.fly_speed)
+        field_ms, rewrites = bench_field(n, args.frames, args.dt, args.fly_speed)
+        print(f"{n:>8}{ent_ms:>13.4f}{field_ms:>10.4f}{ent_ms / field_ms:>8.1f}x{rewrites:>10}{f'{n} -> 1':>12}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+"""
+Benchmark: beam vs enemy hit detection, uniform-grid broad phase vs the original nested loop.
+Beams and enemies are plain stand-ins spread through the play volume in front of the
+camera; the legacy loop uses a minimal Python Vec3 with the same per-pair allocations
+as ursina's. No window needed. Legacy runs are skipped above --legacy-max-pairs.
+A second table fires beams through a drone field at several frame rates and counts
+hits for a current-point test vs the swept test, showing tunneling at low FPS.
+Run with: python benchmarks/bench_collision.py [--sizes 10,100,1000,5000] [--fps 60,30,15,10]
+"""
+
+import argparse
+import time
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from src.game.collision import check_all_beams_vs_enemies, SpatialGrid
+
+
+class _Vec3:
+    """Just enough of ursina.Vec3 for the legacy narrow phase."""
+
+    __slots__ = ("x", "y", "z")
+
+    def __init__(self, x, y=None, z=None):
+        if y is None:
+            x, y, z = x
+        self.x, self.y, self.z = x, y, z
+
+    def __sub__(self, o):
+        return _Vec3(self.x - o[0], self.y - o[1], self.z - o[2])
+
+    def __getitem__(self, i):
+        return (self.x, self.y, self.z)[i]
+
+    def __iter__(self):
+        return iter((self.x, self.y, self.z))
+
+    def length_squared(self):
+        return self.x * self.x + self.y * self.y + self.z * self.z
+
+
+class _Entity:
+    def __init__(self, scale):
+        self.scale = scale
+
+
+class _Enemy:
+    def __init__(self, pos, size):
+        self.position = _Vec3(pos)
+        self.entity = _Entity((size * 0.8, size * 1.2, size * 0.6))
+        self.radius = size * 1.2
+
+    def get_position(self):
+        return self.position
+
+    def is_alive(self):
+        return True
+
+
+class _Beam:
+    def __init__(self, pos):
+        self.position = _Vec3(pos)
+
+    def get_position(self):
+        return self.position
+
+    def is_alive(self):
+        return True
+
+
+class _MovingBeam(_Beam):
+    """Beam stand-in that flies along +z; swept=False hides the previous position (point test)."""
+
+    def __init__(self, pos, speed, swept):
+        super().__init__(pos)
+        self.prev = _Vec3(pos)
+        self.speed = speed
+        self.swept = swept
+        self.alive = True
+
+    def update(self, dt):
+        self.prev = _Vec3(self.position)
+        self.position = _Vec3(self.position.x, self.position.y, self.position.z + self.speed * dt)
+
+    def get_prev_position(self):
+        return self.prev if self.swept else None
+
+    def is_alive(self):
+        return self.alive
+
+
+def tunneling(fps, n_beams, swept, speed=120.0, lifetime=1.0, seed=1):
+    """Fire n_beams through a fixed drone field; return how many hit something."""
+    rng = np.random.default_rng(seed)
+    enemies = [_Enemy(p, 1.0) for p in rng.uniform((-40, -20, 20), (40, 20, 110), (300, 3)).tolist()]
+    beams = [_MovingBeam(p, speed, swept) for p in rng.uniform((-40, -20, 0), (40, 20, 0), (n_beams, 3)).tolist()]
+    grid = SpatialGrid()
+    dt = 1.0 / fps
+    hits = 0
+    for _ in range(int(lifetime * fps)):
+        # Same order as GameManager._update: collide, then move
+        for beam, _enemy in check_all_beams_vs_enemies(beams, enemies, hit_radius=0.5, grid=grid):
+            beam.alive = False
+            hits += 1
+        for beam in beams:
+            beam.update(dt)
+    return hits
+
+
+def legacy_check_all(beams, enemies, hit_radius=3.0):
+    """The original O(beams x enemies) loop with fresh vectors and a scale read per pair."""
+    hits = []
+    for beam in beams:
+        if not beam.is_alive():
+            continue
+        for enemy in enemies:
+            if not enemy.is_alive():
+                continue
+            dist_sq = (_Vec3(beam.get_position()) - _Vec3(enemy.get_position())).length_squared()
+            s = enemy.entity.scale
+            enemy_radius = max(s[0], s[1], s[2])
+            if dist_sq <= (hit_radius + enemy_radius) ** 2:
+                hits.append((beam, enemy))
+                break
+    return hits
+
+
+def _scene(n_beams, n_enemies, seed=0):
+    rng = np.random.default_rng(seed)
+    # Enemies fill a wide band ahead of the camera; beams are in flight through it
+    enemies = [_Enemy(p, s) for p, s in zip(
+        rng.uniform((-200, -60, 10), (200, 60, 300), (n_enemies, 3)).tolist(),
+        rng.choice((1.0, 1.5, 2.0), n_enemies).tolist(),
+    )]
+    beams = [_Beam(p) for p in rng.uniform((-200, -60, 0), (200, 60, 300), (n_beams, 3)).tolist()]
+    return beams, enemies
+
+
+def _best(fn, repeats):
+    best = float("inf")
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return 1000.0 * best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", default="10,100,1000,5000", help="beam and enemy counts to run")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--legacy-max-pairs", type=int, default=2_000_000)
+    parser.add_argument("--fps", default="60,30,15,10", help="frame rates for the tunneling table")
+    parser.add_argument("--tunnel-beams", type=int, default=1000)
+    args = parser.parse_args()
+
+    print(f"{'beams':>7}{'enemies':>9}{'hits':>7}{'legacy ms':>12}{'grid ms':>10}{'speedup':>9}")
+    grid = SpatialGrid()
+    for n in (int(v) for v in args.sizes.split(",")):
+        beams, enemies = _scene(n, n)
+        hits = check_all_beams_vs_enemies(beams, enemies, grid=grid)
+        grid_ms = _best(lambda: check_all_beams_vs_enemies(beams, enemies, grid=grid), args.repeats)
+        if n * n <= args.legacy_max_pairs:
+            legacy = legacy_check_all(beams, enemies)
+            assert [(id(b), id(e)) for b, e in legacy] == [(id(b), id(e)) for b, e in hits]
+            legacy_ms = _best(lambda: legacy_check_all(beams, enemies), max(1, args.repeats // 2))
+            print(f"{n:>7}{n:>9}{len(hits):>7}{legacy_ms:>12.2f}{grid_ms:>10.2f}{legacy_ms / grid_ms:>8.1f}x")
+        else:
+            print(f"{n:>7}{n:>9}{len(hits):>7}{'skipped':>12}{grid_ms:>10.2f}{'':>9}")
+
+    print(f"\n{args.tunnel_beams} beams at 120 u/s through 300 drones")
+    print(f"{'fps':>5}{'step u':>8}{'point hits':>12}{'swept hits':>12}")
+    for fps in (int(v) for v in args.fps.split(",")):
+        point = tunneling(fps, args.tunnel_beams, swept=False)
+        swept = tunneling(fps, args.tunnel_beams, swept=True)
+        print(f"{fps:>5}{120.0 / fps:>8.1f}{point:>12}{swept:>12}")
+
+
+if __name__ == "__main__":
+    main()
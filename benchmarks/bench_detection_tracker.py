@@ -0,0 +1,105 @@
+"""
+Benchmark: DetectionScheduler (YOLO every Nth frame + IoU tracking) vs inference on every frame.
+A synthetic detector returns moving boxes and sleeps for --infer-ms to stand in for
+YOLO on CPU, so no model or webcam is needed. Reports amortized cost per frame, the
+interval chosen, and how far tracked boxes drift from ground truth (mean IoU, ID switches).
+Run with: python benchmarks/bench_detection_tracker.py [--infer-ms 40] [--budget-ms 8] [--every-n 0]
+"""
+
+import argparse
+import time
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from src.vision.yolo_detector import DETECTION_DTYPE
+from src.vision.detection_tracker import DetectionScheduler, iou_matrix
+
+
+class _SyntheticScene:
+    """Objects moving at constant velocity with a little jitter; time advances one frame per step."""
+
+    def __init__(self, objects, fps, seed=0):
+        rng = np.random.default_rng(seed)
+        self.fps = fps
+        self.pos = rng.uniform(50, 500, (objects, 2)).astype(np.float32)
+        self.size = rng.uniform(30, 90, (objects, 2)).astype(np.float32)
+        self.vel = rng.uniform(-120, 120, (objects, 2)).astype(np.float32)  # px per second
+        self.class_id = rng.integers(0, 5, objects).astype(np.int32)
+        self.frame = 0
+
+    @property
+    def t(self):
+        return self.frame / self.fps
+
+    def step(self):
+        self.frame += 1
+        self.pos += self.vel / self.fps
+
+    def truth(self):
+        return np.concatenate([self.pos, self.pos + self.size], axis=1)
+
+
+class _SleepyDetector:
+    """detect_array() stand-in: ground truth boxes after a fixed inference delay."""
+
+    def __init__(self, scene, infer_ms):
+        self.scene = scene
+        self.infer_s = infer_ms / 1000.0
+
+    def detect_array(self, frame):
+        time.sleep(self.infer_s)
+        boxes = self.scene.truth()
+        out = np.empty(len(boxes), dtype=DETECTION_DTYPE)
+        out["x1"], out["y1"], out["x2"], out["y2"] = boxes.T
+        out["class_id"] = self.scene.class_id
+        out["confidence"] = 0.9
+        return out
+
+
+def run(args, every_n):
+    scene = _SyntheticScene(args.objects, args.fps)
+    scheduler = DetectionScheduler(_SleepyDetector(scene, args.infer_ms), every_n=every_n, cpu_budget_ms=args.budget_ms)
+    ious = []
+    id_of_object = {}
+    switches = 0
+    t0 = time.perf_counter()
+    for _ in range(args.frames):
+        tracks = scheduler.process(None, t=scene.t)
+        if len(tracks):
+            boxes = np.stack([tracks["x1"], tracks["y1"], tracks["x2"], tracks["y2"]], axis=1)
+            iou = iou_matrix(scene.truth(), boxes)
+            best = iou.argmax(axis=1)
+            ious.extend(iou.max(axis=1).tolist())
+            for obj, ti in enumerate(best):
+                tid = int(tracks["track_id"][ti])
+                if id_of_object.setdefault(obj, tid) != tid:
+                    switches += 1
+                    id_of_object[obj] = tid
+        scene.step()
+    elapsed = time.perf_counter() - t0
+    stats = scheduler.stats()
+    return elapsed / args.frames * 1000.0, stats, float(np.mean(ious)) if ious else 0.0, switches
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--frames", type=int, default=240)
+    parser.add_argument("--fps", type=float, default=30.0)
+    parser.add_argument("--objects", type=int, default=8)
+    parser.add_argument("--infer-ms", type=float, default=40.0, help="simulated YOLO latency")
+    parser.add_argument("--budget-ms", type=float, default=8.0, help="CPU budget per frame (adaptive mode)")
+    parser.add_argument("--every-n", type=int, default=0, help="fixed interval; 0 = adaptive")
+    args = parser.parse_args()
+
+    print(f"{args.frames} frames, {args.objects} objects, {args.infer_ms:.0f} ms simulated inference")
+    print(f"{'mode':<22}{'ms/frame':>10}{'inferences':>12}{'interval':>10}{'mean IoU':>10}{'ID switches':>13}")
+    modes = [("every frame", 1), ("adaptive" if args.every_n == 0 else f"every {args.every_n}", args.every_n)]
+    for name, n in modes:
+        ms, stats, iou, switches = run(args, n)
+        print(f"{name:<22}{ms:>10.2f}{stats['inferences']:>12}{stats['interval']:>10}{iou:>10.3f}{switches:>13}")
+
+
+if __name__ == "__main__":
+    main()
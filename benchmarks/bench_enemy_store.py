@@ -0,0 +1,111 @@
+"""
+Benchmark: stepping enemies, struct-of-arrays EnemyStore vs per-object UltronEnemy updates.
+The legacy loop reproduces the original UltronEnemy.update (two random.random() calls,
+Vec3 mutation, entity.position store, list rebuild) with a minimal Python Vec3 and
+entity stand-in. The store is timed stepping alone and with the per-entity position sync
+the renderer needs. No window needed.
+Run with: python benchmarks/bench_enemy_store.py [--enemies 10000] [--frames 120]
+"""
+
+import argparse
+import random
+import time
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from src.game.enemy_store import EnemyStore
+
+
+class _Vec3:
+    __slots__ = ("x", "y", "z")
+
+    def __init__(self, x, y, z):
+        self.x, self.y, self.z = x, y, z
+
+
+class _Entity:
+    __slots__ = ("position",)
+
+    def __init__(self, position):
+        self.position = position
+
+
+class _LegacyEnemy:
+    """The original per-object update path."""
+
+    def __init__(self, pos, speed):
+        self.position = _Vec3(*pos)
+        self.speed = speed
+        self.entity = _Entity(self.position)
+        self._alive = True
+
+    def update(self, dt, camera_z=0):
+        if not self._alive or self.entity is None:
+            return False
+        self.position.z -= self.speed * dt
+        self.position.x += (random.random() - 0.5) * 2 * dt
+        self.position.y += (random.random() - 0.5) * 2 * dt
+        if self.entity:
+            self.entity.position = self.position
+        if self.position.z < camera_z - 20:
+            self._alive = False
+            return False
+        return True
+
+
+class _Handle:
+    """What EnemyStore.sync_entities needs from UltronEnemy."""
+
+    __slots__ = ("entity",)
+
+    def __init__(self):
+        self.entity = _Entity(None)
+
+
+def _positions(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.uniform((-15, -5, 60), (15, 15, 1000), (n, 3)).tolist()
+
+
+def bench_legacy(n, frames, dt):
+    enemies = [_LegacyEnemy(p, 12.0) for p in _positions(n)]
+    t0 = time.perf_counter()
+    for _ in range(frames):
+        enemies = [e for e in enemies if e.update(dt, 0)]
+    return 1000.0 * (time.perf_counter() - t0) / frames
+
+
+def bench_store(n, frames, dt, sync):
+    store = EnemyStore(capacity=n, rng=np.random.default_rng(0))
+    for p in _positions(n):
+        store.spawn(p, 30, 12.0, handle=_Handle() if sync else None)
+    t0 = time.perf_counter()
+    for _ in range(frames):
+        store.step(dt, 0.0)
+        if sync:
+            store.sync_entities()
+    return 1000.0 * (time.perf_counter() - t0) / frames
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--enemies", type=int, default=10000)
+    parser.add_argument("--frames", type=int, default=120)
+    parser.add_argument("--dt", type=float, default=1 / 60)
+    args = parser.parse_args()
+
+    rows = [
+        ("per-object update (today)", bench_legacy(args.enemies, args.frames, args.dt)),
+        ("EnemyStore.step", bench_store(args.enemies, args.frames, args.dt, sync=False)),
+        ("step + entity sync", bench_store(args.enemies, args.frames, args.dt, sync=True)),
+    ]
+    base = rows[0][1]
+    print(f"{args.enemies} enemies, {args.frames} frames")
+    for name, ms in rows:
+        print(f"{name:<28}{ms:>9.3f} ms/frame{base / ms:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Benchmark: simulation cost and determinism vs display refresh rate, one step per
+rendered frame (the old loop) vs fixed SIM_TICK_RATE ticks through FixedTimestep.
+Runs the headless GameSimulation with the autopilot for the same stretch of
+display time at each refresh rate and reports ticks run, simulation CPU time per
+displayed second and the final state digest (equal digests = identical gameplay).
+Run with: python benchmarks/bench_fixed_timestep.py [--seconds 60] [--hz 60 144 240] [--seed 1]
+"""
+
+import argparse
+import time
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import config
+from src.game.simulation import GameSimulation, ManualClock, FixedTimestep, AutoPilot
+
+
+def run(hz, seconds, seed, fixed):
+    clock = ManualClock()
+    sim = GameSimulation(seed=seed, clock=clock, render=False)
+    pilot = AutoPilot(np.random.default_rng(seed))
+    timestep = FixedTimestep(config.SIM_TICK_RATE) if fixed else None
+    frame_dt = 1.0 / hz
+    sim.start()
+    spent = 0.0
+    for _ in range(int(round(seconds * hz))):
+        t0 = time.perf_counter()
+        if fixed:
+            for _ in range(timestep.advance(frame_dt)):
+                clock.advance(timestep.dt)
+                sim.step(timestep.dt, pilot(sim))
+        else:
+            clock.advance(frame_dt)
+            sim.step(frame_dt, pilot(sim))
+        spent += time.perf_counter() - t0
+    return sim.ticks, 1000.0 * spent / seconds, sim.player.score, sim.digest()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--seconds", type=float, default=60.0)
+    parser.add_argument("--hz", type=int, nargs="+", default=[60, 144, 240])
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    print(f"{args.seconds:.0f} s of display time, seed {args.seed}, fixed tick rate {config.SIM_TICK_RATE} Hz")
+    print(f"{'mode':<14}{'display Hz':>11}{'ticks':>8}{'sim ms/s':>10}{'score':>8}  digest")
+    for fixed in (False, True):
+        for hz in args.hz:
+            ticks, ms, score, digest = run(hz, args.seconds, args.seed, fixed)
+            mode = "fixed tick" if fixed else "per frame"
+            print(f"{mode:<14}{hz:>11}{ticks:>8}{ms:>10.2f}{score:>8}  {digest}")
+
+
+if __name__ == "__main__":
+    main()
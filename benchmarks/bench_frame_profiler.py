@@ -0,0 +1,67 @@
+"""
+Benchmark: cost of the frame profiler's instrumentation. Times a loop of
+instrumented scopes with profiling disabled (what every game frame pays by
+default) and enabled, against the same loop without scopes, then runs the
+headless simulation with and without profiling.
+Run with: python benchmarks/bench_frame_profiler.py [--iterations 200000] [--ticks 6000]
+"""
+
+import argparse
+import time
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.game.frame_profiler import FrameProfiler, FRAME_PROFILER
+from src.game.simulation import run_headless
+
+
+def work(n=20):
+    total = 0
+    for i in range(n):
+        total += i * i
+    return total
+
+
+def time_loop(iterations, profiler=None):
+    t0 = time.perf_counter()
+    if profiler is None:
+        for _ in range(iterations):
+            work()
+    else:
+        for _ in range(iterations):
+            with profiler.scope("stage"):
+                work()
+    return (time.perf_counter() - t0) / iterations * 1e9
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=200000)
+    parser.add_argument("--ticks", type=int, default=6000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    bare = time_loop(args.iterations)
+    disabled = time_loop(args.iterations, FrameProfiler(enabled=False, trace_path=""))
+    enabled = time_loop(args.iterations, FrameProfiler(enabled=True, trace_path=""))
+    print(f"{args.iterations} iterations of a small block")
+    print(f"{'mode':<24}{'ns/iter':>10}{'overhead ns':>13}")
+    print(f"{'no scope':<24}{bare:>10.0f}{0:>13.0f}")
+    print(f"{'scope, disabled':<24}{disabled:>10.0f}{disabled - bare:>13.0f}")
+    print(f"{'scope, enabled':<24}{enabled:>10.0f}{enabled - bare:>13.0f}")
+
+    print(f"\nheadless simulation, {args.ticks} ticks, seed {args.seed}")
+    print(f"{'mode':<24}{'ticks/s':>10}{'mean tick us':>14}  digest")
+    for mode in ("profiler off", "profiler on"):
+        if mode == "profiler on":
+            FRAME_PROFILER.enable(trace_path="")
+        else:
+            FRAME_PROFILER.disable()
+        stats = run_headless(args.ticks, seed=args.seed)
+        print(f"{mode:<24}{stats['ticks_per_second']:>10.0f}{stats['tick_us']['mean']:>14.1f}  {stats['digest']}")
+    FRAME_PROFILER.disable()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,241 @@
+"""
+Benchmark: per-frame GestureDetector cost, batched NumPy features vs the previous per-landmark tuples.
+Replays a recorded landmark file (src/vision/recording.py) or, by default, a deterministic
+synthetic two-hand stream, in MediaPipe's object layout.
+Run with: python benchmarks/bench_gestures.py [--recording session.lmk]
+"""
+
+import argparse
+import time
+from collections import deque
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from src.vision.gesture_detector import GestureDetector, HandState, landmarks_to_array, hand_features
+from src.vision.recording import load_recording
+
+
+class _Landmark:
+    __slots__ = ("x", "y", "z")
+
+    def __init__(self, x, y, z):
+        self.x, self.y, self.z = x, y, z
+
+
+class _Hand:
+    def __init__(self, points):
+        self.landmark = [_Landmark(float(x), float(y), float(z)) for x, y, z in points]
+
+
+class _Category:
+    def __init__(self, label):
+        self.label = label
+
+
+class _Handedness:
+    def __init__(self, label):
+        self.classification = [_Category(label)]
+
+
+def synthetic_stream(frames, seed=0):
+    """Two hands cycling through open palm, pull-back/release and fist, with jitter."""
+    rng = np.random.default_rng(seed)
+    base = np.zeros((21, 3), dtype=np.float64)
+    base[:, 0] = np.linspace(0.4, 0.6, 21)
+    base[:, 1] = 0.6
+    stream = []
+    for f in range(frames):
+        hands, labels = [], []
+        for h, label in enumerate(("Left", "Right")):
+            pts = base.copy()
+            pts[:, 0] += -0.2 if label == "Left" else 0.2
+            phase = (f // 20 + h) % 3
+            tips, pips = [8, 12, 16, 20], [6, 10, 14, 18]
+            pts[pips, 1] = 0.5
+            pts[tips, 1] = 0.3 if phase != 2 else 0.65  # phase 2 = fist
+            pts[4, 1], pts[3, 1] = (0.45, 0.5) if phase != 2 else (0.6, 0.55)
+            pts[:, 2] = 0.05 * np.sin(f / 4.0) if phase == 1 else 0.0
+            pts += rng.normal(0, 0.005, pts.shape)
+            hands.append(_Hand(pts))
+            labels.append(_Handedness(label))
+        stream.append((hands, labels))
+    return stream
+
+
+def recorded_stream(path):
+    """Frames with at least one hand from a landmark recording."""
+    frames, _ = load_recording(path)
+    return [
+        ([_Hand(h) for h in f.hands], [_Handedness(label) for label in f.labels])
+        for f in frames if len(f.hands)
+    ]
+
+
+class LegacyHandState:
+    """HandGestureState as it was before vectorization: per-landmark tuples, thresholds inline."""
+
+    def __init__(self, pull_back_threshold=0.03, smoothing=0.2):
+        self.state = HandState.IDLE
+        self.pull_back_threshold = pull_back_threshold
+        self.smoothing = smoothing
+        self._z_history = deque(maxlen=15)
+        self._aim_pos = (0.5, 0.5)
+        self._last_fire_time = 0.0
+        self._fire_cooldown = 0.15
+        self._was_charging = False
+
+    def _point(self, landmarks, i):
+        p = landmarks[i]
+        if hasattr(p, "x"):
+            return (p.x, p.y, p.z)
+        return p
+
+    def update(self, landmarks):
+        """Update from 21 landmarks; returns (aim, z, is_open, is_fist) for the equivalence check."""
+        wrist = self._point(landmarks, 0)
+        mid_mcp = self._point(landmarks, 9)
+        x = (wrist[0] + mid_mcp[0]) / 2
+        y = (wrist[1] + mid_mcp[1]) / 2
+        z = wrist[2]
+        self._z_history.append((time.perf_counter(), z))
+        self._aim_pos = (
+            self._aim_pos[0] * (1 - self.smoothing) + x * self.smoothing,
+            self._aim_pos[1] * (1 - self.smoothing) + y * self.smoothing,
+        )
+        is_open = self._is_open_palm(landmarks)
+        is_fist = self._is_closed_fist(landmarks)
+        feats = ((x, y), z, is_open, is_fist)
+        if is_fist:
+            self.state = HandState.RECHARGING
+            self._was_charging = False
+            return feats
+        if not is_open:
+            self.state = HandState.IDLE
+            self._was_charging = False
+            return feats
+        z_velocity = self._z_velocity()
+        now = time.perf_counter()
+        if now - self._last_fire_time < self._fire_cooldown:
+            self.state = HandState.AIMING
+            return feats
+        if z_velocity > self.pull_back_threshold:
+            self._was_charging = True
+            self.state = HandState.CHARGING
+        elif self._was_charging and z_velocity < -self.pull_back_threshold:
+            self.state = HandState.FIRING
+            self._last_fire_time = now
+            self._was_charging = False
+        else:
+            self.state = HandState.AIMING
+            if abs(z_velocity) < self.pull_back_threshold * 0.5:
+                self._was_charging = False
+        return feats
+
+    def _z_velocity(self):
+        if len(self._z_history) < 5:
+            return 0.0
+        t0, z0 = self._z_history[0]
+        t1, z1 = self._z_history[-1]
+        dt = t1 - t0
+        if dt < 1e-6:
+            return 0.0
+        return (z1 - z0) / dt
+
+    def _is_open_palm(self, landmarks):
+        p4, p3 = self._point(landmarks, 4), self._point(landmarks, 3)
+        p8, p6 = self._point(landmarks, 8), self._point(landmarks, 6)
+        p12, p10 = self._point(landmarks, 12), self._point(landmarks, 10)
+        p16, p14 = self._point(landmarks, 16), self._point(landmarks, 14)
+        p20, p18 = self._point(landmarks, 20), self._point(landmarks, 18)
+        thumb_open = p4[1] < p3[1] or abs(p4[0] - p3[0]) > 0.05
+        fingers = p8[1] < p6[1] and p12[1] < p10[1] and p16[1] < p14[1] and p20[1] < p18[1]
+        return fingers or thumb_open
+
+    def _is_closed_fist(self, landmarks):
+        p8, p6 = self._point(landmarks, 8), self._point(landmarks, 6)
+        p12, p10 = self._point(landmarks, 12), self._point(landmarks, 10)
+        p16, p14 = self._point(landmarks, 16), self._point(landmarks, 14)
+        p20, p18 = self._point(landmarks, 20), self._point(landmarks, 18)
+        return p8[1] > p6[1] and p12[1] > p10[1] and p16[1] > p14[1] and p20[1] > p18[1]
+
+
+class LegacyDetector:
+    """GestureDetector.update as it was before vectorization."""
+
+    def __init__(self):
+        self.left = LegacyHandState()
+        self.right = LegacyHandState()
+
+    def update(self, multi_hand_landmarks, multi_handedness):
+        self.left.state = HandState.IDLE
+        self.right.state = HandState.IDLE
+        out = []
+        for landmarks, handedness in zip(multi_hand_landmarks, multi_handedness or []):
+            if hasattr(handedness, "classification") and handedness.classification:
+                label = handedness.classification[0].label
+            else:
+                label = "Right"
+            lm_list = list(landmarks.landmark) if hasattr(landmarks, "landmark") else landmarks
+            out.append((self.left if label == "Left" else self.right).update(lm_list))
+        return out
+
+
+def check_equivalence(stream):
+    legacy = LegacyDetector()
+    mismatches = 0
+    for hands, labels in stream:
+        old = legacy.update(hands, labels)
+        aim, z, is_open, is_fist = hand_features(landmarks_to_array(hands))
+        for i, (o_aim, o_z, o_open, o_fist) in enumerate(old):
+            if o_open != bool(is_open[i]) or o_fist != bool(is_fist[i]):
+                mismatches += 1
+            if abs(o_aim[0] - aim[i, 0]) > 1e-5 or abs(o_aim[1] - aim[i, 1]) > 1e-5 or abs(o_z - z[i]) > 1e-5:
+                mismatches += 1
+    return mismatches
+
+
+def time_per_frame(fns, stream, repeats):
+    """Best us/frame for each fn; repeats are interleaved so drift on a busy machine hits all alike."""
+    best = [float("inf")] * len(fns)
+    for _ in range(repeats):
+        for i, fn in enumerate(fns):
+            t0 = time.perf_counter()
+            for hands, labels in stream:
+                fn(hands, labels)
+            best[i] = min(best[i], time.perf_counter() - t0)
+    return [1e6 * b / len(stream) for b in best]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--frames", type=int, default=2000)
+    parser.add_argument("--repeats", type=int, default=30)
+    parser.add_argument("--recording", help="landmark recording to replay instead of the synthetic stream")
+    args = parser.parse_args()
+
+    stream = recorded_stream(args.recording) if args.recording else synthetic_stream(args.frames)
+    if not stream:
+        parser.error("no frames with hands to replay")
+    mismatches = check_equivalence(stream)
+    legacy = LegacyDetector()
+    detector = GestureDetector()
+    legacy_us, new_us = time_per_frame((legacy.update, detector.update), stream, args.repeats)
+    # Replay-style batching: the whole recording as one (frames * hands, 21, 3) array
+    all_hands = landmarks_to_array([h for hands, _ in stream for h in hands])
+    best = float("inf")
+    for _ in range(args.repeats):
+        t0 = time.perf_counter()
+        hand_features(all_hands)
+        best = min(best, time.perf_counter() - t0)
+    batched_us = 1e6 * best / len(stream)
+    print(f"{len(stream)} frames ({args.recording or 'synthetic, 2 hands'}), best of {args.repeats}")
+    print(f"legacy per-landmark GestureDetector : {legacy_us:8.2f} us/frame")
+    print(f"vectorized GestureDetector          : {new_us:8.2f} us/frame")
+    print(f"batched features over whole replay  : {batched_us:8.2f} us/frame")
+    print(f"feature mismatches vs legacy        : {mismatches}")
+
+
+if __name__ == "__main__":
+    main()
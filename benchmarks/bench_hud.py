@@ -0,0 +1,142 @@
+"""
+Benchmark: HUD updates, unconditional Text rebuilds vs dirty-checked Text vs digit atlas.
+Drives every HUD with the same 60 fps value trace (energy draining on shots and
+recharging, occasional damage, score per kill). Always prints how many Text meshes
+each mode rebuilds and how many digit quads the atlas touches; with Ursina
+installed it also opens a window (default 5120x1440, vsync off) and reports frame
+times for each mode.
+Run with: python benchmarks/bench_hud.py [--frames 3600] [--size 5120 1440] [--no-window]
+"""
+
+import argparse
+import time
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import config
+from src.graphics.hud import GameHUD, URSINA_AVAILABLE, digits_of
+
+
+def value_trace(frames, dt=1 / 60, seed=0):
+    """(health, energy, score, wave) per frame."""
+    rng = np.random.default_rng(seed)
+    health, energy, score, wave = float(config.PLAYER_MAX_HEALTH), float(config.PLAYER_MAX_ENERGY), 0, 1
+    trace = []
+    for i in range(frames):
+        if rng.random() < 4 * dt and energy >= config.REPULSOR_ENERGY_COST:
+            energy -= config.REPULSOR_ENERGY_COST
+        else:
+            energy = min(config.PLAYER_MAX_ENERGY, energy + config.ENERGY_RECHARGE_RATE * dt)
+        if rng.random() < 0.5 * dt:
+            health = max(0.0, health - 10)
+        if rng.random() < 1.0 * dt:
+            score += 25
+        if i and i % 1800 == 0:
+            wave += 1
+        trace.append((health, energy, score, wave))
+    return trace
+
+
+def count_updates(trace):
+    """Text rebuilds per mode and digit quads rewritten by the atlas, without a window."""
+    legacy = 4 * len(trace)
+    dirty = 0
+    uv = 0
+    last = {}
+    shown = {"health": [], "energy": [], "score": []}
+    for health, energy, score, wave in trace:
+        values = {"health": max(0, int(health)), "energy": max(0, int(energy)), "score": score, "wave": wave}
+        for name, value in values.items():
+            if last.get(name) == value:
+                continue
+            last[name] = value
+            dirty += 1
+            if name in shown:
+                # Same slot layout as NumberField: score right-aligned, the others left
+                width = GameHUD.FIELDS[name][4]
+                digits = digits_of(value, width)
+                pad = [None] * (width - len(digits))
+                slots = pad + digits if name == "score" else digits + pad
+                old = shown[name] or [None] * width
+                uv += sum(1 for a, b in zip(old, slots) if a != b and b is not None)
+                shown[name] = slots
+    atlas_text = sum(1 for i in range(1, len(trace)) if trace[i][3] != trace[i - 1][3]) + 1
+    return legacy, dirty, atlas_text, uv
+
+
+class _LegacyHUD(GameHUD):
+    """The original update: all four Text objects reassigned every frame."""
+
+    def update(self, health, energy, score, wave):
+        self.health_text.text = f"HP: {max(0, int(health))}"
+        self.energy_text.text = f"ENERGY: {max(0, int(energy))}"
+        self.score_text.text = f"SCORE: {score}"
+        self.wave_text.text = f"WAVE {wave}"
+
+
+def _hud_entities(hud):
+    entities = [hud.health_text, hud.energy_text, hud.score_text, hud.wave_text]
+    for number in hud.numbers.values():
+        entities.extend(number.quads)
+    return [e for e in entities if e is not None]
+
+
+def bench_window(trace, size, warmup=120):
+    from ursina import Ursina, window, destroy
+    window.size = size
+    app = Ursina(borderless=False, vsync=False, development_mode=False)
+    modes = [
+        ("Text every frame (today)", lambda: _LegacyHUD(*size, digit_atlas_enabled=False)),
+        ("dirty-checked Text", lambda: GameHUD(*size, digit_atlas_enabled=False)),
+        ("dirty-checked + digit atlas", lambda: GameHUD(*size, digit_atlas_enabled=True)),
+    ]
+    results = []
+    for name, make in modes:
+        hud = make()
+        for values in trace[:warmup]:
+            hud.update(*values)
+            app.step()
+        times = []
+        for values in trace:
+            t0 = time.perf_counter()
+            hud.update(*values)
+            app.step()
+            times.append(time.perf_counter() - t0)
+        for entity in _hud_entities(hud):
+            destroy(entity)
+        app.step()
+        ms = 1000.0 * np.asarray(times)
+        results.append((name, ms.mean(), np.percentile(ms, 95)))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--frames", type=int, default=3600)
+    parser.add_argument("--size", type=int, nargs=2, default=list(config.SUPPORTED_RESOLUTIONS["super_ultrawide"]))
+    parser.add_argument("--no-window", action="store_true")
+    args = parser.parse_args()
+
+    trace = value_trace(args.frames)
+    legacy, dirty, atlas_text, uv = count_updates(trace)
+    print(f"{args.frames} frames of HUD values")
+    print(f"{'mode':<30}{'text rebuilds':>15}{'digit UV writes':>17}")
+    print(f"{'Text every frame (today)':<30}{legacy:>15}{0:>17}")
+    print(f"{'dirty-checked Text':<30}{dirty:>15}{0:>17}")
+    print(f"{'dirty-checked + digit atlas':<30}{atlas_text:>15}{uv:>17}")
+
+    if args.no_window:
+        return
+    if not URSINA_AVAILABLE:
+        print("Ursina not installed: skipping the frame-time comparison (pip install ursina)")
+        return
+    print(f"\nframe time at {args.size[0]}x{args.size[1]}, vsync off")
+    print(f"{'mode':<30}{'mean ms':>10}{'p95 ms':>10}")
+    for name, mean, p95 in bench_window(trace, tuple(args.size)):
+        print(f"{name:<30}{mean:>10.3f}{p95:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Benchmark: Jarvis intent fast path. Runs a labelled corpus of game voice
+commands (including misheard words) and open-ended questions through
+IntentMatcher. Reports:
+- accuracy per expected intent
+- how many utterances avoid the LLM call
+- exit status 1 if any utterance gets the wrong intent
+- match + reply latency per utterance
+
+The LLM round trip those utterances used to cost is not called; it is shown as
+the --llm-ms estimate.
+Run with: python benchmarks/bench_intents.py [--repeat 2000] [--llm-ms 700]
+"""
+
+import argparse
+import time
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from src.jarvis.intents import IntentMatcher, ESCALATE
+
+# (utterance, expected intent or "llm")
+CORPUS = [
+    ("status", "status"), ("status report", "status"), ("jarvis give me a sitrep", "status"),
+    ("how am I doing", "status"), ("what's my health and energy", "status"), ("statis", "status"),
+    ("health", "health"), ("what's my health", "health"), ("armor integrity", "health"),
+    ("how much damage have I taken", "health"), ("helth", "health"),
+    ("energy", "energy"), ("how much power do I have", "energy"), ("repulsor charge", "energy"),
+    ("enegry", "energy"),
+    ("score", "score"), ("what's the score", "score"), ("how many points", "score"),
+    ("what wave is this", "wave"), ("which round are we on", "wave"), ("how many hostiles", "wave"),
+    ("help", "help"), ("how do I fire", "help"), ("show me the controls", "help"), ("hepl", "llm"),
+    ("pause", "pause"), ("pause the game", "pause"), ("jarvis hold on", "pause"), ("paws", "llm"),
+    ("resume", "resume"), ("carry on", "resume"), ("unpause", "resume"),
+    ("tell me a joke", "llm"), ("who built you", "llm"), ("what is ultron planning", "llm"),
+    ("do you think Tony Stark would be proud of my flying today jarvis", "llm"),
+    ("thanks jarvis", "llm"), ("i am iron man", "llm"),
+    # Everyday words one edit from a short keyword must not become commands
+    ("i have a question", "llm"), ("save me", "llm"), ("we gave up", "llm"), ("wake up jarvis", "llm"),
+    ("hell yeah", "llm"), ("cause i said so", "llm"), ("that was a nice change", "llm"),
+    ("stealth mode", "llm"), ("jarvis continu", "llm"),
+    # Pause/resume only when the whole utterance is the command; readouts win, negations escalate
+    ("freeze the game", "pause"), ("jarvis please continue", "resume"), ("resume the game now", "resume"),
+    ("hold on what wave is it", "wave"), ("carry on, what's my health", "health"),
+    ("go on tell me more", "llm"), ("start again from the top jarvis", "llm"),
+    ("don't pause", "llm"), ("jarvis do not pause the game", "llm"), ("never stop the game", "llm"),
+    ("don't resume yet", "llm"), ("no, don't continue", "llm"),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=2000)
+    parser.add_argument("--llm-ms", type=float, default=700.0, help="assumed LLM round trip per escalation")
+    args = parser.parse_args()
+
+    matcher = IntentMatcher()
+    state = (72, 18, 4200, 5)
+    correct = 0
+    per_intent = {}
+    for text, expected in CORPUS:
+        local = matcher.respond(text, *state)
+        got = matcher.match(text).intent if local is not None else ESCALATE
+        ok = got == expected
+        correct += ok
+        hits, total = per_intent.get(expected, (0, 0))
+        per_intent[expected] = (hits + ok, total + 1)
+        if not ok:
+            print(f"  mismatch: {text!r} -> {got} (expected {expected})")
+
+    times = []
+    for _ in range(args.repeat):
+        for text, _expected in CORPUS:
+            t0 = time.perf_counter()
+            matcher.respond(text, *state)
+            times.append(time.perf_counter() - t0)
+    us = 1e6 * np.asarray(times)
+    local = sum(1 for _, e in CORPUS if e != ESCALATE)
+
+    print(f"{len(CORPUS)} utterances, {local} answerable locally; accuracy {100 * correct / len(CORPUS):.0f}%")
+    print(f"{'intent':<10}{'correct':>10}")
+    for intent, (hits, total) in sorted(per_intent.items()):
+        print(f"{intent:<10}{hits:>6}/{total:<3}")
+    print(f"\nmatch + reply latency over {len(times)} calls: mean {us.mean():.1f} us  p50 {np.percentile(us, 50):.1f}"
+          f"  p95 {np.percentile(us, 95):.1f}  p99 {np.percentile(us, 99):.1f} us")
+    saved = local * args.llm_ms / 1000.0
+    print(f"LLM calls avoided: {local}/{len(CORPUS)} (~{saved:.1f} s of round trips at {args.llm_ms:.0f} ms each)")
+    stats = matcher.stats.stats()
+    print(f"fuzzy matches: {stats['fuzzy_matches']}; status latency histogram: {stats['intents']['status']['histogram']}")
+    return 0 if correct == len(CORPUS) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,249 @@
+"""
+Benchmark: Jarvis event handling before and after JarvisService. A local fake
+OpenAI server (bench_response_cache.FakeOpenAIServer) answers after --api-ms.
+
+A scripted session runs a 60 fps render loop that announces a wave every
+--wave-s seconds. An STT thread meanwhile delivers chit-chat questions and
+voice commands. Two setups are compared:
+- before: the previous flow. The STT thread waits on the LLM, and every line
+  is spoken on a thread of its own.
+- service: JarvisService, with one event loop and a prioritized speech queue.
+Reported per setup:
+- what the render thread and the STT thread spend per event
+- how many lines play at once
+- event-to-speech latency for wave callouts and chat replies
+- lines spoken after their max age, dropped as stale, or cut short
+- threads started
+
+Speech is modelled by BenchSpeaker, which takes --word-ms per word to "play"
+and can be interrupted.
+Run with: python benchmarks/bench_jarvis_service.py [--waves 8] [--wave-s 2.5] [--api-ms 400]
+"""
+
+import argparse
+import asyncio
+import re
+import threading
+import time
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import config
+from bench_response_cache import FakeOpenAIServer, make_client
+from src.jarvis.conversation import JarvisConversation
+from src.jarvis.intents import IntentMatcher
+from src.jarvis.response_cache import ResponseCache
+from src.jarvis.service import JarvisService
+
+QUESTIONS = [
+    "what do you make of these drones",
+    "any advice for this one",
+    "where is ultron hiding",
+    "give me some encouragement",
+    "is the suit holding together",
+]
+COMMANDS = ["status", "what's my health", "how much power do I have"]
+_TAG = re.compile(r"#(\d+)")
+_WAVE = re.compile(r"Wave (\d+) (?:incoming|is starting)")
+
+
+class BenchSpeaker:
+    """Stands in for TextToSpeech: synthesis and playback take time, playback can be stopped."""
+
+    def __init__(self, synth_s, word_s):
+        self.synth_s = synth_s
+        self.word_s = word_s
+        self.heard = []  # (start, end, text, interrupted)
+        self.active = 0
+        self.max_active = 0
+        self.threads = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+
+    async def synthesize(self, text):
+        await asyncio.sleep(self.synth_s)
+        return None
+
+    def play(self, text, path=None):
+        self._stop.clear()
+        start = time.perf_counter()
+        with self._lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        interrupted = self._stop.wait(self.word_s * len(text.split()))
+        with self._lock:
+            self.active -= 1
+            self.heard.append((start, time.perf_counter(), text, interrupted))
+
+    def stop(self):
+        self._stop.set()
+
+    def speak(self, text):
+        time.sleep(self.synth_s)
+        self.play(text)
+
+    def speak_async(self, text):
+        self.threads += 1
+        threading.Thread(target=self.speak, args=(text,), daemon=True).start()
+
+
+class LegacyJarvis:
+    """The flow JarvisVoiceAssistant had before the service: work runs on the caller's thread."""
+
+    def __init__(self, conversation, speaker, intents, state):
+        self.conversation = conversation
+        self.tts = speaker
+        self.intents = intents
+        self.state = state
+        conversation.prefetch_wave(1)
+
+    def on_voice_input(self, text):
+        local = self.intents.respond(text, *self.state())
+        if local is not None:
+            response = local[0]
+        else:
+            response = self.conversation.respond(text, *self.state())
+        self.tts.speak_async(response)
+
+    def wave_started(self, wave):
+        self.tts.speak_async(self.conversation.commentary_wave_start(wave, wait=False))
+        self.conversation.prefetch_wave(wave + 1)
+
+
+class ServiceJarvis:
+    def __init__(self, conversation, speaker, intents, state):
+        self.service = JarvisService(conversation, speaker, intents=intents, state_callback=state)
+        self.service.start()
+        self.service.prefetch_wave(1)
+
+    def on_voice_input(self, text):
+        self.service.voice_input(text)
+
+    def wave_started(self, wave):
+        self.service.wave_started(wave)
+
+
+def run_session(jarvis, args, rng, posted):
+    """Render loop on this thread, voice input on an STT thread; returns per-call times (s) per thread."""
+    render_times, stt_times = [], []
+    t_start = time.perf_counter()
+    duration = args.waves * args.wave_s
+    schedule = []
+    t, n = 0.3, 0
+    while t < duration:
+        if rng.random() < args.command_ratio:
+            schedule.append((t, COMMANDS[int(rng.integers(len(COMMANDS)))]))
+        else:
+            schedule.append((t, f"#{n} {QUESTIONS[int(rng.integers(len(QUESTIONS)))]}"))
+            n += 1
+        t += rng.uniform(0.5, 1.5) * args.say_s
+
+    def stt():
+        for at, text in schedule:
+            delay = t_start + at - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            m = _TAG.match(text)
+            if m:
+                posted[("chat", int(m.group(1)))] = time.perf_counter()
+            t0 = time.perf_counter()
+            jarvis.on_voice_input(text)
+            stt_times.append(time.perf_counter() - t0)
+
+    stt_thread = threading.Thread(target=stt, name="stt", daemon=True)
+    stt_thread.start()
+    frame = 1.0 / 60.0
+    wave = 0
+    next_frame = t_start
+    while time.perf_counter() - t_start < duration:
+        if time.perf_counter() - t_start >= wave * args.wave_s:
+            wave += 1
+            posted[("combat", wave)] = time.perf_counter()
+            t0 = time.perf_counter()
+            jarvis.wave_started(wave)
+            render_times.append(time.perf_counter() - t0)
+        next_frame += frame
+        time.sleep(max(0.0, next_frame - time.perf_counter()))
+    stt_thread.join()
+    time.sleep(args.drain_s)
+    return render_times, stt_times
+
+
+def summarize(name, speaker, render_times, stt_times, posted, threads_before):
+    lat = {"combat": [], "chat": []}
+    late = 0
+    for start, _end, text, _interrupted in speaker.heard:
+        m = _TAG.search(text)
+        key = ("chat", int(m.group(1))) if m else None
+        if key is None:
+            m = _WAVE.search(text)
+            key = ("combat", int(m.group(1))) if m else None
+        if key is None or key not in posted:
+            continue
+        age = start - posted[key]
+        lat[key[0]].append(age)
+        max_age = config.JARVIS_COMBAT_LINE_MAX_AGE if key[0] == "combat" else config.JARVIS_CHAT_LINE_MAX_AGE
+        late += age > max_age
+    cut = sum(1 for h in speaker.heard if h[3])
+
+    def ms(values, q):
+        return f"{1000 * np.percentile(values, q):.0f}" if values else "-"
+    print(f"\n{name}")
+    print(f"  render thread per wave_started: p50 {1e6 * np.median(render_times):.0f} us"
+          f"  max {1e6 * max(render_times):.0f} us")
+    print(f"  STT thread per utterance: p50 {1000 * np.median(stt_times):.2f} ms  max {1000 * max(stt_times):.1f} ms")
+    print(f"  lines heard {len(speaker.heard)}, at most {speaker.max_active} at once, cut short {cut},"
+          f" spoken past max age {late}")
+    print(f"  wave callout latency p50 {ms(lat['combat'], 50)} ms  max {ms(lat['combat'], 100)} ms;"
+          f"  chat reply p50 {ms(lat['chat'], 50)} ms  max {ms(lat['chat'], 100)} ms")
+    print(f"  threads started during session: {threading.active_count() - threads_before + speaker.threads}"
+          f" ({speaker.threads} speech threads)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--waves", type=int, default=8)
+    parser.add_argument("--wave-s", type=float, default=2.5, help="seconds between wave starts")
+    parser.add_argument("--say-s", type=float, default=1.2, help="mean seconds between utterances")
+    parser.add_argument("--command-ratio", type=float, default=0.3)
+    parser.add_argument("--api-ms", type=float, default=400.0)
+    parser.add_argument("--synth-ms", type=float, default=80.0)
+    parser.add_argument("--word-ms", type=float, default=120.0)
+    parser.add_argument("--drain-s", type=float, default=3.0, help="wait for queued speech after the session")
+    parser.add_argument("--seed", type=int, default=3)
+    args = parser.parse_args()
+
+    server = FakeOpenAIServer(args.api_ms / 1000.0)
+    client, client_name = make_client(server.base_url)
+    print(f"fake OpenAI server at {server.base_url} ({args.api_ms:.0f} ms per completion, {client_name} client)")
+    print(f"{args.waves} waves every {args.wave_s:.1f} s, an utterance every ~{args.say_s:.1f} s,"
+          f" speech {args.word_ms:.0f} ms/word")
+
+    def state():
+        return 64, 40, 3200, 3
+
+    for name, make in (("before: caller threads + thread per line", LegacyJarvis), ("service", ServiceJarvis)):
+        rng = np.random.default_rng(args.seed)
+        speaker = BenchSpeaker(args.synth_ms / 1000.0, args.word_ms / 1000.0)
+        conversation = JarvisConversation(cache=ResponseCache(db_path=""), client=client)
+        threads_before = threading.active_count()
+        jarvis = make(conversation, speaker, IntentMatcher(), state)
+        posted = {}
+        render_times, stt_times = run_session(jarvis, args, rng, posted)
+        summarize(name, speaker, render_times, stt_times, posted, threads_before)
+        if isinstance(jarvis, ServiceJarvis):
+            s = jarvis.service.stats()
+            print(f"  service: superseded requests {s['superseded']}, LLM timeouts {s['llm_timeouts']}")
+            for priority, p in s["speech"].items():
+                print(f"    {priority:<8} spoken {p['spoken']:>3}  preempted {p['preempted']:>3}"
+                      f"  stale {p['dropped_stale']:>3}  queue full {p['dropped_full']:>3}")
+            jarvis.service.stop()
+        elif conversation._prefetch_pool is not None:
+            conversation._prefetch_pool.shutdown(wait=True)
+    server.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Benchmark: 10k-particle stress test, NumPy ParticleBuffer + single vertex buffer vs per-particle entities.
+The entity path reproduces Particle.update (Vec3 math, entity.position and entity.alpha
+writes, list rebuild) with minimal Python stand-ins; on the real renderer each of those
+particles is also its own draw call. The buffer path times the simulation step and
+building the interleaved (n, 7) float32 vertex array that ParticleMesh uploads in one copy.
+Run with: python benchmarks/bench_particles.py [--particles 10000] [--frames 120]
+"""
+
+import argparse
+import time
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from src.graphics.particles import ParticleBuffer
+
+
+class _Vec3:
+    __slots__ = ("x", "y", "z")
+
+    def __init__(self, x, y, z):
+        self.x, self.y, self.z = x, y, z
+
+    def __add__(self, o):
+        return _Vec3(self.x + o.x, self.y + o.y, self.z + o.z)
+
+    def __mul__(self, k):
+        return _Vec3(self.x * k, self.y * k, self.z * k)
+
+
+class _Entity:
+    __slots__ = ("position", "alpha")
+
+    def __init__(self):
+        self.position = None
+        self.alpha = 0.9
+
+
+class _EntityParticle:
+    """Particle.update from the entity backend, driven by dt like the buffer."""
+
+    def __init__(self, position, velocity, lifetime):
+        self.position = position
+        self.velocity = velocity
+        self.lifetime = lifetime
+        self.age = 0.0
+        self.entity = _Entity()
+
+    def update(self, dt):
+        self.age += dt
+        if self.age >= self.lifetime:
+            return False
+        self.position += self.velocity * dt
+        self.entity.position = self.position
+        self.entity.alpha = 0.9 * (1.0 - self.age / self.lifetime)
+        return True
+
+
+def bench_entities(n, frames, dt, lifetime):
+    rng = np.random.default_rng(0)
+    dirs = rng.uniform(-1, 1, (n, 3))
+    dirs /= np.linalg.norm(dirs, axis=1, keepdims=True)
+    particles = [_EntityParticle(_Vec3(0, 0, 50), _Vec3(*d), lifetime) for d in (dirs * 8.0).tolist()]
+    t0 = time.perf_counter()
+    for _ in range(frames):
+        particles = [p for p in particles if p.update(dt)]
+    return 1000.0 * (time.perf_counter() - t0) / frames, len(particles)
+
+
+def bench_buffer(n, frames, dt, lifetime):
+    buf = ParticleBuffer(capacity=n, rng=np.random.default_rng(0))
+    buf.emit((0, 0, 50), n, 8.0, lifetime)
+    t0 = time.perf_counter()
+    for _ in range(frames):
+        buf.update(dt)
+        vertices = buf.vertices()
+        vertices.tobytes()  # stands in for the single copy into the GPU vertex buffer
+    return 1000.0 * (time.perf_counter() - t0) / frames, buf.count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--particles", type=int, default=10000)
+    parser.add_argument("--frames", type=int, default=120)
+    parser.add_argument("--dt", type=float, default=1 / 60)
+    parser.add_argument("--lifetime", type=float, default=5.0, help="long enough that all particles stay alive")
+    args = parser.parse_args()
+
+    ent_ms, ent_alive = bench_entities(args.particles, args.frames, args.dt, args.lifetime)
+    buf_ms, buf_alive = bench_buffer(args.particles, args.frames, args.dt, args.lifetime)
+    print(f"{args.particles} particles, {args.frames} frames")
+    print(f"{'backend':<26}{'ms/frame':>10}{'draw calls':>12}{'alive':>8}")
+    print(f"{'per-particle entities':<26}{ent_ms:>10.3f}{ent_alive:>12}{ent_alive:>8}")
+    print(f"{'ParticleBuffer + 1 mesh':<26}{buf_ms:>10.3f}{1:>12}{buf_alive:>8}")
+    print(f"speedup: {ent_ms / buf_ms:.1f}x (Python side only; draw calls drop from {ent_alive} to 1)")
+
+
+if __name__ == "__main__":
+    main()
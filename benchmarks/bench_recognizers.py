@@ -0,0 +1,144 @@
+"""
+Benchmark: speech recognizer backends on a folder of recorded WAV commands.
+
+Expected text per file comes from transcripts.tsv in the folder (lines of
+"file.wav<TAB>text"). Without it, the file name is used: "status_03.wav" ->
+"status", "what_wave.wav" -> "what wave".
+
+Each file is fed to each backend in --chunk-ms pieces, as the streaming
+pipeline would feed it. Per backend the run reports:
+- exact-match accuracy and word error rate
+- finish() latency: the wait after the last chunk
+- real-time factor
+- for streaming backends, how often a partial result already matched the
+  command, and how long before the end of speech that happened (found with the
+  same energy VAD the game uses)
+
+Run with: python benchmarks/bench_recognizers.py commands/ [--backends vosk google whisper] [--chunk-ms 20]
+"""
+
+import argparse
+import re
+import time
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import config
+from src.jarvis.audio_stream import EnergySegmenter, read_wav
+from src.jarvis.recognizers import BACKENDS
+
+
+def normalize(text):
+    return " ".join(re.sub(r"[^a-z0-9' ]+", " ", (text or "").lower()).split())
+
+
+def word_errors(ref, hyp):
+    """Word-level edit distance between two normalized strings."""
+    r, h = ref.split(), hyp.split()
+    row = list(range(len(h) + 1))
+    for i, rw in enumerate(r, 1):
+        prev, row[0] = row[0], i
+        for j, hw in enumerate(h, 1):
+            prev, row[j] = row[j], min(row[j] + 1, row[j - 1] + 1, prev + (rw != hw))
+    return row[-1], len(r)
+
+
+def load_commands(folder):
+    """[(path, expected text)] for every WAV in folder."""
+    labels = {}
+    tsv = os.path.join(folder, "transcripts.tsv")
+    if os.path.exists(tsv):
+        with open(tsv) as f:
+            for line in f:
+                if "\t" in line:
+                    name, text = line.rstrip("\n").split("\t", 1)
+                    labels[name] = text
+    commands = []
+    for name in sorted(os.listdir(folder)):
+        if not name.lower().endswith(".wav"):
+            continue
+        stem = re.sub(r"_\d+$", "", os.path.splitext(name)[0])
+        commands.append((os.path.join(folder, name), labels.get(name, stem.replace("_", " "))))
+    return commands
+
+
+def speech_end(samples, rate):
+    """Stream position (s) where the VAD puts the end of the last utterance, or the file end."""
+    segmenter = EnergySegmenter(rate)
+    tail = np.zeros(int(rate * (config.JARVIS_VAD_END_SILENCE_MS / 1000 + 0.1)), dtype=np.int16)
+    utterances = segmenter.feed(np.concatenate((samples, tail)), 0)
+    return utterances[-1].end / rate if utterances else len(samples) / rate
+
+
+def run_backend(recognizer, commands, chunk_ms):
+    t0 = time.perf_counter()
+    recognizer.load()
+    load_s = time.perf_counter() - t0
+    rows = []
+    for path, expected in commands:
+        samples, rate = read_wav(path)
+        chunk = int(rate * chunk_ms / 1000)
+        end_s = speech_end(samples, rate)
+        target = normalize(expected)
+        compute = 0.0
+        matched_at = None
+        t = time.perf_counter()
+        recognizer.begin(rate)
+        compute += time.perf_counter() - t
+        for pos in range(0, len(samples), chunk):
+            t = time.perf_counter()
+            partial = recognizer.accept(samples[pos:pos + chunk])
+            compute += time.perf_counter() - t
+            if matched_at is None and partial and normalize(partial) == target:
+                matched_at = min(pos + chunk, len(samples)) / rate
+        t = time.perf_counter()
+        text = recognizer.finish()
+        finish_s = time.perf_counter() - t
+        compute += finish_s
+        errors, words = word_errors(target, normalize(text))
+        rows.append({
+            "exact": normalize(text) == target,
+            "errors": errors,
+            "words": words,
+            "finish_ms": 1000.0 * finish_s,
+            "rtf": compute / (len(samples) / rate) if len(samples) else 0.0,
+            "lead_ms": 1000.0 * (end_s - matched_at) if matched_at is not None else None,
+        })
+    return load_s, rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("folder")
+    parser.add_argument("--backends", nargs="+", default=list(BACKENDS))
+    parser.add_argument("--chunk-ms", type=float, default=config.JARVIS_STT_CHUNK_MS)
+    args = parser.parse_args()
+
+    commands = load_commands(args.folder)
+    if not commands:
+        print(f"no .wav files in {args.folder}")
+        return
+    print(f"{len(commands)} commands from {args.folder}, {args.chunk_ms:.0f} ms chunks")
+    print(f"{'backend':<10}{'load s':>8}{'exact':>8}{'WER':>7}{'finish p50':>12}{'finish p95':>12}"
+          f"{'RTF':>7}{'early':>8}{'lead ms':>9}")
+    for name in args.backends:
+        recognizer = BACKENDS[name]()
+        if not recognizer.available():
+            print(f"{name:<10}  not available (missing package, model or API key)")
+            continue
+        load_s, rows = run_backend(recognizer, commands, args.chunk_ms)
+        finish = np.array([r["finish_ms"] for r in rows])
+        leads = [r["lead_ms"] for r in rows if r["lead_ms"] is not None and r["lead_ms"] > 0]
+        exact = sum(r["exact"] for r in rows) / len(rows)
+        wer = sum(r["errors"] for r in rows) / max(1, sum(r["words"] for r in rows))
+        rtf = float(np.mean([r["rtf"] for r in rows]))
+        early = f"{len(leads)}/{len(rows)}" if recognizer.streaming else "-"
+        lead = f"{np.mean(leads):.0f}" if leads else "-"
+        print(f"{name:<10}{load_s:>8.2f}{100 * exact:>7.0f}%{100 * wer:>6.0f}%{np.percentile(finish, 50):>12.0f}"
+              f"{np.percentile(finish, 95):>12.0f}{rtf:>7.2f}{early:>8}{lead:>9}")
+
+
+if __name__ == "__main__":
+    main()
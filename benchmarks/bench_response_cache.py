@@ -0,0 +1,189 @@
+"""
+Benchmark: Jarvis reply cache and next-wave prefetch against a local fake
+OpenAI server. The server is an HTTP endpoint on 127.0.0.1 that answers
+/v1/chat/completions after --api-ms.
+
+Plays several sessions of --waves waves. Each wave starts with commentary, then
+the pilot asks a few questions drawn from a recurring pool while the game state
+drifts. Three modes are compared:
+- uncached, which blocks on the API as before
+- in-memory cache with prefetch
+- cache with a SQLite tier shared across sessions
+Reported per mode: API requests, hit ratio, saved latency, the worst time
+wave_started spent getting its line, and how many waves fell back to the stock
+line because the prefetch had not landed yet.
+
+Uses the openai package when installed (pointed at the fake server). Otherwise
+a minimal urllib client with the same chat.completions.create shape is used.
+Run with: python benchmarks/bench_response_cache.py [--sessions 3] [--waves 10] [--api-ms 300]
+"""
+
+import argparse
+import json
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+from urllib import request as urlrequest
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from src.jarvis.conversation import JarvisConversation
+from src.jarvis.response_cache import ResponseCache
+
+QUESTIONS = [
+    "Jarvis, what do you make of these drones?",
+    "Any advice for this wave?",
+    "How am I holding up, Jarvis?",
+    "Where is Ultron hiding?",
+    "Give me some encouragement.",
+    "Is the suit holding together?",
+]
+
+
+class FakeOpenAIServer:
+    """Chat completions endpoint answering after a fixed delay; counts requests."""
+
+    def __init__(self, delay):
+        server = self
+        self.delay = delay
+        self.requests = 0
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                server.requests += 1
+                time.sleep(server.delay)
+                prompt = body.get("messages", [{}])[-1].get("content", "")
+                payload = json.dumps({
+                    "id": f"chatcmpl-{server.requests}",
+                    "object": "chat.completion",
+                    "created": int(time.time()),
+                    "model": body.get("model", "gpt-4o-mini"),
+                    "choices": [{
+                        "index": 0,
+                        "message": {"role": "assistant", "content": f"Line {server.requests}: {prompt[:40]}"},
+                        "finish_reason": "stop",
+                    }],
+                    "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2},
+                }).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.base_url = f"http://127.0.0.1:{self.httpd.server_address[1]}/v1"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.httpd.shutdown()
+
+
+class _UrllibChatClient:
+    """chat.completions.create over urllib, for machines without the openai package."""
+
+    def __init__(self, base_url):
+        self.base_url = base_url
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    def _create(self, **kwargs):
+        req = urlrequest.Request(
+            f"{self.base_url}/chat/completions", data=json.dumps(kwargs).encode(),
+            headers={"Content-Type": "application/json", "Authorization": "Bearer test"},
+        )
+        with urlrequest.urlopen(req, timeout=30) as resp:
+            data = json.loads(resp.read())
+        return SimpleNamespace(choices=[
+            SimpleNamespace(message=SimpleNamespace(content=c["message"]["content"])) for c in data["choices"]
+        ])
+
+
+def make_client(base_url):
+    try:
+        import openai
+        return openai.OpenAI(api_key="test", base_url=base_url), "openai"
+    except ImportError:
+        return _UrllibChatClient(base_url), "urllib"
+
+
+def play_session(conversation, waves, questions_per_wave, rng, prefetch):
+    """Returns the wave_started line times (s) and how many were the stock line, for one session."""
+    wave_times = []
+    stock = 0
+    health, energy, score = 100.0, 100.0, 0
+    if prefetch:
+        conversation.prefetch_wave(1)
+    for wave in range(1, waves + 1):
+        if prefetch:
+            time.sleep(0.05 + rng.uniform(0.0, 0.05))  # the previous wave is being played meanwhile
+        t0 = time.perf_counter()
+        line = conversation.commentary_wave_start(wave, wait=not prefetch)
+        wave_times.append(time.perf_counter() - t0)
+        stock += line == f"Wave {wave} incoming, sir."
+        if prefetch:
+            conversation.prefetch_wave(wave + 1)
+        for _ in range(questions_per_wave):
+            health = float(np.clip(health - rng.uniform(0, 12) + rng.uniform(0, 6), 5, 100))
+            energy = float(np.clip(energy + rng.uniform(-30, 30), 0, 100))
+            score += int(rng.integers(0, 4)) * 100
+            conversation.respond(QUESTIONS[int(rng.integers(len(QUESTIONS)))], health, energy, score, wave)
+    return wave_times, stock
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sessions", type=int, default=3)
+    parser.add_argument("--waves", type=int, default=10)
+    parser.add_argument("--questions", type=int, default=3, help="questions per wave")
+    parser.add_argument("--api-ms", type=float, default=300.0)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    server = FakeOpenAIServer(args.api_ms / 1000.0)
+    client, client_name = make_client(server.base_url)
+    db_dir = tempfile.mkdtemp()
+    print(f"fake OpenAI server at {server.base_url} ({args.api_ms:.0f} ms per completion, {client_name} client)")
+    print(f"{args.sessions} sessions x {args.waves} waves x {args.questions} questions\n")
+    print(f"{'mode':<26}{'API calls':>10}{'hit ratio':>11}{'saved s':>9}{'wave line max ms':>18}{'stock lines':>13}")
+    modes = [
+        ("uncached (today)", lambda: False, False),
+        ("memory cache + prefetch", lambda: ResponseCache(db_path=""), True),
+        ("memory + SQLite + prefetch", lambda: ResponseCache(db_path=os.path.join(db_dir, "jarvis.db")), True),
+    ]
+    for name, make_cache, prefetch in modes:
+        rng = np.random.default_rng(args.seed)
+        start_requests = server.requests
+        wave_times = []
+        stock = 0
+        hits = lookups = 0
+        saved = 0.0
+        for _ in range(args.sessions):
+            # A new session starts with an empty memory tier; only SQLite carries over
+            conversation = JarvisConversation(cache=make_cache(), client=client)
+            times, stock_lines = play_session(conversation, args.waves, args.questions, rng, prefetch)
+            wave_times += times
+            stock += stock_lines
+            if conversation._prefetch_pool is not None:
+                conversation._prefetch_pool.shutdown(wait=True)
+            if conversation.cache is not None:
+                s = conversation.cache.stats()
+                hits += s["memory_hits"] + s["disk_hits"]
+                lookups += s["memory_hits"] + s["disk_hits"] + s["misses"]
+                saved += s["saved_ms"] / 1000.0
+                conversation.cache.close()
+        calls = server.requests - start_requests
+        ratio = hits / lookups if lookups else 0.0
+        print(f"{name:<26}{calls:>10}{ratio:>10.0%}{saved:>9.1f}{1000 * max(wave_times):>18.1f}{stock:>13}")
+    server.close()
+
+
+if __name__ == "__main__":
+    main()
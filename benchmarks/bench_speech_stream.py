@@ -0,0 +1,184 @@
+"""
+Benchmark: streaming VAD pipeline vs the old per-phrase microphone loop.
+Builds a synthetic session (room noise whose level steps up halfway, voiced
+phrases with syllable gaps, a few clicks) with known phrase boundaries. The
+session is fed through AudioStream from an in-memory source or a WAV file, and
+the run reports:
+- phrases found, missed and false
+- boundary error and end-detection lag
+- audio and utterance drop counters
+
+For comparison, the old listen_once loop is modelled on the same timeline.
+Each phrase costs a device open plus 0.3 s of calibration, and the mic is
+closed while the phrase is recognized, so phrases that start then are lost or
+clipped.
+
+With --realtime the source is paced like a microphone and the end-to-text
+latency is measured. The recognizer is stood in by a fixed --recognize-ms delay,
+or a real recognizer is used with --recognize.
+Run with: python benchmarks/bench_speech_stream.py [--seconds 60] [--realtime] [--wav in.wav] [--write-wav out.wav]
+"""
+
+import argparse
+import time
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import config
+from src.jarvis.audio_stream import AudioStream, ArraySource, WavFileSource, write_wav
+from src.jarvis.speech_to_text import SpeechToText
+from src.jarvis.recognizers import FunctionRecognizer, make_recognizer
+
+LEGACY_OPEN_S = 0.05  # PyAudio stream open/close per phrase
+LEGACY_CALIBRATE_S = 0.3  # adjust_for_ambient_noise(duration=0.3)
+LEGACY_PAUSE_S = 0.8  # speech_recognition's default pause_threshold
+
+
+def synth_session(seconds, rate, seed):
+    """(int16 samples, [(start_s, end_s)] phrases) for a noisy room with speech and clicks."""
+    rng = np.random.default_rng(seed)
+    n = int(seconds * rate)
+    noise_level = np.where(np.arange(n) < n // 2, 60.0, 180.0)  # a fan switches on halfway
+    audio = rng.normal(0.0, 1.0, n) * noise_level
+    phrases = []
+    t = 1.0
+    while True:
+        length = rng.uniform(0.6, 2.5)
+        if t + length > seconds - 1.0:
+            break
+        start = int(t * rate)
+        m = int(length * rate)
+        tt = np.arange(m) / rate
+        f0 = rng.uniform(110, 220)
+        voice = sum(np.sin(2 * np.pi * f0 * k * tt) / k for k in range(1, 6))
+        # Syllables: 4 Hz amplitude modulation with short (<400 ms) dips between them
+        envelope = 0.55 + 0.45 * np.sin(2 * np.pi * 4.0 * tt + rng.uniform(0, np.pi))
+        ramp = np.minimum(1.0, np.minimum(tt, length - tt) / 0.03)
+        audio[start:start + m] += voice * envelope * ramp * rng.uniform(1500, 4000)
+        phrases.append((t, t + length))
+        t += length + rng.uniform(0.7, 3.0)
+        if rng.random() < 0.3:
+            # A click or desk bump in the gap (too short to be speech)
+            click = int((t - rng.uniform(0.3, 0.6)) * rate)
+            audio[click:click + int(0.03 * rate)] += rng.normal(0, 6000, int(0.03 * rate))
+    return np.clip(audio, -32768, 32767).astype(np.int16), phrases
+
+
+def legacy_model(phrases, recognize_s):
+    """Phrases lost or clipped by the old loop, and its end-to-text latency per phrase."""
+    lost = clipped = 0
+    latencies = []
+    ready = LEGACY_OPEN_S + LEGACY_CALIBRATE_S  # when the first listen() starts hearing audio
+    for start, end in phrases:
+        if end <= ready:
+            lost += 1  # spoken entirely while the mic was closed or calibrating
+            continue
+        if start < ready:
+            clipped += 1
+        latencies.append(LEGACY_PAUSE_S + recognize_s)
+        # Next listen_once: recognize, reopen the mic, calibrate again
+        ready = end + LEGACY_PAUSE_S + recognize_s + LEGACY_OPEN_S + LEGACY_CALIBRATE_S
+    return lost, clipped, latencies
+
+
+def match(found, phrases, tolerance=0.25):
+    """Pair detected (start, end) segments with true phrases by overlap."""
+    pairs = []
+    used = set()
+    for i, (ts, te) in enumerate(phrases):
+        for j, (fs, fe) in enumerate(found):
+            if j not in used and fs < te + tolerance and fe > ts - tolerance:
+                pairs.append((i, j))
+                used.add(j)
+                break
+    return pairs
+
+
+def run_stream(source, recognizer, recognize_s):
+    utterances = []
+
+    def stand_in(samples, rate):
+        time.sleep(recognize_s)
+        return f"{len(samples) / rate:.2f}s"
+
+    stream = AudioStream(source, on_utterance=utterances.append)
+    stt = SpeechToText(streaming=True, stream=stream, recognizer=recognizer or FunctionRecognizer(stand_in))
+    t0 = time.perf_counter()
+    stt.start_listening_background(None).join()
+    wall = time.perf_counter() - t0
+    stt.stop_listening()
+    return stt, utterances, wall
+
+
+def fmt_latency(stats, name):
+    s = stats["latency"][name]
+    if not s["count"]:
+        return "n/a"
+    return f"mean {s['mean_ms']:.0f}  p50 {s['p50_ms']:.0f}  p95 {s['p95_ms']:.0f} ms"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--seconds", type=float, default=60.0)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--realtime", action="store_true", help="pace the source like a microphone")
+    parser.add_argument("--recognize-ms", type=float, default=400.0, help="stand-in recognizer time")
+    parser.add_argument("--recognize", action="store_true", help="use the configured recognizer instead")
+    parser.add_argument("--wav", help="segment this WAV file instead of the synthetic session")
+    parser.add_argument("--write-wav", help="save the synthetic session to this path")
+    args = parser.parse_args()
+
+    rate = config.JARVIS_STT_SAMPLE_RATE
+    phrases = None
+    if args.wav:
+        source = WavFileSource(args.wav, realtime=args.realtime)
+        rate = source.sample_rate
+        print(f"{args.wav}: {len(source.samples) / rate:.1f} s at {rate} Hz")
+    else:
+        samples, phrases = synth_session(args.seconds, rate, args.seed)
+        if args.write_wav:
+            write_wav(args.write_wav, samples, rate)
+        source = ArraySource(samples, rate, realtime=args.realtime)
+        print(f"synthetic session: {args.seconds:.0f} s, {len(phrases)} phrases, seed {args.seed}")
+
+    recognize_s = args.recognize_ms / 1000.0
+    recognizer = make_recognizer() if args.recognize else None
+    stt, utterances, wall = run_stream(source, recognizer, recognize_s if args.realtime else 0.0)
+    stats = stt.stats()
+    stream = stats["stream"]
+    print(f"\nstreaming pipeline ({'real time' if args.realtime else 'as fast as possible'}, {wall:.2f} s wall)")
+    print(f"  utterances {stream['utterances']}  recognized {stats['recognized']}  "
+          f"cut at max length {stream['utterances_cut']}  rejected bursts {stream['segments_rejected']}")
+    print(f"  dropped: device overflows {stream['device_overflows']}  ring samples {stream['ring_dropped_samples']}  "
+          f"utterances {stream['utterances_dropped']}")
+    lags = [1000.0 * u.end_lag() for u in utterances]
+    if lags:
+        print(f"  end-of-speech detection lag (stream time): mean {np.mean(lags):.0f} ms")
+    if args.realtime:
+        print(f"  end detect (wall):   {fmt_latency(stats, 'end_detect')}")
+        print(f"  recognize:           {fmt_latency(stats, 'recognize')}")
+        print(f"  speech end -> text:  {fmt_latency(stats, 'end_to_text')}")
+
+    if phrases is None:
+        return
+    found = [(u.start / rate, u.end / rate) for u in utterances]
+    pairs = match(found, phrases)
+    start_err = [1000.0 * abs(found[j][0] - phrases[i][0]) for i, j in pairs]
+    end_err = [1000.0 * abs(found[j][1] - phrases[i][1]) for i, j in pairs]
+    print(f"  phrases found {len(pairs)}/{len(phrases)}  false {len(found) - len(pairs)}  "
+          f"start error (incl. pre-roll) {np.mean(start_err) if pairs else 0:.0f} ms  end error {np.mean(end_err) if pairs else 0:.0f} ms")
+
+    lost, clipped, latencies = legacy_model(phrases, recognize_s)
+    print(f"\nper-phrase listen_once loop (modelled, {args.recognize_ms:.0f} ms recognizer)")
+    print(f"  phrases lost {lost}/{len(phrases)}  clipped {clipped}  "
+          f"calibration per phrase {1000 * LEGACY_CALIBRATE_S:.0f} ms")
+    if latencies:
+        print(f"  speech end -> text:  {1000.0 * np.mean(latencies):.0f} ms")
+    stream_latency = config.JARVIS_VAD_END_SILENCE_MS + args.recognize_ms
+    print(f"  streaming equivalent: {stream_latency:.0f} ms (silence hangover + recognizer), nothing lost while recognizing")
+
+
+if __name__ == "__main__":
+    main()
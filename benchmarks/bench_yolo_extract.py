@@ -0,0 +1,129 @@
+"""
+Benchmark: YOLODetector result extraction, one batched transfer vs per-box tensor reads.
+Uses real torch tensors when torch is installed (CPU), otherwise NumPy-backed stand-ins
+with the same .cpu()/.numpy()/.item() call pattern. No model or webcam needed.
+Run with: python benchmarks/bench_yolo_extract.py [--detections 300]
+"""
+
+import argparse
+import time
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from src.vision.yolo_detector import boxes_to_array, detections_to_dicts
+
+try:
+    import torch
+except ImportError:
+    torch = None
+
+
+class _FakeTensor:
+    """Minimal torch.Tensor stand-in: every .cpu() and .item() crosses a Python call boundary."""
+
+    def __init__(self, array):
+        self._a = array
+
+    def cpu(self):
+        return _FakeTensor(self._a)
+
+    def numpy(self):
+        return self._a
+
+    def item(self):
+        return self._a.item()
+
+    def __getitem__(self, i):
+        return _FakeTensor(self._a[i])
+
+    def __len__(self):
+        return len(self._a)
+
+
+def _tensor(array):
+    return torch.from_numpy(array) if torch is not None else _FakeTensor(array)
+
+
+class _Box:
+    def __init__(self, row):
+        self.xyxy = _tensor(row[None, :4].copy())
+        self.conf = _tensor(row[4:5].copy())
+        self.cls = _tensor(row[5:6].copy())
+
+
+class _Boxes:
+    """ultralytics Boxes layout: .data is (N, 6) [x1, y1, x2, y2, conf, cls]; iterating yields per-box views."""
+
+    def __init__(self, data):
+        self.data = _tensor(data)
+        self._boxes = [_Box(row) for row in data]
+
+    def __len__(self):
+        return len(self._boxes)
+
+    def __iter__(self):
+        return iter(self._boxes)
+
+
+def legacy_extract(boxes, names):
+    """The pre-batching loop from YOLODetector.detect."""
+    out = []
+    for box in boxes:
+        xyxy = box.xyxy[0].cpu().numpy()
+        cid = int(box.cls[0].item())
+        conf = float(box.conf[0].item())
+        out.append({
+            "bbox": tuple(map(float, xyxy)),
+            "class_id": cid,
+            "class_name": names.get(cid, "?"),
+            "confidence": conf,
+        })
+    return out
+
+
+def _best(fn, repeats, inner):
+    best = float("inf")
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        for _ in range(inner):
+            fn()
+        best = min(best, (time.perf_counter() - t0) / inner)
+    return 1e6 * best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--detections", type=int, default=300)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--inner", type=int, default=50)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    data = np.zeros((args.detections, 6), dtype=np.float32)
+    data[:, :2] = rng.uniform(0, 600, (args.detections, 2))
+    data[:, 2:4] = data[:, :2] + rng.uniform(5, 40, (args.detections, 2))
+    data[:, 4] = rng.uniform(0.5, 1.0, args.detections)
+    data[:, 5] = rng.integers(0, 80, args.detections)
+    boxes = _Boxes(data)
+    names = {i: f"class{i}" for i in range(80)}
+
+    legacy = legacy_extract(boxes, names)
+    batched = detections_to_dicts(boxes_to_array(boxes), names)
+    assert len(legacy) == len(batched)
+    assert all(a["class_id"] == b["class_id"] and np.allclose(a["bbox"], b["bbox"]) for a, b in zip(legacy, batched))
+
+    rows = [
+        ("legacy per-box loop", _best(lambda: legacy_extract(boxes, names), args.repeats, args.inner)),
+        ("batched array", _best(lambda: boxes_to_array(boxes), args.repeats, args.inner)),
+        ("batched + dict view", _best(lambda: detections_to_dicts(boxes_to_array(boxes), names), args.repeats, args.inner)),
+    ]
+    backend = "torch CPU tensors" if torch is not None else "NumPy tensor stand-ins"
+    print(f"{args.detections} detections per frame ({backend})")
+    for name, us in rows:
+        print(f"{name:<22}{us:>10.1f} us/frame")
+
+
+if __name__ == "__main__":
+    main()
@@ -44,10 +44,23 @@ BOSS_WAVE_INTERVAL = 5  # every N waves
 CAMERA_INDEX = 0
 CAMERA_WIDTH = 640
 CAMERA_HEIGHT = 480
+CAMERA_RING_SIZE = 4  # preallocated frame slots; a borrowed frame survives RING_SIZE - 1 captures
 HAND_TRACKING_CONFIDENCE = 0.6
 MIN_HAND_PRESENCE = 0.5
 PULL_BACK_THRESHOLD = 0.03  # z-depth change to trigger fire
 GESTURE_SMOOTHING = 0.2  # smoothing factor for aim position
+# ROI mode: once hands are locked, run MediaPipe on a padded, downscaled crop around them
+HAND_ROI_ENABLED = False
+HAND_ROI_PADDING = 0.35  # fraction of the hand box added on every side
+HAND_ROI_MAX_SIDE = 256  # crop is downscaled so its longer side is at most this (px)
+HAND_ROI_MAX_AREA = 0.6  # crops larger than this fraction of the frame run full-frame
+HAND_ROI_REFRESH_FRAMES = 30  # forced full-frame pass to pick up newly entering hands
+# Run hand tracking (and optionally YOLO) in worker processes fed through shared memory
+VISION_MULTIPROCESS = False
+VISION_PROCESS_MODELS = ("hands",)  # add "yolo" to run YOLODetector alongside
+VISION_PROCESS_MAX_RESTARTS = 3  # a model worker that dies is respawned this many times, then reported failed
+VISION_IDLE_SLEEP = 0.005  # worker back-off (s) while the camera has no frame yet
+VISION_STATS_WINDOW = 120  # samples kept per stage for latency stats
 
 # -----------------------------------------------------------------------------
 # YOLO11 (optional showcase) & GPU
@@ -55,15 +68,119 @@ GESTURE_SMOOTHING = 0.2  # smoothing factor for aim position
 YOLO_MODEL = "yolo11n.pt"  # nano for speed; use yolo11m for better accuracy
 YOLO_CONFIDENCE = 0.5
 YOLO_DEVICE = "cuda:0"  # RTX 3070 - set to "cpu" if no NVIDIA GPU
+# Frame skipping: full inference every N frames, boxes tracked in between
+YOLO_DETECT_EVERY_N = 0  # 0 = adapt N to the measured inference time and YOLO_CPU_BUDGET_MS
+YOLO_CPU_BUDGET_MS = 8.0  # average inference cost allowed per frame in adaptive mode
+YOLO_TRACK_IOU = 0.3  # min IoU to associate a detection with a predicted track
+YOLO_TRACK_MAX_MISSES = 3  # inference runs a track may coast unmatched before it is dropped
 # Ursina uses OpenGL; vsync is enabled in the game window for smooth RTX 3070 output
 
+# -----------------------------------------------------------------------------
+# Simulation
+# -----------------------------------------------------------------------------
+SIM_TICK_RATE = 60  # fixed gameplay ticks per second, independent of the display refresh rate
+SIM_MAX_CATCHUP_STEPS = 5  # ticks run at most per rendered frame; older backlog is dropped
+SIM_INTERPOLATE = True  # render entities between the last two ticks (False: snap to the latest tick)
+SIM_SEED = None  # seed for spawns and enemy drift; None = different every run
+
+# -----------------------------------------------------------------------------
+# Frame profiler (also: python main.py --profile-frames [trace.json])
+# -----------------------------------------------------------------------------
+PROFILER_ENABLED = False  # scoped stage timers in the game loop and vision thread
+PROFILER_WINDOW = 600  # rolling samples per stage for p50/p95/p99
+PROFILER_OVERLAY = False  # show the overlay at start (toggle in game with PROFILER_OVERLAY_KEY)
+PROFILER_OVERLAY_KEY = "f3"
+PROFILER_OVERLAY_INTERVAL = 0.5  # seconds between overlay text refreshes
+PROFILER_TRACE_PATH = ""  # Chrome trace (.json) or stage percentiles (.csv); "" = no export
+PROFILER_TRACE_INTERVAL = 10.0  # seconds between background trace writes
+PROFILER_TRACE_MAX_EVENTS = 200000  # newest spans kept for the trace
+
+# -----------------------------------------------------------------------------
+# Startup
+# -----------------------------------------------------------------------------
+STARTUP_WORKERS = 3  # background threads initializing vision, Jarvis and audio
+STARTUP_WARMUP = True  # run one dummy inference per model before it goes live
+STARTUP_PROFILE = False  # print the startup timing report (also: python main.py --profile-startup)
+
+# -----------------------------------------------------------------------------
+# Sky
+# -----------------------------------------------------------------------------
+CLOUD_COUNT = 30  # all clouds share one mesh, so hundreds cost about the same per frame
+CLOUD_SEGMENTS = 10  # sphere template resolution per cloud
+CLOUD_RINGS = 6
+
+# -----------------------------------------------------------------------------
+# Particles
+# -----------------------------------------------------------------------------
+PARTICLE_BACKEND = "mesh"  # "mesh": NumPy state + one point mesh; "entity": one sphere Entity each
+PARTICLE_MAX = 16384  # live particle cap for the mesh backend; extra sparks are dropped
+PARTICLE_POINT_SIZE = 0.3  # world-space point size (matches the old sphere scale)
+
+# -----------------------------------------------------------------------------
+# Entity pools (hidden entities recycled instead of created/destroyed per spawn)
+# -----------------------------------------------------------------------------
+ENTITY_POOL_MAX_SIZE = 256  # hidden entities kept per pool; extras are destroyed
+ENTITY_POOL_PREWARM = {  # built at startup so early spawns never create nodes
+    "beam": 16,
+    "particle": 120,  # 10 simultaneous explosions
+    "enemy:drone": 12,
+    "enemy:standard": 6,
+    "enemy:heavy": 2,
+}
+
+# -----------------------------------------------------------------------------
+# HUD
+# -----------------------------------------------------------------------------
+HUD_DIGIT_ATLAS = True  # health/energy/score as digit quads (UV change per update, no text rebuild)
+HUD_ATLAS_CELL_PX = 64  # glyph cell height in the digit atlas texture
+
 # -----------------------------------------------------------------------------
 # Jarvis AI
 # -----------------------------------------------------------------------------
 JARVIS_SYSTEM_PROMPT = """You are J.A.R.V.I.S., Tony Stark's AI assistant, now assisting the pilot in an Iron Man arc reactor shooting game. You provide tactical commentary, respond to voice commands, and give brief, witty status updates. Keep responses short (1-2 sentences) during combat. You can discuss game state: health, energy, wave, score. Be helpful and in character."""
 OPENAI_API_KEY = os.environ.get("OPENAI_API_KEY", "")
 JARVIS_TTS_VOICE = "en-GB-RyanNeural"  # Edge TTS; British, clear
-JARVIS_STT_LANGUAGE = "en"
+JARVIS_STT_LANGUAGE = "en"  # passed to every recognizer; Vosk loads the model listed for it below
+# Streaming speech input: the microphone stays open, an energy VAD cuts utterances
+JARVIS_STT_STREAMING = True  # False: open the mic and calibrate for every phrase (old behaviour)
+JARVIS_STT_SAMPLE_RATE = 16000
+JARVIS_STT_CHUNK_MS = 20  # device read size
+JARVIS_STT_RING_SECONDS = 10.0  # audio buffered between capture and segmentation
+JARVIS_STT_QUEUE_SIZE = 4  # utterances waiting for recognition; the oldest is dropped beyond this
+JARVIS_STT_STATS_WINDOW = 200  # utterances kept for latency percentiles
+# Recognizer: "auto" (local Vosk if installed, else Whisper API with a key, else Google), "vosk", "whisper", "google"
+JARVIS_STT_BACKEND = "auto"
+# JARVIS_STT_LANGUAGE -> Vosk model folder under assets/models/ (or an absolute path); no entry, no Vosk
+JARVIS_VOSK_MODELS = {"en": "vosk-model-small-en-us-0.15"}
+JARVIS_VOSK_GRAMMAR = None  # e.g. ("status", "help", "health", "wave", ...) to decode only these phrases
+JARVIS_EARLY_COMMANDS = ("status", "help", "health", "wave")  # answered from a partial result mid-utterance
+JARVIS_PARTIAL_STABLE_MS = 250  # ...once the partial has held this long; longer than a pause between words
+JARVIS_INTENT_MAX_WORDS = 8  # longer utterances always go to the LLM, even if they contain a command word
+JARVIS_INTENT_FUZZY_MIN_LEN = 6  # misheard-word matching only against keywords this long (never pause/resume)
+# LLM reply cache: keyed on the normalized prompt and game state in bands
+JARVIS_CACHE_ENABLED = True
+JARVIS_CACHE_CAPACITY = 256  # in-memory entries (LRU)
+JARVIS_CACHE_TTL = 600.0  # seconds an in-memory reply stays valid
+JARVIS_CACHE_DB = ""  # SQLite file for replies that persist across sessions ("" = memory only)
+JARVIS_CACHE_DISK_TTL = 7 * 24 * 3600.0
+JARVIS_CACHE_STATE_BAND_PCT = 10  # health/energy bands in percent
+# Jarvis service: one event loop thread, prioritized speech queue (combat > command > chat)
+JARVIS_SPEECH_QUEUE_SIZE = 8  # lines waiting to be spoken; the least urgent is dropped beyond this
+JARVIS_COMBAT_LINE_MAX_AGE = 3.0  # seconds after its event a wave callout is still worth saying...
+JARVIS_COMMAND_LINE_MAX_AGE = 6.0  # ...a command reply...
+JARVIS_CHAT_LINE_MAX_AGE = 12.0  # ...and a chit-chat reply (LLM time included)
+JARVIS_LLM_TIMEOUT = 6.0  # seconds before an LLM request gives up with the stock reply
+JARVIS_VAD_FRAME_MS = 20
+JARVIS_VAD_START_RATIO = 3.0  # frame RMS above noise floor x this starts speech...
+JARVIS_VAD_START_MS = 60  # ...once sustained this long
+JARVIS_VAD_END_RATIO = 2.0  # speech continues while above floor x this (hysteresis)
+JARVIS_VAD_END_SILENCE_MS = 400  # quiet this long ends the utterance
+JARVIS_VAD_PRE_ROLL_MS = 200  # audio kept before the detected onset
+JARVIS_VAD_MIN_SPEECH_MS = 150  # shorter bursts (clicks, bumps) are discarded
+JARVIS_VAD_MAX_UTTERANCE_S = 8.0  # longer speech is cut and sent anyway
+JARVIS_VAD_MIN_ENERGY = 200.0  # absolute RMS (int16 scale) below which nothing counts as speech
+JARVIS_VAD_FLOOR_DOWN = 0.2  # per-frame noise floor tracking when the room gets quieter...
+JARVIS_VAD_FLOOR_UP = 0.02  # ...and (slower) when it gets louder
 
 # -----------------------------------------------------------------------------
 # Paths (relative to project root)
@@ -1,8 +1,11 @@
 """
 Iron Man Arc Reactor Game - Shoot To Thrill
-Entry point. Run with: python main.py
+Entry point. Run with: python main.py [--profile-startup]
+Headless soak test (no window, display or GPU): python main.py --headless --ticks 36000 --seed 1
+Frame profiling (F3 toggles the overlay in game): python main.py --profile-frames trace.json
 """
 
+import argparse
 import sys
 import os
 
@@ -10,10 +13,43 @@ import os
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 import config
-from src.game.game_manager import GameManager
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Shoot To Thrill - Iron Man Arc Reactor")
+    parser.add_argument(
+        "--profile-startup", action="store_true",
+        help="print per-import and per-subsystem startup timings once everything is ready",
+    )
+    parser.add_argument(
+        "--profile-frames", nargs="?", const="frame_trace.json", default=None, metavar="PATH",
+        help="time every game-loop stage; writes a Chrome trace (.json) or stage percentiles (.csv) to PATH",
+    )
+    parser.add_argument(
+        "--headless", action="store_true",
+        help="run the gameplay simulation without a window at a fixed timestep, as fast as possible",
+    )
+    parser.add_argument("--ticks", type=int, default=36000, help="headless: simulation ticks to run")
+    parser.add_argument("--seed", type=int, default=0, help="headless: seed for spawns, drift and the autopilot")
+    parser.add_argument(
+        "--dt", type=float, default=None,
+        help="headless: fixed timestep in seconds (default 1 / SIM_TICK_RATE)",
+    )
+    args = parser.parse_args()
+    if args.profile_frames:
+        from src.game.frame_profiler import FRAME_PROFILER
+        FRAME_PROFILER.enable(trace_path=args.profile_frames)
+        config.PROFILER_OVERLAY = True
+    if args.headless:
+        from src.game.simulation import run_headless, format_report
+        print(format_report(run_headless(args.ticks, seed=args.seed, dt=args.dt)))
+        if args.profile_frames:
+            print(FRAME_PROFILER.report())
+            print(f"trace written to {FRAME_PROFILER.export(args.profile_frames)}")
+        return
+    if args.profile_startup:
+        config.STARTUP_PROFILE = True
+    from src.game.game_manager import GameManager
     gm = GameManager(
         width=config.WINDOW_WIDTH,
         height=config.WINDOW_HEIGHT,
@@ -2,6 +2,7 @@ from .game_manager import GameManager
 from .player import Player
 from .enemy_spawner import EnemySpawner
 from .ultron_enemy import UltronEnemy
+from .enemy_store import EnemyStore
 from .collision import check_beam_enemy_collision
 
 __all__ = [
@@ -9,5 +10,6 @@ __all__ = [
     "Player",
     "EnemySpawner",
     "UltronEnemy",
+    "EnemyStore",
     "check_beam_enemy_collision",
 ]
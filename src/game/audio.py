@@ -1,18 +1,43 @@
 """
 Game audio: repulsor fire, explosions, optional BGM.
+pygame and its mixer are loaded by preload() on a startup thread, so importing
+this module costs nothing. Until preload() has finished, the play functions are
+silent no-ops: the render thread never imports pygame or decodes a sound.
 """
 
 import sys
 import os
+import threading
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 import config
 
-try:
-    import pygame
-    pygame.mixer.init(frequency=22050, size=-16, channels=2, buffer=512)
-    PYGAME_MIXER_AVAILABLE = True
-except Exception:
-    PYGAME_MIXER_AVAILABLE = False
+pygame = None
+PYGAME_MIXER_AVAILABLE = False
+_mixer_tried = False
+_preloaded = False  # set once preload() has opened the mixer and decoded the effects
+_mixer_lock = threading.Lock()
+
+
+def init_mixer():
+    """Import pygame and open the mixer once. Returns True if audio is available."""
+    global pygame, PYGAME_MIXER_AVAILABLE, _mixer_tried
+    with _mixer_lock:
+        if _mixer_tried:
+            return PYGAME_MIXER_AVAILABLE
+        _mixer_tried = True
+        try:
+            import pygame as _pygame
+            _pygame.mixer.init(frequency=22050, size=-16, channels=2, buffer=512)
+            pygame = _pygame
+            PYGAME_MIXER_AVAILABLE = True
+        except Exception:
+            PYGAME_MIXER_AVAILABLE = False
+        return PYGAME_MIXER_AVAILABLE
+
+
+def _mixer_ready():
+    return _preloaded and PYGAME_MIXER_AVAILABLE
+
 
 _sounds = {}
 _sound_files = {
@@ -33,8 +58,24 @@ def _path(name):
     return p if os.path.isfile(p) else None
 
 
+def preload():
+    """Open the mixer and decode the effect sounds so the first shot does not stall a frame."""
+    global _preloaded
+    if not init_mixer():
+        return False
+    for name in ("repulsor", "explosion"):
+        path = _path(name)
+        if path and name not in _sounds:
+            try:
+                _sounds[name] = pygame.mixer.Sound(path)
+            except Exception:
+                pass
+    _preloaded = True
+    return True
+
+
 def play_repulsor():
-    if not PYGAME_MIXER_AVAILABLE:
+    if not _mixer_ready():
         return
     path = _path("repulsor")
     if path:
@@ -49,7 +90,7 @@ def play_repulsor():
 
 
 def play_explosion():
-    if not PYGAME_MIXER_AVAILABLE:
+    if not _mixer_ready():
         return
     path = _path("explosion")
     if path:
@@ -64,7 +105,7 @@ def play_explosion():
 
 
 def play_bgm(loop=-1):
-    if not PYGAME_MIXER_AVAILABLE:
+    if not _mixer_ready():
         return
     path = _path("bgm")
     if path:
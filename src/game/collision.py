@@ -1,32 +1,186 @@
 """
 Hit detection between repulsor beams and Ultron enemies.
+Broad phase: enemies are bucketed into a uniform grid (rebuilt each frame from
+their positions and radii, all in NumPy); each beam only looks at the 27 cells
+around it. Narrow phase is a swept segment-vs-sphere test from the beam's previous
+to current position, vectorized over the candidate pairs, so fast beams cannot
+tunnel through drones at low frame rates.
 """
 
 import sys
 import os
+from itertools import chain
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
-try:
-    from ursina import Vec3
-    URSINA_AVAILABLE = True
-except ImportError:
-    URSINA_AVAILABLE = False
+import numpy as np
+
+DEFAULT_ENEMY_RADIUS = 2.0
+
+# Cell coordinates are packed into one int64 key: 21 bits per axis, offset to stay positive
+_KEY_BITS = 21
+_KEY_OFFSET = 1 << (_KEY_BITS - 1)
+_NEIGHBOURS = np.array(
+    [(dx, dy, dz) for dx in (-1, 0, 1) for dy in (-1, 0, 1) for dz in (-1, 0, 1)],
+    dtype=np.int64,
+)
 
 
 def _distance_point_to_segment(p, a, b):
     """Squared distance from point p to segment a-b (for speed)."""
-    ab = Vec3(b) - Vec3(a)
-    ap = Vec3(p) - Vec3(a)
-    t = max(0, min(1, ap.dot(ab) / (ab.length_squared() + 1e-9)))
-    closest = a + ab * t
-    return (Vec3(p) - closest).length_squared()
+    abx, aby, abz = b[0] - a[0], b[1] - a[1], b[2] - a[2]
+    apx, apy, apz = p[0] - a[0], p[1] - a[1], p[2] - a[2]
+    t = max(0.0, min(1.0, (apx * abx + apy * aby + apz * abz) / (abx * abx + aby * aby + abz * abz + 1e-9)))
+    dx, dy, dz = apx - abx * t, apy - aby * t, apz - abz * t
+    return dx * dx + dy * dy + dz * dz
+
+
+def segment_sphere_entry(starts, ends, centers, radii):
+    """
+    Vectorized swept test of segments start->end against spheres (row-wise pairs).
+    Returns (hit, t): t in [0, 1] is where along the segment the sphere is first
+    entered (0 when the segment starts inside it).
+    """
+    d = ends - starts
+    f = starts - centers
+    a = np.einsum("ij,ij->i", d, d)
+    b = np.einsum("ij,ij->i", f, d)
+    c = np.einsum("ij,ij->i", f, f) - radii * radii
+    inside = c <= 0.0
+    disc = b * b - a * c
+    moving = a > 1e-12
+    with np.errstate(invalid="ignore", divide="ignore"):
+        t = np.where(moving, (-b - np.sqrt(np.maximum(disc, 0.0))) / np.where(moving, a, 1.0), np.inf)
+    hit = inside | (moving & (disc >= 0.0) & (t >= 0.0) & (t <= 1.0))
+    return hit, np.where(inside, 0.0, t)
+
+
+def enemy_radius(enemy):
+    """Bounding radius of an enemy: its cached radius, else the largest entity scale axis."""
+    r = getattr(enemy, "radius", None)
+    if r is not None:
+        return r
+    entity = getattr(enemy, "entity", None)
+    if entity is not None and hasattr(entity, "scale"):
+        s = entity.scale
+        return max(s[0], s[1], s[2])
+    return DEFAULT_ENEMY_RADIUS
+
+
+def positions_array(objects):
+    """(N, 3) float64 array of get_position() for each object, in one pass."""
+    n = len(objects)
+    flat = np.fromiter(chain.from_iterable(tuple(o.get_position())[:3] for o in objects), dtype=np.float64, count=3 * n)
+    return flat.reshape(n, 3)
+
+
+def _enemy_arrays(enemies, hit_radius):
+    """Centers and hit radii; read straight from the EnemyStore when all enemies share one."""
+    store = getattr(enemies[0], "store", None)
+    if store is not None and all(getattr(e, "store", None) is store for e in enemies):
+        slots = np.fromiter((e.slot for e in enemies), dtype=np.intp, count=len(enemies))
+        return store.position[slots], store.radius[slots] + hit_radius
+    radii = np.fromiter((enemy_radius(e) for e in enemies), dtype=np.float64, count=len(enemies))
+    return positions_array(enemies), radii + hit_radius
+
+
+def _cell_keys(cells):
+    c = cells + _KEY_OFFSET
+    return (c[..., 0] << (2 * _KEY_BITS)) | (c[..., 1] << _KEY_BITS) | c[..., 2]
+
+
+class SpatialGrid:
+    """
+    Uniform grid over spheres. build() sorts sphere centers by cell key; the cell
+    size is at least the largest radius plus the query margin, so any sphere within
+    margin of a point lies in the 3x3x3 block of cells around that point.
+    """
+
+    def __init__(self, min_cell_size=1.0):
+        self.min_cell_size = min_cell_size
+        self.cell_size = min_cell_size
+        self.margin = 0.0
+        self._order = np.empty(0, dtype=np.intp)
+        self._keys = np.empty(0, dtype=np.int64)
+        self.centers = np.empty((0, 3))
+        self.radii = np.empty(0)
+
+    def build(self, centers, radii, margin=0.0):
+        """margin: extra reach for queries; segments up to 2 * margin long can be queried."""
+        self.centers = np.asarray(centers, dtype=np.float64).reshape(-1, 3)
+        self.radii = np.asarray(radii, dtype=np.float64).reshape(-1)
+        self.margin = margin
+        if len(self.radii) == 0:
+            self._order = np.empty(0, dtype=np.intp)
+            self._keys = np.empty(0, dtype=np.int64)
+            return
+        self.cell_size = max(self.min_cell_size, float(self.radii.max()) + margin)
+        keys = _cell_keys(np.floor(self.centers / self.cell_size).astype(np.int64))
+        self._order = np.argsort(keys, kind="stable")
+        self._keys = keys[self._order]
+
+    def __len__(self):
+        return len(self._keys)
+
+    def candidates(self, points):
+        """
+        Broad phase for (M, 3) points: (point_idx, sphere_idx) arrays of every sphere
+        in the 27 cells around each point. Pairs are grouped by point.
+        """
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+        if len(points) == 0 or len(self._keys) == 0:
+            empty = np.empty(0, dtype=np.intp)
+            return empty, empty
+        cells = np.floor(points / self.cell_size).astype(np.int64)
+        query = _cell_keys(cells[:, None, :] + _NEIGHBOURS[None, :, :]).ravel()
+        lo = np.searchsorted(self._keys, query, side="left")
+        counts = np.searchsorted(self._keys, query, side="right") - lo
+        total = int(counts.sum())
+        if total == 0:
+            empty = np.empty(0, dtype=np.intp)
+            return empty, empty
+        # Expand each [lo, lo + count) run into explicit indices
+        run_starts = np.repeat(lo - (np.cumsum(counts) - counts), counts)
+        sorted_idx = run_starts + np.arange(total)
+        point_idx = np.repeat(np.arange(len(query)) // len(_NEIGHBOURS), counts)
+        return point_idx, self._order[sorted_idx]
+
+    def query(self, points):
+        """Narrow phase: (point_idx, sphere_idx) pairs where the point lies inside the sphere."""
+        pi, si = self.candidates(points)
+        if len(pi) == 0:
+            return pi, si
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+        d = points[pi] - self.centers[si]
+        inside = np.einsum("ij,ij->i", d, d) <= self.radii[si] ** 2
+        return pi[inside], si[inside]
+
+    def query_segments(self, starts, ends):
+        """
+        Swept narrow phase: (segment_idx, sphere_idx, t) for every sphere a segment
+        enters, t being the entry fraction along it. Segments must be at most
+        2 * margin long (see build); any sphere they touch is within reach of their midpoint.
+        """
+        starts = np.asarray(starts, dtype=np.float64).reshape(-1, 3)
+        ends = np.asarray(ends, dtype=np.float64).reshape(-1, 3)
+        seg, sph = self.candidates(0.5 * (starts + ends))
+        if len(seg) == 0:
+            return seg, sph, np.empty(0)
+        hit, t = segment_sphere_entry(starts[seg], ends[seg], self.centers[sph], self.radii[sph])
+        return seg[hit], sph[hit], t[hit]
+
+
+def _previous_position(beam):
+    get_prev = getattr(beam, "get_prev_position", None)
+    prev = get_prev() if get_prev else None
+    return prev if prev is not None else beam.get_position()
 
 
 def check_beam_enemy_collision(beam, enemy, hit_radius=3.0):
     """
     Check if beam (with position and direction) hits enemy (position, bounding size).
-    beam: RepulsorBeam with get_position(); we use current position and approximate extent.
-    enemy: UltronEnemy with get_position() and entity.scale.
+    beam: RepulsorBeam with get_position() and get_prev_position(); the path travelled
+    since the last frame is tested, not just the current point.
+    enemy: UltronEnemy with get_position() and a radius (or entity.scale).
     Returns True if hit.
     """
     if not beam or not enemy or not beam.is_alive() or not enemy.is_alive():
@@ -35,28 +189,38 @@ def check_beam_enemy_collision(beam, enemy, hit_radius=3.0):
     enemy_pos = enemy.get_position()
     if beam_pos is None or enemy_pos is None:
         return False
-    # Simple sphere-sphere: beam is a moving point, enemy has radius ~scale
-    dist_sq = (Vec3(beam_pos) - Vec3(enemy_pos)).length_squared()
-    enemy_radius = 2.0  # approximate from entity scale
-    if hasattr(enemy, "entity") and enemy.entity and hasattr(enemy.entity, "scale"):
-        s = enemy.entity.scale
-        enemy_radius = max(s[0], s[1], s[2])
-    return dist_sq <= (hit_radius + enemy_radius) ** 2
+    # Swept sphere test: the beam is a point moving along prev -> current
+    dist_sq = _distance_point_to_segment(enemy_pos, _previous_position(beam), beam_pos)
+    return dist_sq <= (hit_radius + enemy_radius(enemy)) ** 2
 
 
-def check_all_beams_vs_enemies(beams, enemies, hit_radius=3.0):
+def check_all_beams_vs_enemies(beams, enemies, hit_radius=3.0, grid=None):
     """
     Check all beams against all enemies. Returns list of (beam, enemy) pairs that hit.
-    Caller applies damage and removes beam.
-    """
-    hits = []
-    for beam in beams:
-        if not beam.is_alive():
-            continue
-        for enemy in enemies:
-            if not enemy.is_alive():
-                continue
-            if check_beam_enemy_collision(beam, enemy, hit_radius):
-                hits.append((beam, enemy))
-                break  # one beam hits one enemy only
-    return hits
+    Caller applies damage and removes beam. Each beam's path since the last frame is
+    swept against the enemies and it hits only the one it reaches first (ties go to
+    the earlier enemy in list order). Pairs are returned in beam order.
+    grid: optional SpatialGrid to reuse between frames.
+    """
+    beams = [b for b in beams if b.is_alive() and b.get_position() is not None]
+    if not beams:
+        return []
+    # Store-backed enemies always have a position; skip building a Vec3 just to check
+    enemies = [e for e in enemies if e.is_alive() and (hasattr(e, "slot") or e.get_position() is not None)]
+    if not enemies:
+        return []
+    ends = positions_array(beams)
+    starts = np.asarray([tuple(_previous_position(b))[:3] for b in beams], dtype=np.float64)
+    half_len = 0.5 * np.sqrt(np.einsum("ij,ij->i", ends - starts, ends - starts))
+    grid = grid or SpatialGrid()
+    centers, radii = _enemy_arrays(enemies, hit_radius)
+    grid.build(centers, radii, margin=float(half_len.max()))
+    bi, ei, t = grid.query_segments(starts, ends)
+    if len(bi) == 0:
+        return []
+    # Earliest hit per beam: sort by (beam, t, enemy) and keep each beam's first pair
+    order = np.lexsort((ei, t, bi))
+    bi, ei = bi[order], ei[order]
+    first = np.ones(len(bi), dtype=bool)
+    first[1:] = bi[1:] != bi[:-1]
+    return [(beams[b], enemies[e]) for b, e in zip(bi[first].tolist(), ei[first].tolist())]
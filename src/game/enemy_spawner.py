@@ -1,5 +1,7 @@
 """
 Wave-based enemy spawner: Ultron drones with increasing difficulty.
+All enemies of the spawner share one EnemyStore and are advanced in a single vectorized step.
+Clock, RNG and camera are injectable so the headless simulation can replay a run exactly.
 """
 
 import sys
@@ -8,10 +10,12 @@ import time
 import random
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 import config
-from .ultron_enemy import UltronEnemy
+from .ultron_enemy import UltronEnemy, enemy_entity_kwargs
+from .enemy_store import EnemyStore, VARIANTS
 
 try:
-    from ursina import Vec3, camera
+    from ursina import camera as ursina_camera
+    from src.graphics.entity_pool import get_pool
     URSINA_AVAILABLE = True
 except ImportError:
     URSINA_AVAILABLE = False
@@ -20,15 +24,29 @@ except ImportError:
 class EnemySpawner:
     """Spawns Ultron enemies in waves with scaling difficulty."""
 
-    def __init__(self):
+    def __init__(self, store=None, clock=None, rng=None, camera=None, render=True):
         self.wave = 0
+        self.store = store or EnemyStore()
+        self.clock = clock or time.perf_counter
+        self.rng = rng or random.Random()
+        # Spawns are placed ahead of (and despawns judged behind) this camera's z
+        self.camera = camera if camera is not None else (ursina_camera if URSINA_AVAILABLE else None)
+        self.render = render
         self.enemies = []
+        self._deaths_seen = 0
+        for variant in VARIANTS:
+            self._pool(variant)  # pre-warm now rather than on the first spawn of each variant
         self._next_spawn_time = 0.0
         self._spawn_interval = config.WAVE_SPAWN_INTERVAL
         self._enemies_this_wave = 0
         self._enemies_to_spawn = config.WAVE_ENEMY_COUNT_BASE
         self._wave_cleared = True
 
+    @property
+    def wave_cleared(self):
+        """True between waves: the last wave spawned everything and none are left."""
+        return self._wave_cleared
+
     def start_next_wave(self):
         self.wave += 1
         self._wave_cleared = False
@@ -37,29 +55,39 @@ class EnemySpawner:
             config.WAVE_ENEMY_COUNT_BASE
             + (self.wave - 1) * config.WAVE_ENEMY_COUNT_INCREMENT
         )
-        self._next_spawn_time = time.perf_counter()
+        self._next_spawn_time = self.clock()
+
+    def _camera_z(self):
+        return self.camera.z if self.camera is not None else 0
 
     def update(self, dt):
-        now = time.perf_counter()
+        now = self.clock()
         # Spawn new enemy if wave not complete and interval passed
         if not self._wave_cleared and self._enemies_this_wave < self._enemies_to_spawn:
             if now >= self._next_spawn_time:
                 self._spawn_one()
                 self._enemies_this_wave += 1
                 self._next_spawn_time = now + self._spawn_interval
-        # Update all enemies
-        cam_z = camera.z if URSINA_AVAILABLE and camera else 0
-        self.enemies = [e for e in self.enemies if e.update(dt, cam_z)]
+        # Update all enemies in one step; only enemies that flew past need per-object work
+        cam_z = self._camera_z()
+        for enemy in self.store.step(dt, cam_z):
+            enemy.destroy()
+        # Entities are positioned once per rendered frame by sync_entities(alpha)
+        if self.store.deaths != self._deaths_seen:
+            # Rebuild the list only on frames where something died or despawned
+            self._deaths_seen = self.store.deaths
+            self.enemies = [e for e in self.enemies if e.is_alive()]
         if not self._wave_cleared and self._enemies_this_wave >= self._enemies_to_spawn and len(self.enemies) == 0:
             self._wave_cleared = True
         return self._wave_cleared
 
     def _spawn_one(self):
         # Spawn ahead of camera
-        cam_z = camera.z + 40 if URSINA_AVAILABLE and camera else 40
-        x = random.uniform(-15, 15)
-        y = random.uniform(-5, 15)
-        z = cam_z + random.uniform(0, 20)
+        rng = self.rng
+        cam_z = self._camera_z() + 40
+        x = rng.uniform(-15, 15)
+        y = rng.uniform(-5, 15)
+        z = cam_z + rng.uniform(0, 20)
         # Difficulty scaling
         health = 20 + self.wave * 5
         speed = 12 + self.wave * 0.5
@@ -68,11 +96,22 @@ class EnemySpawner:
             variant = "heavy"
             health = 100 + self.wave * 10
             speed = 8
-        elif self.wave > 2 and random.random() < 0.3:
+        elif self.wave > 2 and rng.random() < 0.3:
             variant = "standard"
             health = 40 + self.wave * 5
-        e = UltronEnemy(Vec3(x, y, z), health=health, speed=speed, variant=variant)
+        e = UltronEnemy((x, y, z), health=health, speed=speed, variant=variant, store=self.store,
+                         pool=self._pool(variant), render=self.render)
         self.enemies.append(e)
 
+    def sync_entities(self, alpha=1.0):
+        """Place enemy entities between the last two simulation steps (see EnemyStore.sync_entities)."""
+        if self.render:
+            self.store.sync_entities(alpha)
+
+    def _pool(self, variant):
+        if not URSINA_AVAILABLE or not self.render:
+            return None
+        return get_pool(f"enemy:{variant}", **enemy_entity_kwargs(variant))
+
     def get_enemies(self):
         return self.enemies
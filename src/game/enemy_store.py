@@ -0,0 +1,133 @@
+"""
+Struct-of-arrays storage for Ultron enemies.
+Position, velocity, health, variant and the alive mask live in NumPy arrays and
+all enemies advance in one vectorized step; UltronEnemy is a thin handle onto a slot.
+Freed slots are reused; a per-slot generation counter keeps stale handles dead.
+Positions before the last step are kept so rendering can interpolate between ticks.
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import numpy as np
+
+VARIANTS = ("drone", "standard", "heavy")
+VARIANT_SIZE = np.array([1.0, 1.5, 2.0])  # entity scale factor per variant
+DESPAWN_BEHIND = 20.0  # enemies this far behind the camera are removed
+JITTER = 2.0  # max lateral drift speed (units/s) on x and y
+
+
+class EnemyStore:
+    """Fixed-layout arrays for every enemy slot; grows by doubling."""
+
+    def __init__(self, capacity=64, rng=None):
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.count = 0  # slots in use (alive or free) from the front of the arrays
+        self.deaths = 0  # bumps whenever an enemy dies or despawns
+        self._free = []
+        self._alloc(max(1, capacity))
+
+    def _alloc(self, capacity):
+        old = self.count
+        def grow(arr, shape, dtype, fill=0):
+            new = np.full(shape, fill, dtype=dtype)
+            if old:
+                new[:old] = arr[:old]
+            return new
+        self.position = grow(getattr(self, "position", None), (capacity, 3), np.float64)
+        self.prev_position = grow(getattr(self, "prev_position", None), (capacity, 3), np.float64)
+        self.velocity = grow(getattr(self, "velocity", None), (capacity, 3), np.float64)
+        self.health = grow(getattr(self, "health", None), capacity, np.float64)
+        self.max_health = grow(getattr(self, "max_health", None), capacity, np.float64)
+        self.variant = grow(getattr(self, "variant", None), capacity, np.int8)
+        self.radius = grow(getattr(self, "radius", None), capacity, np.float64)
+        self.alive = grow(getattr(self, "alive", None), capacity, np.bool_, False)
+        self.generation = grow(getattr(self, "generation", None), capacity, np.int64)
+        handles = [None] * capacity
+        if old:
+            handles[:old] = self.handles[:old]
+        self.handles = handles
+        self.capacity = capacity
+
+    def spawn(self, position, health, speed, variant="drone", handle=None):
+        """Claim a slot. Returns (slot, generation)."""
+        if self._free:
+            slot = self._free.pop()
+        else:
+            if self.count == self.capacity:
+                self._alloc(self.capacity * 2)
+            slot = self.count
+            self.count += 1
+        code = VARIANTS.index(variant) if variant in VARIANTS else 0
+        self.position[slot] = position
+        self.prev_position[slot] = position
+        self.velocity[slot] = (0.0, 0.0, -speed)  # toward camera
+        self.health[slot] = health
+        self.max_health[slot] = health
+        self.variant[slot] = code
+        self.radius[slot] = VARIANT_SIZE[code] * 1.2  # largest entity scale axis
+        self.alive[slot] = True
+        self.generation[slot] += 1
+        self.handles[slot] = handle
+        return slot, int(self.generation[slot])
+
+    def kill(self, slot):
+        if self.alive[slot]:
+            self.alive[slot] = False
+            self.deaths += 1
+            self.handles[slot] = None
+            self._free.append(slot)
+
+    def damage(self, slot, amount):
+        """Apply damage; returns True if this killed the enemy."""
+        self.health[slot] -= amount
+        if self.health[slot] <= 0:
+            self.kill(slot)
+            return True
+        return False
+
+    def alive_slots(self):
+        return np.flatnonzero(self.alive[:self.count])
+
+    def step(self, dt, camera_z=0.0):
+        """
+        Advance every live enemy toward the camera with random lateral drift.
+        Returns the handles of enemies that flew past the camera (their slots are already freed).
+        """
+        n = self.count
+        if n == 0:
+            return []
+        alive = self.alive[:n]
+        pos = self.position[:n]
+        self.prev_position[:n] = pos
+        pos += self.velocity[:n] * (dt * alive)[:, None]
+        drift = (self.rng.random((n, 2)) - 0.5) * (JITTER * dt)
+        pos[:, :2] += drift * alive[:, None]
+        gone = np.flatnonzero(alive & (pos[:, 2] < camera_z - DESPAWN_BEHIND)).tolist()
+        handles = []
+        for slot in gone:
+            if self.handles[slot] is not None:
+                handles.append(self.handles[slot])
+            self.kill(slot)
+        return handles
+
+    def sync_entities(self, alpha=1.0):
+        """
+        Copy positions to the live handles' render entities (one attribute store each),
+        blended alpha of the way from the previous step's positions (1.0 = latest).
+        """
+        slots = self.alive_slots()
+        handles = self.handles
+        pos = self.position[slots]
+        if alpha < 1.0:
+            prev = self.prev_position[slots]
+            pos = prev + (pos - prev) * alpha
+        for slot, p in zip(slots.tolist(), pos.tolist()):
+            handle = handles[slot]
+            entity = handle.entity if handle is not None else None
+            if entity is not None:
+                entity.position = p
+
+    def live_count(self):
+        return int(self.alive[:self.count].sum())
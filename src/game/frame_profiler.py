@@ -0,0 +1,205 @@
+"""
+Per-frame profiling: scoped timers around each stage of the game loop (and the
+vision thread), rolling p50/p95/p99 per stage for the HUD overlay, and a Chrome
+trace (chrome://tracing, Perfetto) written periodically in the background.
+Disabled, scope() hands back one shared no-op context manager, so instrumented
+call sites cost an attribute check and two empty method calls.
+"""
+
+import json
+import csv
+import threading
+import time
+from collections import deque
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+import config
+
+import numpy as np
+from .startup import PROCESS_START
+
+FRAME = "frame"  # stage name of the span from one begin_frame() to the next (includes rendering)
+
+
+class _NullScope:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SCOPE = _NullScope()
+
+
+class _Scope:
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.record(self.name, self.start, time.perf_counter())
+        return False
+
+
+class FrameProfiler:
+    """
+    Rolling per-stage durations (last `window` samples each) plus a bounded list
+    of trace events. Thread-safe enough for the game and vision threads to record
+    concurrently (deque appends are atomic).
+    """
+
+    def __init__(self, enabled=None, window=None, trace_path=None, trace_interval=None, max_trace_events=None):
+        self.enabled = config.PROFILER_ENABLED if enabled is None else enabled
+        self.window = window or config.PROFILER_WINDOW
+        self.trace_path = config.PROFILER_TRACE_PATH if trace_path is None else trace_path
+        self.trace_interval = config.PROFILER_TRACE_INTERVAL if trace_interval is None else trace_interval
+        self.max_trace_events = max_trace_events or config.PROFILER_TRACE_MAX_EVENTS
+        self.origin = PROCESS_START
+        self._samples = {}
+        self._events = deque(maxlen=self.max_trace_events)
+        self._threads = {}
+        self._frame_start = None
+        self._last_export = time.perf_counter()
+        self._exporting = None
+        self.frames = 0
+
+    def enable(self, trace_path=None):
+        if trace_path is not None:
+            self.trace_path = trace_path
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def scope(self, name):
+        """Context manager timing a block as stage `name` (no-op when disabled)."""
+        if not self.enabled:
+            return _NULL_SCOPE
+        return _Scope(self, name)
+
+    def record(self, name, start, end):
+        """Add one sample; start/end are time.perf_counter() values (any thread)."""
+        if not self.enabled:
+            return
+        samples = self._samples.get(name)
+        if samples is None:
+            samples = self._samples.setdefault(name, deque(maxlen=self.window))
+        samples.append(end - start)
+        tid = threading.get_ident()
+        if tid not in self._threads:
+            self._threads[tid] = threading.current_thread().name
+        self._events.append((name, start, end, tid))
+
+    def begin_frame(self):
+        """
+        Call once at the top of every frame: closes the previous frame span and
+        writes the trace every trace_interval seconds if a path is set.
+        """
+        if not self.enabled:
+            self._frame_start = None
+            return
+        now = time.perf_counter()
+        if self._frame_start is not None:
+            self.record(FRAME, self._frame_start, now)
+            self.frames += 1
+        self._frame_start = now
+        if self.trace_path and now - self._last_export >= self.trace_interval:
+            self._last_export = now
+            self.export_async(self.trace_path)
+
+    def stats(self):
+        """Per stage: count, mean/p50/p95/p99/max in ms over the rolling window."""
+        out = {}
+        for name, samples in list(self._samples.items()):
+            if not samples:
+                continue
+            ms = 1000.0 * np.fromiter(list(samples), dtype=np.float64)
+            p50, p95, p99 = np.percentile(ms, (50, 95, 99))
+            out[name] = {
+                "count": len(ms),
+                "mean_ms": float(ms.mean()),
+                "p50_ms": float(p50),
+                "p95_ms": float(p95),
+                "p99_ms": float(p99),
+                "max_ms": float(ms.max()),
+            }
+        return out
+
+    def report(self):
+        """Stage table sorted by p95, frame first."""
+        stats = self.stats()
+        order = sorted(stats, key=lambda n: (n != FRAME, -stats[n]["p95_ms"]))
+        lines = [f"{'stage':<22}{'p50':>8}{'p95':>8}{'p99':>8}{'max':>8}  ms"]
+        for name in order:
+            s = stats[name]
+            lines.append(f"{name:<22}{s['p50_ms']:>8.2f}{s['p95_ms']:>8.2f}{s['p99_ms']:>8.2f}{s['max_ms']:>8.2f}")
+        return "\n".join(lines)
+
+    def chrome_trace(self):
+        """Trace Event Format dict: one complete ("X") event per recorded span."""
+        pid = os.getpid()
+        origin = self.origin
+        events = [
+            {"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": name}}
+            for tid, name in list(self._threads.items())
+        ]
+        for name, start, end, tid in list(self._events):
+            events.append({
+                "name": name,
+                "cat": name.split(".", 1)[0],
+                "ph": "X",
+                "ts": (start - origin) * 1e6,
+                "dur": (end - start) * 1e6,
+                "pid": pid,
+                "tid": tid,
+            })
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def export(self, path):
+        """Write the Chrome trace (.json) or the stage percentiles (.csv)."""
+        if path.endswith(".csv"):
+            stats = self.stats()
+            with open(path, "w", newline="") as f:
+                writer = csv.writer(f)
+                writer.writerow(["stage", "count", "mean_ms", "p50_ms", "p95_ms", "p99_ms", "max_ms"])
+                for name, s in stats.items():
+                    writer.writerow([name, s["count"], s["mean_ms"], s["p50_ms"], s["p95_ms"], s["p99_ms"], s["max_ms"]])
+            return path
+        trace = self.chrome_trace()
+        with open(path, "w") as f:
+            json.dump(trace, f)
+        return path
+
+    def export_async(self, path):
+        """export() on a daemon thread so the frame that triggers it does not pay for the write."""
+        if self._exporting is not None and self._exporting.is_alive():
+            return
+        self._exporting = threading.Thread(target=self.export, args=(path,), name="profiler-export", daemon=True)
+        self._exporting.start()
+
+    def overlay_text(self, stages=8):
+        """Compact text for the HUD overlay: frame time then the slowest stages by p95."""
+        stats = self.stats()
+        frame = stats.get(FRAME)
+        lines = []
+        if frame:
+            fps = 1000.0 / frame["mean_ms"] if frame["mean_ms"] > 0 else 0.0
+            lines.append(f"frame {frame['p50_ms']:.1f}/{frame['p95_ms']:.1f}/{frame['p99_ms']:.1f} ms  {fps:.0f} fps")
+        ranked = sorted((n for n in stats if n != FRAME), key=lambda n: -stats[n]["p95_ms"])
+        for name in ranked[:stages]:
+            s = stats[name]
+            lines.append(f"{name:<16}{s['p50_ms']:6.2f}{s['p95_ms']:7.2f}{s['p99_ms']:7.2f}")
+        return "\n".join(lines)
+
+
+FRAME_PROFILER = FrameProfiler()
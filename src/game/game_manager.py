@@ -1,5 +1,10 @@
 """
 Main game loop: Ursina window, vision pipeline, gameplay, collision, scoring.
+Startup is staged: the window and scene come up first while vision, Jarvis and
+audio initialize on background threads (src.game.startup) and join when ready.
+Gameplay itself is a GameSimulation (src.game.simulation) stepped at a fixed
+SIM_TICK_RATE on its own clock, however fast the display refreshes; this class
+feeds it vision input, presents its events and interpolates entities between ticks.
 """
 
 import sys
@@ -7,37 +12,23 @@ import os
 import time
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 import config
+from src.game.startup import PROFILER, StagedStartup
+from src.game.frame_profiler import FRAME_PROFILER
 
-# Optional: vision (may fail if cv2/mediapipe missing)
-from enum import Enum
-class _HandStateFallback(Enum):
-    IDLE = 0
-    AIMING = 1
-    CHARGING = 2
-    FIRING = 3
-    RECHARGING = 4
-try:
-    from src.vision.camera import CameraCapture
-    from src.vision.hand_tracker import HandTracker
-    from src.vision.gesture_detector import GestureDetector, HandState
-    VISION_AVAILABLE = True
-except Exception:
-    VISION_AVAILABLE = False
-    HandState = _HandStateFallback
-    CameraCapture = None
-    HandTracker = None
-    GestureDetector = None
+# The gameplay core imports no camera/MediaPipe code; that stack is loaded by the vision startup task
+with PROFILER.span("src.game.simulation", kind="import"):
+    from src.game.simulation import (
+        GameSimulation, FixedTimestep, ManualClock, StepEvents,
+        HandState, PilotInput, IDLE_INPUT,
+    )
 
 game_audio = None
 try:
-    from ursina import Ursina, window, camera
-    from src.graphics.scene import GameScene
-    from src.graphics.repulsor_beam import RepulsorBeamManager
-    from src.graphics.particles import ParticleSystem
-    from src.graphics.hud import GameHUD
-    from src.game.player import Player
-    from src.game.enemy_spawner import EnemySpawner
-    from src.game.collision import check_all_beams_vs_enemies
+    with PROFILER.span("ursina + graphics", kind="import"):
+        from ursina import Ursina, window, camera
+        from src.graphics.scene import GameScene
+        from src.graphics.particles import ParticleSystem
+        from src.graphics.hud import GameHUD, PerfOverlay
     try:
         from src.game import audio as game_audio
     except Exception:
@@ -46,15 +37,10 @@ try:
 except ImportError:
     URSINA_AVAILABLE = False
 
-try:
-    from src.jarvis.voice_assistant import JarvisVoiceAssistant
-    JARVIS_AVAILABLE = True
-except Exception:
-    JARVIS_AVAILABLE = False
-
 
-SCORE_PER_KILL = {"drone": 10, "standard": 30, "heavy": 100}
-BEAM_DAMAGE = 25
+def _not_firing(state):
+    """A latched shot fires once; later ticks of the same frame only aim."""
+    return HandState.AIMING if state == HandState.FIRING else state
 
 
 class GameManager:
@@ -64,131 +50,207 @@ class GameManager:
         self.fullscreen = fullscreen
         self.app = None
         self.scene = None
+        self.sim = None
         self.player = None
         self.beam_manager = None
         self.particle_system = None
         self.spawner = None
         self.hud = None
+        self.perf_overlay = None
         self.camera_capture = None
         self.hand_tracker = None
         self.gesture_detector = None
+        self.vision = None
+        self._left_fires_seen = 0
+        self._right_fires_seen = 0
+        self._pending_fire = {"left": False, "right": False}  # shots seen on frames that ran no tick
+        self.timestep = FixedTimestep()
         self._dt = 0.0
         self._last_time = 0.0
         self._game_over = False
+        self.paused = False  # set by the "pause"/"resume" voice commands
+        self.jarvis = None
+        self.startup = None
+        self._startup_done = False
         if not URSINA_AVAILABLE:
             return
+        self.startup = StagedStartup()
         window.size = (self.width, self.height)
         window.fullscreen = self.fullscreen
         window.title = "Shoot To Thrill - Iron Man Arc Reactor"
-        self.app = Ursina(borderless=False, vsync=True, development_mode=False)
+        with PROFILER.span("window"):
+            self.app = Ursina(borderless=False, vsync=True, development_mode=False)
         self.scene = GameScene(self.width, self.height, self.fullscreen, create_app=False)
-        self.player = Player()
-        self.player.set_camera(camera)
-        self.beam_manager = RepulsorBeamManager()
+        # Simulation time advances one tick at a time, never with the wall clock
+        self.sim = GameSimulation(clock=ManualClock(), camera=camera)
+        self.player = self.sim.player
+        self.beam_manager = self.sim.beam_manager
+        self.spawner = self.sim.spawner
         self.particle_system = ParticleSystem()
-        self.spawner = EnemySpawner()
         self.hud = GameHUD(self.width, self.height)
-        self.jarvis = None
-        if JARVIS_AVAILABLE:
-            def game_state():
-                return (self.player.health, self.player.energy, self.player.score, self.spawner.wave)
-            self.jarvis = JarvisVoiceAssistant(game_state_callback=game_state)
-            try:
-                self.jarvis.start_listening()
-            except Exception:
-                pass
-        if VISION_AVAILABLE:
-            self.gesture_detector = GestureDetector(
-                pull_back_threshold=config.PULL_BACK_THRESHOLD,
-                smoothing=config.GESTURE_SMOOTHING,
-            )
-            self.hand_tracker = HandTracker(
-                min_detection_confidence=config.HAND_TRACKING_CONFIDENCE,
-                min_tracking_confidence=config.MIN_HAND_PRESENCE,
-            )
-            self.hand_tracker.set_gesture_detector(self.gesture_detector)
-            self.camera_capture = CameraCapture()
-            try:
-                self.camera_capture.start()
-            except Exception:
-                self.camera_capture = None
-        self.spawner.start_next_wave()
+        self.perf_overlay = PerfOverlay(FRAME_PROFILER)
+        PROFILER.mark("scene built")
+        # Heavy subsystems come up in the background; _poll_startup attaches them
+        self.startup.submit("vision", self._init_vision)
+        self.startup.submit("jarvis", self._init_jarvis)
         if game_audio:
-            try:
-                game_audio.play_bgm()
-            except Exception:
-                pass
+            self.startup.submit("audio", game_audio.preload)
         self._last_time = time.perf_counter()
         self.app.update = self._update
 
+    def _init_vision(self):
+        """Startup task: import the vision stack, build and warm up the models, open the camera."""
+        PROFILER.import_module("cv2")
+        PROFILER.import_module("mediapipe")
+        with PROFILER.span("src.vision", kind="import"):
+            from src.vision.vision_worker import VisionWorker
+        vision = VisionWorker(profiler=FRAME_PROFILER)
+        try:
+            if config.STARTUP_WARMUP and vision.hand_tracker:
+                vision.hand_tracker.warm_up((vision.camera.height, vision.camera.width))
+            vision.start()
+        except Exception:
+            vision.stop()
+            raise
+        return vision
+
+    def _init_jarvis(self):
+        """Startup task: import Jarvis (OpenAI, STT, TTS engines) and start listening."""
+        with PROFILER.span("src.jarvis", kind="import"):
+            from src.jarvis.voice_assistant import JarvisVoiceAssistant
+
+        def game_state():
+            return (self.player.health, self.player.energy, self.player.score, self.spawner.wave)
+        jarvis = JarvisVoiceAssistant(
+            game_state_callback=game_state, profiler=FRAME_PROFILER, action_callback=self._voice_action,
+        )
+        try:
+            jarvis.start_listening()
+        except Exception:
+            pass
+        return jarvis
+
+    def _voice_action(self, action):
+        """Jarvis voice command (called on the Jarvis loop thread; a flag store is all it does)."""
+        if action == "pause":
+            self.paused = True
+        elif action == "resume":
+            self.paused = False
+
+    def _poll_startup(self):
+        """Attach subsystems whose background init finished; never blocks the frame."""
+        for name, result, error in self.startup.poll():
+            if name == "vision" and error is None:
+                self.vision = result
+                self.camera_capture = result.camera
+                self.hand_tracker = result.hand_tracker
+                self.gesture_detector = result.gesture_detector
+            elif name == "jarvis" and error is None:
+                self.jarvis = result
+            elif name == "audio" and result:
+                try:
+                    game_audio.play_bgm()
+                except Exception:
+                    pass
+        # Hold the first wave until vision is live (or has failed) so the pilot can aim
+        if not self.sim.started and self.startup.is_ready("vision"):
+            self.sim.start()
+            PROFILER.mark("first wave")
+        if not self._startup_done and self.startup.all_ready():
+            self._startup_done = True
+            PROFILER.mark("all subsystems ready")
+            if config.STARTUP_PROFILE:
+                print(PROFILER.report())
+
     def _update(self):
         if self._game_over:
             return
+        prof = FRAME_PROFILER
+        prof.begin_frame()
+        with prof.scope("update"):
+            self._update_frame(prof)
+
+    def _update_frame(self, prof):
+        if not self._startup_done:
+            PROFILER.mark("first frame")
+            with prof.scope("startup.poll"):
+                self._poll_startup()
         now = time.perf_counter()
-        self._dt = min(now - self._last_time, 0.1)
+        self._dt = now - self._last_time
         self._last_time = now
-        # Vision: get hand state and aim
-        left_state = HandState.AIMING
-        right_state = HandState.AIMING
-        left_aim = (0.5, 0.5)
-        right_aim = (0.5, 0.5)
-        if VISION_AVAILABLE and self.camera_capture and self.gesture_detector:
-            frame = self.camera_capture.read()
-            if frame is not None:
-                self.hand_tracker.process(frame)
-                left_state = self.gesture_detector.get_left_state()
-                right_state = self.gesture_detector.get_right_state()
-                left_aim = self.gesture_detector.get_left_aim()
-                right_aim = self.gesture_detector.get_right_aim()
-        # Recharge when fist
-        if left_state == HandState.RECHARGING or right_state == HandState.RECHARGING:
-            self.player.recharge(self._dt)
-        # Fire repulsors
-        if left_state == HandState.FIRING and self.player.can_fire_left(now) and self.player.energy >= self.player.repulsor_cost:
-            origin, direction = self.player.get_aim_ray_left(left_aim[0], left_aim[1])
-            if origin and direction:
-                self.beam_manager.fire(origin, direction, hand="left")
-                self.player.consume_fire_left(now)
-                if game_audio:
+        if self.paused:
+            self._dt = 0.0  # no ticks and no presentation motion; HUD and voice stay live
+        with prof.scope("input"):
+            inputs = self._read_input()
+        with prof.scope("sim"):
+            events = self._tick(inputs)
+        if game_audio and events.fired:
+            with prof.scope("audio"):
+                for _ in events.fired:
                     try:
                         game_audio.play_repulsor()
                     except Exception:
                         pass
-        if right_state == HandState.FIRING and self.player.can_fire_right(now) and self.player.energy >= self.player.repulsor_cost:
-            origin, direction = self.player.get_aim_ray_right(right_aim[0], right_aim[1])
-            if origin and direction:
-                self.beam_manager.fire(origin, direction, hand="right")
-                self.player.consume_fire_right(now)
-                if game_audio:
-                    try:
-                        game_audio.play_repulsor()
-                    except Exception:
-                        pass
-        # Collision: beams vs enemies
-        hits = check_all_beams_vs_enemies(self.beam_manager.beams, self.spawner.enemies)
-        for beam, enemy in hits:
-            beam.destroy()
-            if enemy.take_damage(BEAM_DAMAGE):
-                self.particle_system.explode(enemy.get_position())
-                variant = getattr(enemy, "variant", "drone")
-                self.player.score += SCORE_PER_KILL.get(variant, 10)
-        # Update systems
-        self.beam_manager.update(self._dt)
-        self.spawner.update(self._dt)
-        self.particle_system.update(self._dt)
-        self.scene.update(self._dt)
-        wave_cleared = self.spawner._wave_cleared
-        if wave_cleared and len(self.spawner.enemies) == 0:
-            self.spawner.start_next_wave()
-            if self.jarvis:
+        # Update presentation (a long stall should not jump the camera or particles)
+        render_dt = min(self._dt, 0.1)
+        with prof.scope("particles"):
+            for position, _variant in events.kills:
+                self.particle_system.explode(position)
+            self.particle_system.update(render_dt)
+        with prof.scope("scene"):
+            self.scene.update(render_dt)
+        if events.wave_started and self.jarvis:
+            with prof.scope("jarvis"):
                 try:
-                    self.jarvis.wave_started(self.spawner.wave)
+                    self.jarvis.wave_started(events.wave_started)
                 except Exception:
                     pass
-        self.hud.update(self.player.health, self.player.energy, self.player.score, self.spawner.wave)
-        if not self.player.is_alive():
+        with prof.scope("hud"):
+            self.hud.update(self.player.health, self.player.energy, self.player.score, self.spawner.wave)
+            self.perf_overlay.update(self._dt)
+        if self.sim.game_over:
             self._game_over = True
 
+    def _tick(self, inputs):
+        """Run the simulation ticks due this frame, then place entities for rendering."""
+        events = StepEvents()
+        if self.paused:
+            # Shots gestured while paused must not all fire on the first tick after resume
+            self._pending_fire["left"] = self._pending_fire["right"] = False
+        else:
+            # Shots are latched until a tick consumes them, so frames between ticks never drop one
+            for hand, state in (("left", inputs.left_state), ("right", inputs.right_state)):
+                if state == HandState.FIRING:
+                    self._pending_fire[hand] = True
+        tick_dt = self.timestep.dt
+        for _ in range(self.timestep.advance(self._dt)):
+            left_state = HandState.FIRING if self._pending_fire["left"] else _not_firing(inputs.left_state)
+            right_state = HandState.FIRING if self._pending_fire["right"] else _not_firing(inputs.right_state)
+            self._pending_fire["left"] = self._pending_fire["right"] = False
+            self.sim.clock.advance(tick_dt)
+            events.extend(self.sim.step(tick_dt, inputs._replace(left_state=left_state, right_state=right_state)))
+        with FRAME_PROFILER.scope("render.sync"):
+            self.sim.sync_render(self.timestep.alpha)
+        return events
+
+    def _read_input(self):
+        """Hand states and aim points from the latest vision snapshot (aiming at center until vision is live)."""
+        if not self.vision:
+            return IDLE_INPUT
+        snap = self.vision.latest()
+        if snap is None:
+            return IDLE_INPUT
+        left_state, right_state = snap.left_state, snap.right_state
+        # A shot detected between two render frames must still fire. The seen counts
+        # also advance while paused, so resuming does not replay those shots.
+        if snap.left_fires != self._left_fires_seen:
+            self._left_fires_seen = snap.left_fires
+            left_state = HandState.FIRING
+        if snap.right_fires != self._right_fires_seen:
+            self._right_fires_seen = snap.right_fires
+            right_state = HandState.FIRING
+        return PilotInput(left_state, right_state, snap.left_aim, snap.right_aim)
+
     def run(self):
         if not URSINA_AVAILABLE:
             print("Ursina not available. Install: pip install ursina")
@@ -196,14 +258,20 @@ class GameManager:
         try:
             self.app.run()
         finally:
-            if self.camera_capture:
+            # A subsystem still initializing is picked up here so it can be shut down
+            self.startup.wait(timeout=5.0)
+            for name, result, error in self.startup.poll():
+                if error is None and name in ("vision", "jarvis"):
+                    setattr(self, name, result)
+            self.startup.shutdown()
+            if self.vision:
                 try:
-                    self.camera_capture.stop()
+                    self.vision.stop()
                 except Exception:
                     pass
             if self.jarvis:
                 try:
-                    self.jarvis.stop_listening()
+                    self.jarvis.stop()
                 except Exception:
                     pass
             if game_audio:
@@ -211,3 +279,5 @@ class GameManager:
                     game_audio.stop_bgm()
                 except Exception:
                     pass
+            if FRAME_PROFILER.enabled and FRAME_PROFILER.trace_path:
+                FRAME_PROFILER.export(FRAME_PROFILER.trace_path)
@@ -16,23 +16,36 @@ except ImportError:
     camera = None
 
 
+# Scale offset by FOV (wider FOV = more spread)
+AIM_FOV_SCALE = 1.2
+
+
 def aim_normalized_to_direction(normalized_x, normalized_y, cam=None):
     """
     Map normalized hand position (0..1, 0..1) to a 3D direction in front of camera.
-    Returns (origin_vec3, direction_vec3) for spawning repulsor beams.
+    Returns (origin_vec3, direction_vec3) for spawning repulsor beams; with a
+    headless camera (see simulation.SimCamera) both are plain 3-tuples.
     """
-    if not URSINA_AVAILABLE or cam is None:
+    if cam is None:
+        return (None, None)
+    headless = getattr(cam, "headless", False)
+    if not URSINA_AVAILABLE and not headless:
         return (None, None)
     # View space: center (0.5, 0.5) = straight ahead; corners = edges of view
     view_x = (normalized_x - 0.5) * 2.0   # -1 to 1
     view_y = (0.5 - normalized_y) * 2.0  # -1 to 1 (y flip)
+    if headless:
+        d = [
+            f + r * view_x * AIM_FOV_SCALE + u * view_y * AIM_FOV_SCALE
+            for f, r, u in zip(cam.forward, cam.right, cam.up)
+        ]
+        norm = (d[0] * d[0] + d[1] * d[1] + d[2] * d[2]) ** 0.5
+        return (tuple(cam.world_position), (d[0] / norm, d[1] / norm, d[2] / norm))
     # Build direction: forward + horizontal/vertical offset
     forward = Vec3(cam.forward)
     right = Vec3(cam.right)
     up = Vec3(cam.up)
-    # Scale offset by FOV (wider FOV = more spread)
-    fov_scale = 1.2
-    direction = forward + right * view_x * fov_scale + up * view_y * fov_scale
+    direction = forward + right * view_x * AIM_FOV_SCALE + up * view_y * AIM_FOV_SCALE
     direction = direction.normalized()
     origin = Vec3(cam.world_position)
     return (origin, direction)
@@ -51,8 +64,8 @@ class Player:
         self.recharge_rate = config.ENERGY_RECHARGE_RATE
         self.repulsor_cost = config.REPULSOR_ENERGY_COST
         self.repulsor_cooldown = config.REPULSOR_COOLDOWN
-        self._last_fire_left = 0.0
-        self._last_fire_right = 0.0
+        self._last_fire_left = float("-inf")  # no cooldown before the first shot, whatever the clock
+        self._last_fire_right = float("-inf")
 
     def set_camera(self, cam):
         self._camera = cam
@@ -0,0 +1,346 @@
+"""
+Gameplay core without a window: player, repulsor beams, enemy waves, collisions
+and scoring. Time comes from an injectable clock and all randomness from one seed,
+so a headless run steps at a fixed dt as fast as the CPU allows and replays
+exactly (same seed and inputs, same state digest). GameManager drives the same
+core at SIM_TICK_RATE through a FixedTimestep accumulator, whatever the display
+refresh rate, and renders entities interpolated between the last two ticks.
+"""
+
+import sys
+import os
+import time
+import random
+import hashlib
+from collections import namedtuple
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+import config
+
+import numpy as np
+from .player import Player, AIM_FOV_SCALE
+from .enemy_spawner import EnemySpawner
+from .enemy_store import EnemyStore
+from .collision import check_all_beams_vs_enemies, SpatialGrid
+from src.graphics.repulsor_beam import RepulsorBeamManager
+from .frame_profiler import FRAME_PROFILER
+
+from src.vision.gesture_detector import HandState  # NumPy only; src.vision loads its other modules lazily
+
+
+SCORE_PER_KILL = {"drone": 10, "standard": 30, "heavy": 100}
+BEAM_DAMAGE = 25
+FLY_SPEED = 20.0  # matches GameScene's camera flight
+
+# Per-tick pilot input: hand states and normalized (x, y) aim points
+PilotInput = namedtuple("PilotInput", "left_state right_state left_aim right_aim")
+IDLE_INPUT = PilotInput(HandState.AIMING, HandState.AIMING, (0.5, 0.5), (0.5, 0.5))
+
+
+class ManualClock:
+    """Clock for fixed-step runs: time only moves when advance() is called."""
+
+    def __init__(self, start=0.0):
+        self.now = start
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, dt):
+        self.now += dt
+        return self.now
+
+
+class SimCamera:
+    """Headless stand-in for the Ursina camera: looks down +z and flies forward."""
+
+    headless = True
+    forward = (0.0, 0.0, 1.0)
+    right = (1.0, 0.0, 0.0)
+    up = (0.0, 1.0, 0.0)
+
+    def __init__(self, z=0.0):
+        self.z = z
+
+    @property
+    def world_position(self):
+        return (0.0, 0.0, self.z)
+
+
+class FixedTimestep:
+    """
+    Accumulator turning variable frame times into whole simulation ticks. advance()
+    says how many ticks to run this frame (at most max_catchup; a longer backlog is
+    dropped instead of snowballing) and alpha is how far the frame sits between the
+    last two ticks, for render interpolation.
+    """
+
+    def __init__(self, tick_rate=None, max_catchup=None, interpolate=None):
+        self.tick_rate = tick_rate or config.SIM_TICK_RATE
+        self.dt = 1.0 / self.tick_rate
+        self.max_catchup = config.SIM_MAX_CATCHUP_STEPS if max_catchup is None else max_catchup
+        self.interpolate = config.SIM_INTERPOLATE if interpolate is None else interpolate
+        self.accumulator = 0.0
+        self.frames = 0
+        self.ticks = 0
+        self.dropped = 0  # ticks skipped because a frame exceeded max_catchup
+
+    def advance(self, frame_dt):
+        """Add one frame's elapsed time; returns the number of ticks to run now."""
+        self.frames += 1
+        self.accumulator += max(0.0, frame_dt)
+        # The epsilon keeps e.g. 144 Hz frames from losing a tick to float rounding
+        ticks = int(self.accumulator / self.dt + 1e-9)
+        if ticks > self.max_catchup:
+            self.dropped += ticks - self.max_catchup
+            ticks = self.max_catchup
+            self.accumulator %= self.dt
+        else:
+            self.accumulator = max(0.0, self.accumulator - ticks * self.dt)
+        self.ticks += ticks
+        return ticks
+
+    @property
+    def alpha(self):
+        return min(1.0, self.accumulator / self.dt) if self.interpolate else 1.0
+
+    def stats(self):
+        return {
+            "frames": self.frames,
+            "ticks": self.ticks,
+            "ticks_per_frame": self.ticks / self.frames if self.frames else 0.0,
+            "dropped": self.dropped,
+        }
+
+
+class StepEvents:
+    """What happened during one or more steps, for the presentation layer (audio, particles, Jarvis)."""
+
+    __slots__ = ("fired", "kills", "wave_started")
+
+    def __init__(self):
+        self.fired = []  # hands that fired
+        self.kills = []  # (position, variant) of destroyed enemies
+        self.wave_started = None  # wave number if a new wave began
+
+    def extend(self, other):
+        """Fold in a later step's events (a frame can run several ticks)."""
+        self.fired.extend(other.fired)
+        self.kills.extend(other.kills)
+        if other.wave_started is not None:
+            self.wave_started = other.wave_started
+
+
+class GameSimulation:
+    """
+    One game's state, advanced by step(dt, inputs). With render=False nothing
+    touches Ursina, so it runs on machines without a display or GPU.
+    """
+
+    def __init__(self, seed=None, clock=None, camera=None, render=True):
+        self.seed = config.SIM_SEED if seed is None else seed
+        spawn_seq, store_seq = np.random.SeedSequence(self.seed).spawn(2)
+        self.clock = clock or time.perf_counter
+        self.camera = camera if camera is not None else SimCamera()
+        # A headless camera is flown here; GameScene moves the real one
+        self._fly_camera = getattr(self.camera, "headless", False)
+        self.player = Player()
+        self.player.set_camera(self.camera)
+        self.beam_manager = RepulsorBeamManager(clock=self.clock, render=render)
+        self.spawner = EnemySpawner(
+            store=EnemyStore(rng=np.random.default_rng(store_seq)),
+            clock=self.clock,
+            rng=random.Random(int(spawn_seq.generate_state(1)[0])),
+            camera=self.camera,
+            render=render,
+        )
+        self.grid = SpatialGrid()
+        self.started = False
+        self.game_over = False
+        self.ticks = 0
+        self.shots = 0
+        self.kills = 0
+
+    def start(self):
+        """Begin the first wave (GameManager holds it until vision is live)."""
+        if not self.started:
+            self.started = True
+            self.spawner.start_next_wave()
+
+    def step(self, dt, inputs=None):
+        """Advance gameplay by dt seconds; returns StepEvents."""
+        events = StepEvents()
+        if self.game_over:
+            return events
+        inputs = inputs or IDLE_INPUT
+        player = self.player
+        now = self.clock()
+        prof = FRAME_PROFILER
+        with prof.scope("sim.fire"):
+            self._fire(inputs, now, dt, events)
+        with prof.scope("sim.collision"):
+            self._collide(events)
+        with prof.scope("sim.beams"):
+            self.beam_manager.update(dt)
+        with prof.scope("sim.enemies"):
+            self.spawner.update(dt)
+        if self._fly_camera:
+            self.camera.z += FLY_SPEED * dt
+        if self.spawner.wave_cleared and self.started and len(self.spawner.enemies) == 0:
+            self.spawner.start_next_wave()
+            events.wave_started = self.spawner.wave
+        if not player.is_alive():
+            self.game_over = True
+        self.ticks += 1
+        return events
+
+    def _fire(self, inputs, now, dt, events):
+        """Recharge and repulsor shots for this tick's input."""
+        player = self.player
+        # Recharge when fist
+        if inputs.left_state == HandState.RECHARGING or inputs.right_state == HandState.RECHARGING:
+            player.recharge(dt)
+        # Fire repulsors
+        if inputs.left_state == HandState.FIRING and player.can_fire_left(now) and player.energy >= player.repulsor_cost:
+            origin, direction = player.get_aim_ray_left(inputs.left_aim[0], inputs.left_aim[1])
+            if origin and direction:
+                self.beam_manager.fire(origin, direction, hand="left")
+                player.consume_fire_left(now)
+                events.fired.append("left")
+        if inputs.right_state == HandState.FIRING and player.can_fire_right(now) and player.energy >= player.repulsor_cost:
+            origin, direction = player.get_aim_ray_right(inputs.right_aim[0], inputs.right_aim[1])
+            if origin and direction:
+                self.beam_manager.fire(origin, direction, hand="right")
+                player.consume_fire_right(now)
+                events.fired.append("right")
+        self.shots += len(events.fired)
+
+    def _collide(self, events):
+        """Beams vs enemies: damage, kills and score."""
+        hits = check_all_beams_vs_enemies(self.beam_manager.beams, self.spawner.enemies, grid=self.grid)
+        for beam, enemy in hits:
+            beam.destroy()
+            position = enemy.get_position()
+            if enemy.take_damage(BEAM_DAMAGE):
+                variant = getattr(enemy, "variant", "drone")
+                self.player.score += SCORE_PER_KILL.get(variant, 10)
+                events.kills.append((position, variant))
+        self.kills += len(events.kills)
+
+    def sync_render(self, alpha=1.0):
+        """Move beam and enemy entities to alpha between the previous and current tick."""
+        self.beam_manager.sync_entities(alpha)
+        self.spawner.sync_entities(alpha)
+
+    def digest(self):
+        """Short hash of the gameplay state; equal digests mean two runs stayed in lockstep."""
+        h = hashlib.sha1()
+        p = self.player
+        h.update(repr((self.ticks, p.score, p.health, round(p.energy, 9), self.spawner.wave, self.kills)).encode())
+        store = self.spawner.store
+        slots = store.alive_slots()
+        h.update(np.round(store.position[slots], 6).tobytes())
+        for beam in self.beam_manager.beams:
+            h.update(repr(tuple(round(c, 6) for c in beam.get_position())).encode())
+        return h.hexdigest()[:16]
+
+
+class AutoPilot:
+    """
+    Scripted pilot for headless runs: each hand aims at one of the two nearest
+    enemies ahead (with a little seeded jitter), fires whenever it can and makes a
+    fist to recharge when energy is too low for a shot.
+    """
+
+    def __init__(self, rng=None, jitter=0.01):
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.jitter = jitter
+
+    def _aim(self, cam, target):
+        dx = target[0] - cam[0]
+        dy = target[1] - cam[1]
+        dz = max(target[2] - cam[2], 1e-3)
+        jx, jy = self.rng.normal(0.0, self.jitter, 2)
+        # Inverse of aim_normalized_to_direction for a camera looking down +z
+        return (
+            0.5 + dx / (dz * AIM_FOV_SCALE) / 2.0 + jx,
+            0.5 - dy / (dz * AIM_FOV_SCALE) / 2.0 + jy,
+        )
+
+    def __call__(self, sim):
+        player = sim.player
+        if player.energy < player.repulsor_cost:
+            return PilotInput(HandState.RECHARGING, HandState.RECHARGING, (0.5, 0.5), (0.5, 0.5))
+        store = sim.spawner.store
+        slots = store.alive_slots()
+        cam = sim.camera.world_position
+        targets = store.position[slots]
+        targets = targets[targets[:, 2] > cam[2] + 1.0]
+        if len(targets) == 0:
+            return IDLE_INPUT
+        nearest = targets[np.argsort(targets[:, 2])[:2]].tolist()
+        left = self._aim(cam, nearest[0])
+        right = self._aim(cam, nearest[-1])
+        return PilotInput(HandState.FIRING, HandState.FIRING, left, right)
+
+
+def run_headless(ticks, seed=0, dt=None, pilot=None):
+    """
+    Step a render-free GameSimulation ticks times at a fixed dt on a ManualClock,
+    driven by pilot(sim) (AutoPilot by default). Returns a stats dict including
+    per-tick wall-clock cost and the final state digest.
+    """
+    dt = dt or 1.0 / config.SIM_TICK_RATE
+    clock = ManualClock()
+    sim = GameSimulation(seed=seed, clock=clock, render=False)
+    if pilot is None:
+        pilot = AutoPilot(np.random.default_rng(np.random.SeedSequence(sim.seed).spawn(3)[2]))
+    sim.start()
+    costs = np.empty(ticks)
+    t_start = time.perf_counter()
+    for i in range(ticks):
+        FRAME_PROFILER.begin_frame()  # one "frame" per tick when profiling
+        t0 = time.perf_counter()
+        clock.advance(dt)
+        sim.step(dt, pilot(sim))
+        costs[i] = time.perf_counter() - t0
+        if sim.game_over:
+            costs = costs[:i + 1]
+            break
+    wall = time.perf_counter() - t_start
+    us = 1e6 * costs
+    return {
+        "seed": sim.seed,
+        "ticks": sim.ticks,
+        "dt": dt,
+        "sim_seconds": sim.ticks * dt,
+        "wall_seconds": wall,
+        "ticks_per_second": sim.ticks / wall if wall > 0 else 0.0,
+        "tick_us": {
+            "mean": float(us.mean()) if len(us) else 0.0,
+            "p50": float(np.percentile(us, 50)) if len(us) else 0.0,
+            "p95": float(np.percentile(us, 95)) if len(us) else 0.0,
+            "p99": float(np.percentile(us, 99)) if len(us) else 0.0,
+            "max": float(us.max()) if len(us) else 0.0,
+        },
+        "wave": sim.spawner.wave,
+        "shots": sim.shots,
+        "kills": sim.kills,
+        "score": sim.player.score,
+        "game_over": sim.game_over,
+        "digest": sim.digest(),
+    }
+
+
+def format_report(stats):
+    t = stats["tick_us"]
+    lines = [
+        f"headless run: seed {stats['seed']}, {stats['ticks']} ticks at dt {stats['dt']:.5f}"
+        f" ({stats['sim_seconds']:.1f} s simulated in {stats['wall_seconds']:.2f} s wall,"
+        f" {stats['ticks_per_second']:.0f} ticks/s)",
+        f"tick cost (us): mean {t['mean']:.1f}  p50 {t['p50']:.1f}  p95 {t['p95']:.1f}"
+        f"  p99 {t['p99']:.1f}  max {t['max']:.1f}",
+        f"wave {stats['wave']}  shots {stats['shots']}  kills {stats['kills']}  score {stats['score']}"
+        + ("  GAME OVER" if stats["game_over"] else ""),
+        f"state digest {stats['digest']}",
+    ]
+    return "\n".join(lines)
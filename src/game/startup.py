@@ -0,0 +1,159 @@
+"""
+Staged startup: heavy subsystems (vision models, camera, Jarvis, audio) initialize
+on background threads behind readiness futures while the window and scene come up
+immediately. StartupProfiler records per-import and per-subsystem timings relative
+to process start for the startup report (main.py --profile-startup).
+"""
+
+import importlib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+import config
+
+# Taken when this module is first imported; main.py imports it before anything heavy
+PROCESS_START = time.perf_counter()
+
+
+class StartupProfiler:
+    """Collects (kind, name, start, end, error) spans; all times are seconds since PROCESS_START."""
+
+    def __init__(self, origin=None):
+        self.origin = PROCESS_START if origin is None else origin
+        self._spans = []
+        self._marks = {}
+        self._lock = threading.Lock()
+
+    def now(self):
+        return time.perf_counter() - self.origin
+
+    @contextmanager
+    def span(self, name, kind="subsystem"):
+        """Time a block; an exception is recorded on the span and re-raised."""
+        start = self.now()
+        error = None
+        try:
+            yield
+        except BaseException as exc:
+            error = exc
+            raise
+        finally:
+            self.record(name, kind, start, self.now(), error)
+
+    def import_module(self, name):
+        """Import and time a module. Returns the module, or None if it cannot be imported."""
+        start = self.now()
+        try:
+            module = importlib.import_module(name)
+        except Exception as exc:
+            self.record(name, "import", start, self.now(), exc)
+            return None
+        self.record(name, "import", start, self.now())
+        return module
+
+    def record(self, name, kind, start, end, error=None):
+        with self._lock:
+            self._spans.append((kind, name, start, end, threading.current_thread().name, error))
+
+    def mark(self, name):
+        """Record a one-off milestone (e.g. "window shown") the first time it happens."""
+        with self._lock:
+            self._marks.setdefault(name, self.now())
+
+    def spans(self, kind=None):
+        with self._lock:
+            return [s for s in self._spans if kind is None or s[0] == kind]
+
+    def marks(self):
+        with self._lock:
+            return dict(self._marks)
+
+    def report(self):
+        """Human-readable startup report: imports, subsystems (time-to-ready) and milestones."""
+        lines = ["Startup profile (seconds since process start)"]
+        for kind, title in (("import", "imports"), ("subsystem", "subsystems")):
+            spans = sorted(self.spans(kind), key=lambda s: s[2])
+            if not spans:
+                continue
+            lines.append(f"  {title}:")
+            lines.append(f"    {'name':<28}{'start':>8}{'ready':>8}{'took':>8}  thread")
+            for _, name, start, end, thread, error in spans:
+                status = f"  FAILED: {error!r}" if error is not None else ""
+                lines.append(f"    {name:<28}{start:>8.3f}{end:>8.3f}{end - start:>8.3f}  {thread}{status}")
+        marks = sorted(self.marks().items(), key=lambda kv: kv[1])
+        if marks:
+            lines.append("  milestones:")
+            for name, t in marks:
+                lines.append(f"    {name:<28}{t:>8.3f}")
+        return "\n".join(lines)
+
+
+PROFILER = StartupProfiler()
+
+
+class StagedStartup:
+    """
+    Runs named init functions on a small thread pool. The game loop calls poll()
+    each frame to pick up finished subsystems without ever blocking on them.
+    """
+
+    def __init__(self, profiler=None, max_workers=None):
+        self.profiler = profiler or PROFILER
+        self._pool = ThreadPoolExecutor(
+            max_workers=max_workers or config.STARTUP_WORKERS,
+            thread_name_prefix="startup",
+        )
+        self._futures = {}
+        self._delivered = set()
+
+    def submit(self, name, fn, *args):
+        """Start fn(*args) in the background. Returns its future."""
+        def run():
+            with self.profiler.span(name):
+                return fn(*args)
+        future = self._pool.submit(run)
+        self._futures[name] = future
+        return future
+
+    def future(self, name):
+        return self._futures.get(name)
+
+    def poll(self):
+        """
+        Subsystems that finished since the last call: list of (name, result, error).
+        Each is returned exactly once.
+        """
+        done = []
+        for name, future in self._futures.items():
+            if name in self._delivered or not future.done():
+                continue
+            self._delivered.add(name)
+            error = future.exception()
+            done.append((name, None if error else future.result(), error))
+        return done
+
+    def is_ready(self, name):
+        """True once the named subsystem has finished (successfully or not)."""
+        future = self._futures.get(name)
+        return future is None or future.done()
+
+    def all_ready(self):
+        return all(f.done() for f in self._futures.values())
+
+    def wait(self, timeout=None):
+        """Block until every subsystem finished (headless tools and tests)."""
+        end = None if timeout is None else time.perf_counter() + timeout
+        for future in self._futures.values():
+            remaining = None if end is None else max(0.0, end - time.perf_counter())
+            try:
+                future.exception(timeout=remaining)
+            except Exception:
+                return False
+        return True
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
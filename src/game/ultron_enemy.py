@@ -1,13 +1,14 @@
 """
 Ultron enemy: 3D entity with AI movement and health.
+State lives in an EnemyStore slot (struct of arrays, stepped for all enemies at
+once by EnemySpawner); UltronEnemy is the per-enemy handle and owns the entity.
 """
 
 import sys
 import os
-import time
-import random
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 import config
+from .enemy_store import EnemyStore, VARIANTS, VARIANT_SIZE
 
 try:
     from ursina import Entity, Vec3, color, destroy
@@ -15,66 +16,114 @@ try:
 except ImportError:
     URSINA_AVAILABLE = False
 
+# Enemies created without a store (older call sites, tools) share this one
+_default_store = None
+
+
+def default_store():
+    global _default_store
+    if _default_store is None:
+        _default_store = EnemyStore()
+    return _default_store
+
+
+def enemy_entity_kwargs(variant):
+    """Entity settings shared by every enemy of a variant (one pool per variant)."""
+    scale = VARIANT_SIZE[VARIANTS.index(variant) if variant in VARIANTS else 0]
+    return dict(
+        model="cube",
+        scale=(scale * 0.8, scale * 1.2, scale * 0.6),
+        color=color.rgb(80, 80, 90),  # metallic gray
+        double_sided=True,
+    )
+
 
 class UltronEnemy:
     """Single Ultron drone: moves toward player, has health."""
 
-    def __init__(self, position, health=30, speed=15.0, variant="drone"):
-        self.position = Vec3(position) if position else Vec3(0, 0, 50)
-        self.health = health
-        self.max_health = health
+    def __init__(self, position, health=30, speed=15.0, variant="drone", store=None, pool=None, render=True):
+        self.store = store or default_store()
         self.speed = speed
-        self.variant = variant  # drone, standard, heavy
+        self.pool = pool  # EntityPool for this variant (see enemy_entity_kwargs)
         self.entity = None
-        self._alive = True
-        self._velocity = Vec3(0, 0, -1).normalized() * speed  # toward camera
-        if not URSINA_AVAILABLE:
+        pos = tuple(position)[:3] if position is not None else (0, 0, 50)
+        self.slot, self._generation = self.store.spawn(pos, health, speed, variant, handle=self)
+        self.size = VARIANT_SIZE[self.store.variant[self.slot]]
+        self.radius = self.size * 1.2  # largest entity scale axis; used by collision
+        if not URSINA_AVAILABLE or not render:
             return
         self._create_entity()
 
     def _create_entity(self):
         if not URSINA_AVAILABLE:
             return
-        scale = 2.0 if self.variant == "heavy" else (1.5 if self.variant == "standard" else 1.0)
-        col = color.rgb(80, 80, 90)  # metallic gray
-        self.entity = Entity(
-            model="cube",
-            scale=(scale * 0.8, scale * 1.2, scale * 0.6),
-            position=self.position,
-            color=col,
-            double_sided=True,
-        )
+        if self.pool is not None:
+            self.entity = self.pool.acquire(position=self.get_position())
+        else:
+            self.entity = Entity(position=self.get_position(), **enemy_entity_kwargs(self.variant))
         self.entity.ultron_enemy = self
 
+    @property
+    def variant(self):
+        return VARIANTS[self.store.variant[self.slot]]
+
+    @property
+    def health(self):
+        return float(self.store.health[self.slot])
+
+    @health.setter
+    def health(self, value):
+        self.store.health[self.slot] = value
+
+    @property
+    def max_health(self):
+        return float(self.store.max_health[self.slot])
+
+    @property
+    def position(self):
+        return self.get_position()
+
     def update(self, dt, camera_z=0):
-        if not self._alive or self.entity is None:
+        """
+        Compatibility path: EnemySpawner steps all enemies through the store in one
+        call instead. Advances only this enemy; returns False once it is gone.
+        """
+        if not self.is_alive():
             return False
-        # Move toward player (camera at z)
-        self.position.z -= self.speed * dt
-        self.position.x += (random.random() - 0.5) * 2 * dt
-        self.position.y += (random.random() - 0.5) * 2 * dt
+        p = self.store.position[self.slot]
+        self.store.prev_position[self.slot] = p
+        p += self.store.velocity[self.slot] * dt
+        p[:2] += (self.store.rng.random(2) - 0.5) * 2 * dt
         if self.entity:
-            self.entity.position = self.position
-        if self.position.z < camera_z - 20:
+            self.entity.position = tuple(p)
+        if p[2] < camera_z - 20:
             self.destroy()
             return False
         return True
 
     def take_damage(self, amount):
-        self.health -= amount
-        if self.health <= 0:
+        if not self.is_alive():
+            return False
+        if self.store.damage(self.slot, amount):
             self.destroy()
             return True
         return False
 
     def destroy(self):
-        self._alive = False
+        if self.is_alive():
+            self.store.kill(self.slot)
+        self._generation = -1
         if URSINA_AVAILABLE and self.entity:
-            destroy(self.entity)
+            if self.pool is not None:
+                self.pool.release(self.entity)
+            else:
+                destroy(self.entity)
             self.entity = None
 
     def get_position(self):
-        return self.position
+        p = self.store.position[self.slot]
+        return Vec3(p[0], p[1], p[2]) if URSINA_AVAILABLE else tuple(p.tolist())
 
     def is_alive(self):
-        return self._alive
+        store = self.store
+        return self._generation == store.generation[self.slot] and bool(store.alive[self.slot])
@@ -2,10 +2,14 @@ from .scene import GameScene
 from .repulsor_beam import RepulsorBeam
 from .particles import ParticleSystem
 from .hud import GameHUD
+from .entity_pool import EntityPool, get_pool, pool_stats
 
 __all__ = [
     "GameScene",
     "RepulsorBeam",
     "ParticleSystem",
     "GameHUD",
+    "EntityPool",
+    "get_pool",
+    "pool_stats",
 ]
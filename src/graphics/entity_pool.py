@@ -0,0 +1,107 @@
+"""
+Entity pooling: hide and recycle Ursina entities instead of creating and destroying
+scene-graph nodes per spawn. One pool per model/variant, pre-warmed at startup and
+capped at a max size; hit/miss counters show how often a spawn still built a node.
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+import config
+
+try:
+    from ursina import Entity, destroy
+    URSINA_AVAILABLE = True
+except ImportError:
+    URSINA_AVAILABLE = False
+
+
+class EntityPool:
+    """
+    Free list of disabled entities of one kind. acquire() re-enables one (or builds
+    a new one on a miss) and applies per-spawn attributes; release() disables it.
+    """
+
+    def __init__(self, name, factory=None, max_size=None, prewarm=0, destroy_fn=None, **entity_kwargs):
+        self.name = name
+        self._factory = factory or (lambda: Entity(**entity_kwargs))
+        self._destroy = destroy_fn or (destroy if URSINA_AVAILABLE else (lambda e: None))
+        self.max_size = config.ENTITY_POOL_MAX_SIZE if max_size is None else max_size
+        self._free = []
+        self.hits = 0
+        self.misses = 0
+        self.released = 0
+        self.discarded = 0  # released while the pool was full, so destroyed
+        self.in_use = 0
+        if prewarm:
+            self.prewarm(prewarm)
+
+    def prewarm(self, count):
+        """Build up to count hidden entities ahead of time."""
+        for _ in range(min(count, self.max_size) - len(self._free)):
+            entity = self._factory()
+            entity.enabled = False
+            self._free.append(entity)
+
+    def acquire(self, **attrs):
+        """Enabled entity with attrs applied in order (e.g. position, color, then alpha)."""
+        if self._free:
+            entity = self._free.pop()
+            self.hits += 1
+        else:
+            entity = self._factory()
+            self.misses += 1
+        for key, value in attrs.items():
+            setattr(entity, key, value)
+        entity.enabled = True
+        self.in_use += 1
+        return entity
+
+    def release(self, entity):
+        """Hide entity for reuse (destroyed instead if the pool is full)."""
+        if entity is None:
+            return
+        self.in_use -= 1
+        self.released += 1
+        if len(self._free) >= self.max_size:
+            self.discarded += 1
+            self._destroy(entity)
+            return
+        entity.enabled = False
+        self._free.append(entity)
+
+    def clear(self):
+        for entity in self._free:
+            self._destroy(entity)
+        self._free.clear()
+
+    def stats(self):
+        acquired = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / acquired if acquired else 0.0,
+            "in_use": self.in_use,
+            "free": len(self._free),
+            "released": self.released,
+            "discarded": self.discarded,
+            "max_size": self.max_size,
+        }
+
+
+_pools = {}
+
+
+def get_pool(name, **kwargs):
+    """Shared pool by name, created on first use (kwargs as EntityPool; prewarm defaults from config)."""
+    pool = _pools.get(name)
+    if pool is None:
+        kwargs.setdefault("prewarm", config.ENTITY_POOL_PREWARM.get(name, 0))
+        pool = EntityPool(name, **kwargs)
+        _pools[name] = pool
+    return pool
+
+
+def pool_stats():
+    """Hit/miss counters for every shared pool, by name."""
+    return {name: pool.stats() for name, pool in _pools.items()}
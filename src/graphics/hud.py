@@ -1,5 +1,8 @@
 """
 Iron Man style holographic HUD: health, energy, score, wave.
+Fields are dirty-checked so a Text mesh is only rebuilt when its value changes.
+Fast-changing numbers (health, energy, score) can instead be drawn from a digit
+atlas: one textured quad per digit, where a new value is just a UV offset change.
 """
 
 import sys
@@ -8,22 +11,170 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspa
 import config
 
 try:
-    from ursina import WindowPanel, Text, Entity, color, camera
+    from ursina import WindowPanel, Text, Entity, Texture, color, camera
     URSINA_AVAILABLE = True
 except ImportError:
     URSINA_AVAILABLE = False
 
+try:
+    from PIL import Image, ImageDraw, ImageFont
+    PIL_AVAILABLE = True
+except ImportError:
+    PIL_AVAILABLE = False
+
+DIGITS = "0123456789"
+
+
+if URSINA_AVAILABLE:
+    class _KeyListener(Entity):
+        """Invisible entity forwarding key presses to a callback."""
+
+        def __init__(self, callback):
+            super().__init__()
+            self.callback = callback
+
+        def input(self, key):
+            self.callback(key)
+
+
+def digits_of(value, max_digits):
+    """Digits of a non-negative int, clamped to max_digits nines."""
+    value = min(max(0, int(value)), 10 ** max_digits - 1)
+    return [int(d) for d in str(value)]
+
+
+def _font(size):
+    """Ursina's default UI font at size px, or Pillow's built-in font."""
+    try:
+        import ursina
+        path = os.path.join(os.path.dirname(ursina.__file__), "fonts", Text.default_font)
+        return ImageFont.truetype(path, size)
+    except Exception:
+        return ImageFont.load_default()
+
+
+class DigitAtlas:
+    """Digits 0-9 rendered once into a single-row texture, one equal cell each."""
+
+    def __init__(self, cell_px=None):
+        self.cell_px = cell_px or config.HUD_ATLAS_CELL_PX
+        self.cell_w = int(self.cell_px * 0.6)
+        self.cell_h = self.cell_px
+        image = Image.new("RGBA", (self.cell_w * len(DIGITS), self.cell_h), (0, 0, 0, 0))
+        draw = ImageDraw.Draw(image)
+        font = _font(int(self.cell_px * 0.9))
+        for i, ch in enumerate(DIGITS):
+            # White glyphs; each quad tints them with its own color
+            draw.text(
+                ((i + 0.5) * self.cell_w, self.cell_h / 2), ch,
+                font=font, fill=(255, 255, 255, 255), anchor="mm",
+            )
+        self.image = image
+        self.texture = Texture(image)
+        self.texture_scale = (1.0 / len(DIGITS), 1.0)
+
+    @property
+    def aspect(self):
+        return self.cell_w / self.cell_h
+
+    def offset(self, digit):
+        return (digit / len(DIGITS), 0.0)
+
+
+_atlas = None
+
+
+def digit_atlas():
+    """Shared atlas, built on first use (None if Pillow is missing)."""
+    global _atlas
+    if _atlas is None and PIL_AVAILABLE and URSINA_AVAILABLE:
+        _atlas = DigitAtlas()
+    return _atlas
+
+
+class NumberField:
+    """
+    Fixed number of digit quads built once. set() only touches the quads whose
+    digit changed (a texture_offset write) and hides unused leading/trailing slots.
+    """
+
+    def __init__(self, atlas, position, height, tint, max_digits, align="left"):
+        self.atlas = atlas
+        self.max_digits = max_digits
+        self.align = align
+        self.value = None
+        self.uv_writes = 0
+        width = height * atlas.aspect
+        x0, y = position
+        if align == "right":
+            x0 -= width * max_digits
+        self._digits = [None] * max_digits
+        self.quads = [
+            Entity(
+                parent=camera.ui,
+                model="quad",
+                texture=atlas.texture,
+                texture_scale=atlas.texture_scale,
+                scale=(width, height),
+                origin=(-0.5, 0.5),
+                position=(x0 + i * width, y),
+                color=tint,
+                enabled=False,
+            )
+            for i in range(max_digits)
+        ]
+
+    def set(self, value):
+        value = int(value)
+        if value == self.value:
+            return False
+        self.value = value
+        digits = digits_of(value, self.max_digits)
+        slots = [None] * self.max_digits
+        start = 0 if self.align == "left" else self.max_digits - len(digits)
+        slots[start:start + len(digits)] = digits
+        for quad, old, new in zip(self.quads, self._digits, slots):
+            if old == new:
+                continue
+            if new is None:
+                quad.enabled = False
+            else:
+                quad.texture_offset = self.atlas.offset(new)
+                quad.enabled = True
+                self.uv_writes += 1
+        self._digits = slots
+        return True
+
+    def left_edge(self):
+        """x of the first visible digit (where a right-aligned field's label ends)."""
+        for quad, digit in zip(self.quads, self._digits):
+            if digit is not None:
+                return quad.x
+        return self.quads[-1].x + self.quads[-1].scale_x
+
 
 class GameHUD:
     """Heads-up display: health bar, energy, score, wave. Styled for Iron Man."""
 
-    def __init__(self, width=1920, height=1080):
+    # name: (label, position, color, origin, digits)
+    FIELDS = {
+        "health": ("HP: ", (-0.85, 0.45), (0, 255, 100), (-0.5, 0.5), 3),
+        "energy": ("ENERGY: ", (-0.85, 0.40), (100, 200, 255), (-0.5, 0.5), 3),
+        "score": ("SCORE: ", (0.85, 0.45), (255, 220, 100), (0.5, 0.5), 7),
+        "wave": ("WAVE ", (0.85, 0.40), (200, 200, 255), (0.5, 0.5), 0),  # changes rarely: Text only
+    }
+
+    def __init__(self, width=1920, height=1080, digit_atlas_enabled=None):
         self.width = width
         self.height = height
+        self.use_atlas = config.HUD_DIGIT_ATLAS if digit_atlas_enabled is None else digit_atlas_enabled
         self.health_text = None
         self.energy_text = None
         self.score_text = None
         self.wave_text = None
+        self.numbers = {}  # name -> NumberField when drawn from the digit atlas
+        self._last = {}  # name -> last value written
+        self.text_rebuilds = 0
         if not URSINA_AVAILABLE:
             return
         self._create_hud()
@@ -31,45 +182,101 @@ class GameHUD:
     def _create_hud(self):
         if not URSINA_AVAILABLE:
             return
-        # Top-left: health, energy
-        self.health_text = Text(
-            text="HP: 100",
-            position=(-0.85, 0.45),
-            scale=2,
-            color=color.rgb(0, 255, 100),
-            origin=(-0.5, 0.5),
-        )
-        self.energy_text = Text(
-            text="ENERGY: 100",
-            position=(-0.85, 0.40),
-            scale=2,
-            color=color.rgb(100, 200, 255),
-            origin=(-0.5, 0.5),
-        )
-        # Top-right: score, wave
-        self.score_text = Text(
-            text="SCORE: 0",
-            position=(0.85, 0.45),
-            scale=2,
-            color=color.rgb(255, 220, 100),
-            origin=(0.5, 0.5),
-        )
-        self.wave_text = Text(
-            text="WAVE 1",
-            position=(0.85, 0.40),
-            scale=2,
-            color=color.rgb(200, 200, 255),
-            origin=(0.5, 0.5),
-        )
+        atlas = digit_atlas() if self.use_atlas else None
+        for name, (label, position, rgb, origin, max_digits) in self.FIELDS.items():
+            tint = color.rgb(*rgb)
+            if atlas is None or not max_digits:
+                # Top-left: health, energy. Top-right: score, wave
+                text = Text(text=f"{label}{0}", position=position, scale=2, color=tint, origin=origin)
+                setattr(self, f"{name}_text", text)
+                continue
+            # Static label plus digit quads; score's digits are right-aligned to the edge
+            height = Text.size * 2
+            if origin[0] < 0:
+                text = Text(text=label, position=position, scale=2, color=tint, origin=origin)
+                number_pos = (position[0] + text.width, position[1])
+                self.numbers[name] = NumberField(atlas, number_pos, height, tint, max_digits, "left")
+            else:
+                self.numbers[name] = NumberField(atlas, position, height, tint, max_digits, "right")
+                text = Text(text=label, position=position, scale=2, color=tint, origin=origin)
+            setattr(self, f"{name}_text", text)
+
+    def _set(self, name, value):
+        if self._last.get(name) == value:
+            return
+        self._last[name] = value
+        number = self.numbers.get(name)
+        if number is not None:
+            number.set(value)
+            if number.align == "right":
+                # Moving the label is a transform change, not a text rebuild
+                getattr(self, f"{name}_text").x = number.left_edge()
+            return
+        text = getattr(self, f"{name}_text")
+        if text:
+            text.text = f"{self.FIELDS[name][0]}{value}"
+            self.text_rebuilds += 1
 
     def update(self, health, energy, score, wave):
         if not URSINA_AVAILABLE:
             return
-        if self.health_text:
-            self.health_text.text = f"HP: {max(0, int(health))}"
-        if self.energy_text:
-            self.energy_text.text = f"ENERGY: {max(0, int(energy))}"
-        if self.score_text:
-            self.score_text.text = f"SCORE: {score}"
-        if self.wave_text:
-            self.wave_text.text = f"WAVE {wave}"
+        self._set("health", max(0, int(health)))
+        self._set("energy", max(0, int(energy)))
+        self._set("score", score)
+        self._set("wave", wave)
+
+    def stats(self):
+        """Text mesh rebuilds and digit UV writes since creation."""
+        return {
+            "text_rebuilds": self.text_rebuilds,
+            "uv_writes": {name: n.uv_writes for name, n in self.numbers.items()},
+        }
+
+
+class PerfOverlay:
+    """
+    Frame profiler readout in the bottom-left corner, toggled with a key. The text
+    is refreshed every PROFILER_OVERLAY_INTERVAL seconds, not every frame.
+    """
+
+    def __init__(self, profiler, key=None, visible=None, interval=None):
+        self.profiler = profiler
+        self.key = key or config.PROFILER_OVERLAY_KEY
+        self.visible = config.PROFILER_OVERLAY if visible is None else visible
+        self.interval = config.PROFILER_OVERLAY_INTERVAL if interval is None else interval
+        self._elapsed = 0.0
+        self.text = None
+        self._listener = None
+        if self.visible:
+            profiler.enable()
+        if not URSINA_AVAILABLE:
+            return
+        self.text = Text(
+            text="",
+            position=(-0.85, -0.30),
+            scale=0.9,
+            color=color.rgb(180, 255, 200),
+            origin=(-0.5, 0.5),
+            enabled=self.visible,
+        )
+        self._listener = _KeyListener(self._on_key)
+
+    def _on_key(self, key):
+        if key == self.key:
+            self.toggle()
+
+    def toggle(self):
+        self.visible = not self.visible
+        if self.visible:
+            self.profiler.enable()  # the overlay needs samples even if profiling started off
+            self._elapsed = self.interval
+        if self.text:
+            self.text.enabled = self.visible
+
+    def update(self, dt):
+        if not self.visible or self.text is None:
+            return
+        self._elapsed += dt
+        if self._elapsed >= self.interval:
+            self._elapsed = 0.0
+            self.text.text = self.profiler.overlay_text() or "profiling..."
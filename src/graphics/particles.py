@@ -1,5 +1,9 @@
 """
 Particle effects: explosions, sparks.
+Default backend ("mesh"): particle state lives in NumPy arrays (ParticleBuffer) and
+all live particles are drawn as one dynamic point mesh whose vertex buffer
+(position + RGBA) is uploaded once per frame. The "entity" backend keeps one
+pooled sphere Entity per particle.
 """
 
 import sys
@@ -8,27 +12,150 @@ import time
 import random
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 import config
+from .entity_pool import get_pool
+
+import numpy as np
 
 try:
-    from ursina import Entity, Vec3, color, destroy
+    from ursina import Entity, Vec3, color, destroy, scene
     URSINA_AVAILABLE = True
 except ImportError:
     URSINA_AVAILABLE = False
 
+try:
+    from panda3d.core import (
+        Geom, GeomNode, GeomPoints, GeomVertexArrayFormat, GeomVertexData,
+        GeomVertexFormat, OmniBoundingVolume, TransparencyAttrib,
+    )
+    PANDA_AVAILABLE = True
+except ImportError:
+    PANDA_AVAILABLE = False
+
+EXPLOSION_RGB = (1.0, 180 / 255, 80 / 255)  # color.rgb(255, 180, 80)
+VERTEX_FLOATS = 7  # x, y, z, r, g, b, a
+
+
+class ParticleBuffer:
+    """
+    Fixed-capacity struct of arrays for particles; live particles are packed at the
+    front. Emitting into a full buffer drops the new particles (counted in dropped).
+    """
+
+    def __init__(self, capacity=None, rng=None, alpha=0.9):
+        self.capacity = capacity or config.PARTICLE_MAX
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.alpha = alpha
+        self.count = 0
+        self.dropped = 0
+        self.position = np.zeros((self.capacity, 3), dtype=np.float32)
+        self.velocity = np.zeros((self.capacity, 3), dtype=np.float32)
+        self.age = np.zeros(self.capacity, dtype=np.float32)
+        self.lifetime = np.ones(self.capacity, dtype=np.float32)
+        self.rgb = np.zeros((self.capacity, 3), dtype=np.float32)
+        self._vertices = np.zeros((self.capacity, VERTEX_FLOATS), dtype=np.float32)
+
+    def emit(self, position, count, speed, lifetime, rgb=EXPLOSION_RGB):
+        """Burst of count particles from position in uniformly random directions."""
+        n = min(count, self.capacity - self.count)
+        self.dropped += count - n
+        if n <= 0:
+            return 0
+        dirs = self.rng.uniform(-1.0, 1.0, (n, 3)).astype(np.float32)
+        norms = np.linalg.norm(dirs, axis=1, keepdims=True)
+        dirs /= np.maximum(norms, 1e-6)
+        sl = slice(self.count, self.count + n)
+        self.position[sl] = tuple(position)[:3]
+        self.velocity[sl] = dirs * speed
+        self.age[sl] = 0.0
+        self.lifetime[sl] = lifetime
+        self.rgb[sl] = rgb
+        self.count += n
+        return n
+
+    def update(self, dt):
+        """Move, age and compact out expired particles. Returns the live count."""
+        n = self.count
+        if n == 0:
+            return 0
+        self.position[:n] += self.velocity[:n] * dt
+        self.age[:n] += dt
+        alive = self.age[:n] < self.lifetime[:n]
+        k = int(alive.sum())
+        if k < n:
+            for arr in (self.position, self.velocity, self.age, self.lifetime, self.rgb):
+                arr[:k] = arr[:n][alive]
+            self.count = k
+        return self.count
+
+    def vertices(self):
+        """(count, 7) float32 view: position, color and faded alpha, ready to upload."""
+        n = self.count
+        v = self._vertices[:n]
+        v[:, :3] = self.position[:n]
+        v[:, 3:6] = self.rgb[:n]
+        v[:, 6] = self.alpha * (1.0 - self.age[:n] / self.lifetime[:n])
+        return v
+
+
+def vertex_color_format():
+    """Interleaved float32 vertex (xyz) + color (rgba) rows, matching VERTEX_FLOATS."""
+    array = GeomVertexArrayFormat()
+    array.add_column("vertex", 3, Geom.NT_float32, Geom.C_point)
+    array.add_column("color", 4, Geom.NT_float32, Geom.C_color)
+    return GeomVertexFormat.register_format(GeomVertexFormat(array))
+
+
+class ParticleMesh:
+    """One GeomPoints node drawing every particle; perspective point size in world units."""
+
+    def __init__(self, parent, point_size=None):
+        self.vdata = GeomVertexData("particles", vertex_color_format(), Geom.UH_dynamic)
+        self.points = GeomPoints(Geom.UH_dynamic)
+        geom = Geom(self.vdata)
+        geom.add_primitive(self.points)
+        node = GeomNode("particles")
+        node.add_geom(geom)
+        # Particles fly everywhere; skip per-frame bounds recomputation and culling
+        node.set_bounds(OmniBoundingVolume())
+        node.set_final(True)
+        self.node_path = parent.attach_new_node(node)
+        self.node_path.set_render_mode_thickness(point_size or config.PARTICLE_POINT_SIZE)
+        self.node_path.set_render_mode_perspective(True)
+        self.node_path.set_transparency(TransparencyAttrib.M_alpha)
+        self.node_path.set_depth_write(False)
+        self.node_path.set_light_off()
+        self.node_path.set_bin("fixed", 10)
+
+    def upload(self, vertices):
+        """Replace the vertex buffer with (n, 7) float32 rows in one copy."""
+        n = len(vertices)
+        self.vdata.unclean_set_num_rows(n)
+        if n:
+            self.vdata.modify_array_handle(0).copy_data_from(np.ascontiguousarray(vertices))
+        self.points.clear_vertices()
+        if n:
+            self.points.add_consecutive_vertices(0, n)
+
+    def destroy(self):
+        self.node_path.remove_node()
+
 
 class Particle:
     """Single particle (sphere) that moves and fades."""
 
-    def __init__(self, position, velocity, lifetime=0.5, scale=0.3, col=None):
+    def __init__(self, position, velocity, lifetime=0.5, scale=0.3, col=None, pool=None):
         self.position = Vec3(position) if hasattr(position, "__len__") else position
         self.velocity = Vec3(velocity) if velocity else Vec3(0, 0, 0)
         self.lifetime = lifetime
         self.scale = scale
         self.col = col or color.orange
         self.entity = None
+        self.pool = pool
         self._spawn_time = time.perf_counter()
         self._alive = True
-        if URSINA_AVAILABLE:
+        if URSINA_AVAILABLE and pool is not None:
+            self.entity = pool.acquire(position=self.position, scale=scale, color=self.col, alpha=0.9)
+        elif URSINA_AVAILABLE:
             self.entity = Entity(
                 model="sphere",
                 scale=scale,
@@ -54,25 +181,51 @@ class Particle:
     def destroy(self):
         self._alive = False
         if URSINA_AVAILABLE and self.entity:
-            destroy(self.entity)
+            if self.pool is not None:
+                self.pool.release(self.entity)
+            else:
+                destroy(self.entity)
             self.entity = None
 
 
 class ParticleSystem:
     """Spawn and update particles (explosions)."""
 
-    def __init__(self):
-        self.particles = []
+    def __init__(self, pool=None, backend=None, capacity=None):
+        self.backend = backend or config.PARTICLE_BACKEND
+        self.particles = []  # entity backend
+        self.pool = pool
+        self.buffer = None  # mesh backend
+        self.mesh = None
+        if self.backend == "mesh":
+            self.buffer = ParticleBuffer(capacity)
+            if URSINA_AVAILABLE and PANDA_AVAILABLE:
+                self.mesh = ParticleMesh(scene)
+        elif self.pool is None and URSINA_AVAILABLE:
+            self.pool = get_pool("particle", model="sphere", scale=0.3, double_sided=True)
 
     def explode(self, position, count=12, speed=8.0, lifetime=0.5):
+        if self.buffer is not None:
+            self.buffer.emit(position, count, speed, lifetime)
+            return
         for _ in range(count):
             vel = Vec3(
                 random.uniform(-1, 1),
                 random.uniform(-1, 1),
                 random.uniform(-1, 1),
             ).normalized() * speed
-            p = Particle(position, vel, lifetime=lifetime, col=color.rgb(255, 180, 80))
+            p = Particle(position, vel, lifetime=lifetime, col=color.rgb(255, 180, 80), pool=self.pool)
             self.particles.append(p)
 
     def update(self, dt):
+        if self.buffer is not None:
+            was_empty = self.buffer.count == 0
+            self.buffer.update(dt)
+            # Nothing to upload while no particles are alive (and none were last frame)
+            if self.mesh is not None and not (was_empty and self.buffer.count == 0):
+                self.mesh.upload(self.buffer.vertices())
+            return
         self.particles = [p for p in self.particles if p.update(dt)]
+
+    def live_count(self):
+        return self.buffer.count if self.buffer is not None else len(self.particles)
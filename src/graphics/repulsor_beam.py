@@ -1,5 +1,7 @@
 """
 Arc reactor repulsor beam: glowing projectile with trail.
+Beam motion is plain tuple math on the clock the beam was given, so beams also run
+headless (render=False) inside the simulation; the entity only mirrors the position.
 """
 
 import sys
@@ -7,6 +9,7 @@ import os
 import time
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 import config
+from .entity_pool import get_pool
 
 try:
     from ursina import Entity, Vec3, color, destroy, camera
@@ -15,20 +18,41 @@ except ImportError:
     URSINA_AVAILABLE = False
 
 
+def beam_entity_kwargs():
+    return dict(
+        model="sphere",
+        scale=(0.4, 0.4, 0.8),
+        color=color.rgb(100, 200, 255),
+        alpha=0.95,
+        double_sided=True,
+    )
+
+
+def _normalized(v):
+    x, y, z = tuple(v)[:3]
+    norm = (x * x + y * y + z * z) ** 0.5
+    return (x / norm, y / norm, z / norm) if norm > 0 else (0.0, 0.0, 1.0)
+
+
 class RepulsorBeam:
     """Single repulsor beam: moves along direction, despawns after lifetime or distance."""
 
-    def __init__(self, origin, direction, speed=120.0, lifetime=1.0, hand="left"):
-        self.origin = Vec3(origin) if origin else None
-        self.direction = Vec3(direction).normalized() if direction else None
+    def __init__(self, origin, direction, speed=120.0, lifetime=1.0, hand="left", pool=None, clock=None, render=True):
+        self.origin = tuple(origin)[:3] if origin is not None else None
+        self.direction = _normalized(direction) if direction is not None else None
         self.speed = speed
         self.lifetime = lifetime
         self.hand = hand
+        self.pool = pool  # EntityPool to take the entity from and return it to
         self.entity = None
         self.trail_entities = []
-        self._spawn_time = time.perf_counter()
-        self._alive = True
-        if not URSINA_AVAILABLE:
+        self._clock = clock or time.perf_counter
+        self._spawn_time = self._clock()
+        self._alive = self.origin is not None and self.direction is not None
+        self.position = self.origin
+        # Position before the last update; collision sweeps prev -> current so fast beams cannot tunnel
+        self.prev_position = self.origin
+        if not URSINA_AVAILABLE or not render or not self._alive:
             return
         self._create_beam()
         self._create_trail()
@@ -36,15 +60,11 @@ class RepulsorBeam:
     def _create_beam(self):
         if not URSINA_AVAILABLE:
             return
-        self.entity = Entity(
-            model="sphere",
-            scale=(0.4, 0.4, 0.8),
-            position=Vec3(self.origin),
-            color=color.rgb(100, 200, 255),
-            alpha=0.95,
-            double_sided=True,
-        )
-        self.entity.look_at(self.entity.position + self.direction)
+        if self.pool is not None:
+            self.entity = self.pool.acquire(position=Vec3(*self.origin))
+        else:
+            self.entity = Entity(position=Vec3(*self.origin), **beam_entity_kwargs())
+        self.entity.look_at(self.entity.position + Vec3(*self.direction))
         self.entity.repulsor_beam = self
 
     def _create_trail(self):
@@ -52,19 +72,37 @@ class RepulsorBeam:
         self.trail_entities = []
 
     def update(self, dt):
-        if not self._alive or self.entity is None:
+        if not self._alive:
             return False
-        elapsed = time.perf_counter() - self._spawn_time
+        elapsed = self._clock() - self._spawn_time
         if elapsed >= self.lifetime:
             self.destroy()
             return False
-        self.entity.position += self.direction * self.speed * dt
+        self.prev_position = self.position
+        step = self.speed * dt
+        x, y, z = self.position
+        dx, dy, dz = self.direction
+        self.position = (x + dx * step, y + dy * step, z + dz * step)
         return True
 
+    def sync_entity(self, alpha=1.0):
+        """Place the entity alpha of the way from the previous to the current position."""
+        if self.entity is None:
+            return
+        if alpha >= 1.0:
+            self.entity.position = self.position
+            return
+        px, py, pz = self.prev_position
+        x, y, z = self.position
+        self.entity.position = (px + (x - px) * alpha, py + (y - py) * alpha, pz + (z - pz) * alpha)
+
     def destroy(self):
         self._alive = False
         if URSINA_AVAILABLE and self.entity:
-            destroy(self.entity)
+            if self.pool is not None:
+                self.pool.release(self.entity)
+            else:
+                destroy(self.entity)
             self.entity = None
         for e in self.trail_entities:
             if e:
@@ -72,9 +110,10 @@ class RepulsorBeam:
         self.trail_entities.clear()
 
     def get_position(self):
-        if self.entity:
-            return self.entity.world_position
-        return self.origin
+        return self.position
+
+    def get_prev_position(self):
+        return self.prev_position
 
     def is_alive(self):
         return self._alive
@@ -83,14 +122,24 @@ class RepulsorBeam:
 class RepulsorBeamManager:
     """Spawns and updates all active repulsor beams."""
 
-    def __init__(self):
+    def __init__(self, pool=None, clock=None, render=True):
         self.beams = []
+        self.pool = pool
+        self.clock = clock
+        self.render = render
+        if self.pool is None and URSINA_AVAILABLE and render:
+            self.pool = get_pool("beam", **beam_entity_kwargs())
 
     def fire(self, origin, direction, hand="left"):
-        beam = RepulsorBeam(origin, direction, hand=hand)
-        if beam.entity is not None:
+        beam = RepulsorBeam(origin, direction, hand=hand, pool=self.pool, clock=self.clock, render=self.render)
+        if beam.is_alive():
             self.beams.append(beam)
         return beam
 
     def update(self, dt):
         self.beams = [b for b in self.beams if b.update(dt)]
+
+    def sync_entities(self, alpha=1.0):
+        """Position every beam's entity for rendering (once per frame, after the simulation ticks)."""
+        for beam in self.beams:
+            beam.sync_entity(alpha)
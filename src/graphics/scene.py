@@ -1,5 +1,8 @@
 """
 3D game scene: sky, clouds, flying effect. Supports ultrawide resolutions.
+Clouds are one combined mesh (CloudField): per-cloud transforms live in NumPy
+arrays, the drift is a single node translation, and only the vertex rows of
+clouds that wrap around are rewritten.
 """
 
 import sys
@@ -8,9 +11,11 @@ import time
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 import config
 
+import numpy as np
+
 try:
     from ursina import (
-        Ursina, Entity, Sky, camera, window,
+        Ursina, Entity, Sky, camera, window, scene,
         Vec3, color, destroy,
         Mesh, load_texture,
     )
@@ -19,6 +24,156 @@ try:
 except ImportError:
     URSINA_AVAILABLE = False
 
+try:
+    from panda3d.core import Geom, GeomNode, GeomTriangles, GeomVertexData, TransparencyAttrib
+    from .particles import vertex_color_format
+    PANDA_AVAILABLE = True
+except ImportError:
+    PANDA_AVAILABLE = False
+
+CLOUD_DRIFT = 2.0  # x units per second, for parallax
+CLOUD_X_RANGE = 80.0  # clouds drifting past -80 reappear at +80
+CLOUD_BEHIND = 30.0  # clouds this far behind the camera jump ahead
+CLOUD_WRAP_Z = 230.0
+CLOUD_REBASE = 1000.0  # fold the scroll offset back into the centers past this
+
+
+def sphere_template(segments=None, rings=None):
+    """Unit UV sphere: (V, 3) float32 vertices and (T, 3) uint32 triangles."""
+    segments = segments or config.CLOUD_SEGMENTS
+    rings = rings or config.CLOUD_RINGS
+    theta = np.linspace(0.0, np.pi, rings + 1)[:, None]
+    phi = np.linspace(0.0, 2.0 * np.pi, segments, endpoint=False)[None, :]
+    verts = np.stack([
+        np.sin(theta) * np.cos(phi),
+        np.cos(theta) * np.ones_like(phi),
+        np.sin(theta) * np.sin(phi),
+    ], axis=-1).reshape(-1, 3).astype(np.float32)
+    r, c = np.meshgrid(np.arange(rings), np.arange(segments), indexing="ij")
+    a = r * segments + c
+    b = r * segments + (c + 1) % segments
+    tris = np.concatenate([
+        np.stack([a, a + segments, b], axis=-1).reshape(-1, 3),
+        np.stack([b, a + segments, b + segments], axis=-1).reshape(-1, 3),
+    ]).astype(np.uint32)
+    return verts, tris
+
+
+class CloudField:
+    """
+    Cloud centers, scales and alphas in arrays, plus the combined vertex array. The
+    shared x drift is one scroll offset applied as the node's translation, so a
+    frame only rewrites the rows of clouds that wrapped around (found in one
+    vectorized step). The scroll is folded back into the centers every
+    CLOUD_REBASE units to keep float32 precision, which rewrites everything once.
+    """
+
+    def __init__(self, count=None, rng=None, template=None):
+        self.count = config.CLOUD_COUNT if count is None else count
+        rng = rng if rng is not None else np.random.default_rng()
+        n = self.count
+        self.centers = np.column_stack([
+            rng.uniform(-60, 60, n),
+            rng.uniform(5, 40, n),
+            rng.uniform(20, 200, n),  # ahead of player
+        ]).astype(np.float32)
+        self.scales = rng.uniform(8, 25, n).astype(np.float32)
+        self.alphas = rng.uniform(0.3, 0.7, n).astype(np.float32)
+        self.template, tris = template or sphere_template()
+        v = len(self.template)
+        # Static index buffer for all clouds: template triangles offset per cloud
+        self.triangles = (tris[None, :, :] + (np.arange(n, dtype=np.uint32) * v)[:, None, None]).reshape(-1, 3)
+        self._vertices = np.empty((n, v, 7), dtype=np.float32)
+        self._vertices[:, :, 3:6] = 1.0  # white
+        self._vertices[:, :, 6] = self.alphas[:, None]
+        self._write(np.arange(n))
+        self.scroll = 0.0  # node x offset is -scroll
+        self.rewrites = 0  # cloud rows rewritten since creation
+
+    def __len__(self):
+        return self.count
+
+    def _write(self, slots):
+        self._vertices[slots, :, :3] = (
+            self.template[None, :, :] * self.scales[slots, None, None] + self.centers[slots, None, :]
+        )
+
+    def step(self, dt, camera_z=0.0):
+        """Advance the drift and wrap clouds. Returns the slots whose vertex rows changed."""
+        self.scroll += CLOUD_DRIFT * dt
+        if self.scroll >= CLOUD_REBASE:
+            self.centers[:, 0] -= self.scroll
+            self.scroll = 0.0
+            slots = np.arange(self.count)
+        else:
+            slots = None
+        wrap_x = self.centers[:, 0] - self.scroll < -CLOUD_X_RANGE
+        wrap_z = self.centers[:, 2] < camera_z - CLOUD_BEHIND
+        self.centers[wrap_x, 0] = CLOUD_X_RANGE + self.scroll
+        self.centers[wrap_z, 2] += CLOUD_WRAP_Z
+        if slots is None:
+            slots = np.flatnonzero(wrap_x | wrap_z)
+        if len(slots):
+            self._write(slots)
+            self.rewrites += len(slots)
+        return slots
+
+    def vertices(self):
+        """(count * V, 7) float32 rows: template scaled and moved per cloud, white with per-cloud alpha."""
+        return self._vertices.reshape(-1, 7)
+
+    def cloud_rows(self, slot):
+        """Row range of one cloud in vertices()."""
+        v = len(self.template)
+        return slot * v, (slot + 1) * v
+
+    def world_centers(self):
+        """Where the clouds are drawn right now."""
+        out = self.centers.copy()
+        out[:, 0] -= self.scroll
+        return out
+
+
+class CloudMesh:
+    """All clouds as one GeomTriangles node; the index buffer is written once."""
+
+    def __init__(self, parent, field):
+        self.field = field
+        self.vdata = GeomVertexData("clouds", vertex_color_format(), Geom.UH_dynamic)
+        tris = GeomTriangles(Geom.UH_static)
+        tris.set_index_type(Geom.NT_uint32)
+        tris.modify_vertices().modify_handle().copy_data_from(np.ascontiguousarray(field.triangles.ravel()))
+        geom = Geom(self.vdata)
+        geom.add_primitive(tris)
+        node = GeomNode("clouds")
+        node.add_geom(geom)
+        self.node_path = parent.attach_new_node(node)
+        self.node_path.set_transparency(TransparencyAttrib.M_alpha)
+        self.node_path.set_two_sided(True)
+        self.node_path.set_depth_write(False)
+        self.node_path.set_light_off()
+        self.upload()
+
+    def upload(self, slots=None):
+        """Copy the whole vertex array, or only the rows of the given clouds."""
+        vertices = self.field.vertices()
+        if slots is None or len(slots) * 4 >= len(self.field):
+            self.vdata.unclean_set_num_rows(len(vertices))
+            self.vdata.modify_array_handle(0).copy_data_from(vertices)
+            return
+        handle = self.vdata.modify_array_handle(0)
+        row_bytes = vertices.strides[0]
+        for slot in slots.tolist():
+            start, stop = self.field.cloud_rows(slot)
+            size = (stop - start) * row_bytes
+            handle.copy_subdata_from(start * row_bytes, size, vertices, start * row_bytes, size)
+
+    def update(self, dt, camera_z):
+        slots = self.field.step(dt, camera_z)
+        if len(slots):
+            self.upload(slots)
+        self.node_path.set_x(-self.field.scroll)
+
 
 class CloudEntity:
     """Single cloud for procedural sky."""
@@ -56,7 +211,9 @@ class GameScene:
         self.fullscreen = fullscreen
         self.app = None
         self.sky = None
-        self.clouds = []
+        self.clouds = []  # CloudEntity fallback when the combined mesh is unavailable
+        self.cloud_field = None
+        self.cloud_mesh = None
         self._fly_speed = 20.0
         self._camera_entity = None
         if not URSINA_AVAILABLE:
@@ -88,41 +245,38 @@ class GameScene:
         self._spawn_clouds()
 
     def _spawn_clouds(self):
-        import random
         if not URSINA_AVAILABLE:
             return
-        # Parent to scene (None = scene) so camera can fly through
-        parent = camera  # Sky follows camera; clouds in world space need a scene entity
-        try:
-            from ursina import scene
-            parent = scene
-        except Exception:
-            parent = camera
-        for _ in range(30):
+        # Clouds live in world space (parented to scene) so the camera flies through them
+        if PANDA_AVAILABLE:
+            self.cloud_field = CloudField()
+            self.cloud_mesh = CloudMesh(scene, self.cloud_field)
+            return
+        import random
+        for _ in range(config.CLOUD_COUNT):
             x = random.uniform(-60, 60)
             y = random.uniform(5, 40)
             z = random.uniform(20, 200)  # ahead of player
             scale = random.uniform(8, 25)
             alpha = random.uniform(0.3, 0.7)
-            c = CloudEntity(parent, Vec3(x, y, z), scale, alpha)
+            c = CloudEntity(scene, Vec3(x, y, z), scale, alpha)
             self.clouds.append(c)
 
     def update(self, dt):
         """Update flying effect and clouds."""
         if not URSINA_AVAILABLE:
             return
-        for c in self.clouds:
-            c.update(dt)
         # Flying forward: move camera forward through the world
         self._camera_entity.z += self._fly_speed * dt
-        # Wrap clouds: move far clouds back ahead when we pass them
-        try:
-            from ursina import scene
-            for c in self.clouds:
-                if c.entity and c.entity.z < camera.z - 30:
-                    c.entity.z += 230
-        except Exception:
-            pass
+        if self.cloud_mesh is not None:
+            self.cloud_mesh.update(dt, camera.z)
+            return
+        cam_z = camera.z
+        for c in self.clouds:
+            c.update(dt)
+            # Wrap clouds: move far clouds back ahead when we pass them
+            if c.entity and c.entity.z < cam_z - CLOUD_BEHIND:
+                c.entity.z += CLOUD_WRAP_Z
 
     def set_fly_speed(self, speed):
         self._fly_speed = speed
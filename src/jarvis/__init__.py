@@ -1,11 +1,16 @@
 from .voice_assistant import JarvisVoiceAssistant
 from .speech_to_text import SpeechToText
+from .audio_stream import AudioStream, WavFileSource
 from .text_to_speech import TextToSpeech
 from .conversation import JarvisConversation
+from .service import JarvisService
 
 __all__ = [
     "JarvisVoiceAssistant",
     "SpeechToText",
+    "AudioStream",
+    "WavFileSource",
     "TextToSpeech",
     "JarvisConversation",
+    "JarvisService",
 ]
@@ -0,0 +1,544 @@
+"""
+Streaming audio input for Jarvis. One long-lived input stream feeds a ring buffer
+of int16 samples. An incremental energy VAD cuts the buffer into utterances as
+soon as each one ends. The noise floor tracks the room continuously, so phrases
+need no per-phrase calibration and no speech is lost between them.
+
+A WAV file (or an in-memory sample array) can stand in for the microphone.
+Audio the device loses in an overrun is recorded as a gap in the ring's sample
+positions, so stream time keeps pace with the wall clock. An utterance that
+spans a gap is dropped rather than stitched together.
+"""
+
+import threading
+import queue
+import time
+import wave
+from collections import deque
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+import config
+
+import numpy as np
+
+try:
+    import speech_recognition as sr
+    SR_AVAILABLE = True
+except ImportError:
+    SR_AVAILABLE = False
+    sr = None
+
+
+def read_wav(path):
+    """(mono int16 samples, sample_rate) from a 16-bit PCM WAV file."""
+    with wave.open(path, "rb") as wf:
+        if wf.getsampwidth() != 2:
+            raise ValueError(f"{path}: only 16-bit PCM WAV is supported")
+        rate = wf.getframerate()
+        channels = wf.getnchannels()
+        samples = np.frombuffer(wf.readframes(wf.getnframes()), dtype="<i2")
+    if channels > 1:
+        samples = samples.reshape(-1, channels).mean(axis=1).astype(np.int16)
+    return samples.astype(np.int16, copy=False), rate
+
+
+def write_wav(path, samples, sample_rate):
+    """Write mono int16 samples as a 16-bit PCM WAV file."""
+    with wave.open(path, "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(sample_rate)
+        wf.writeframes(np.asarray(samples, dtype="<i2").tobytes())
+
+
+class MicrophoneSource:
+    """Default microphone opened once and read in fixed chunks for the life of the stream."""
+
+    def __init__(self, sample_rate=None, chunk=None, device_index=None):
+        self.sample_rate = sample_rate or config.JARVIS_STT_SAMPLE_RATE
+        self.chunk = chunk or int(self.sample_rate * config.JARVIS_STT_CHUNK_MS / 1000)
+        self.device_index = device_index
+        self.realtime = True
+        self.overflows = 0  # device buffer overruns (audio lost before we could read it)
+        self.lost_samples = 0  # total audio those overruns lost; the stream turns it into ring gaps
+        self._mic = None
+        self._stream = None
+        self._opened_at = 0.0
+        self._delivered = 0
+
+    def open(self):
+        if not SR_AVAILABLE:
+            raise RuntimeError("SpeechRecognition (with PyAudio) is required for microphone input")
+        self._mic = sr.Microphone(device_index=self.device_index, sample_rate=self.sample_rate, chunk_size=self.chunk)
+        self._mic.__enter__()
+        self.sample_rate = self._mic.SAMPLE_RATE
+        self._stream = self._mic.stream.pyaudio_stream
+        self._opened_at = time.perf_counter()
+        self._delivered = 0
+
+    def read(self):
+        """
+        Next chunk of int16 samples. An overrun does not discard the chunk: the
+        audio the device dropped is found by comparing the samples delivered so
+        far with the time since open(), and added to lost_samples.
+        """
+        samples = np.frombuffer(self._stream.read(self.chunk, exception_on_overflow=False), dtype="<i2")
+        now = time.perf_counter()
+        self._delivered += len(samples)
+        try:
+            buffered = self._stream.get_read_available()
+        except Exception:
+            buffered = 0
+        expected = int((now - self._opened_at) * self.sample_rate)
+        behind = expected - self._delivered - self.lost_samples - buffered
+        if behind > self.chunk:
+            self.overflows += 1
+            self.lost_samples += behind
+        return samples
+
+    def close(self):
+        if self._mic is not None:
+            try:
+                self._mic.__exit__(None, None, None)
+            except Exception:
+                pass
+            self._mic = None
+            self._stream = None
+
+
+class ArraySource:
+    """
+    Microphone stand-in reading chunks from a sample array. realtime=True paces
+    reads at the sample rate like a device; otherwise it runs as fast as possible.
+    read() returns None at the end.
+    """
+
+    def __init__(self, samples, sample_rate, chunk=None, realtime=False):
+        self.samples = np.asarray(samples, dtype=np.int16)
+        self.sample_rate = sample_rate
+        self.chunk = chunk or int(sample_rate * config.JARVIS_STT_CHUNK_MS / 1000)
+        self.realtime = realtime
+        self.overflows = 0
+        self.lost_samples = 0
+        self._pos = 0
+        self._t0 = None
+
+    def open(self):
+        self._pos = 0
+        self._t0 = time.perf_counter()
+
+    def read(self):
+        if self._pos >= len(self.samples):
+            return None
+        end = self._pos + self.chunk
+        if self.realtime:
+            wait = self._t0 + end / self.sample_rate - time.perf_counter()
+            if wait > 0:
+                time.sleep(wait)
+        out = self.samples[self._pos:end]
+        self._pos = end
+        return out
+
+    def close(self):
+        pass
+
+
+class WavFileSource(ArraySource):
+    """A 16-bit WAV file played into the pipeline in place of the microphone."""
+
+    def __init__(self, path, chunk=None, realtime=False):
+        samples, rate = read_wav(path)
+        super().__init__(samples, rate, chunk=chunk, realtime=realtime)
+        self.path = path
+
+
+class AudioRing:
+    """
+    Fixed-size int16 ring indexed by absolute sample position. One writer (the
+    capture thread) and one reader (the segmenter). If the reader falls more than
+    a ring behind, the oldest unread samples are skipped and counted in dropped.
+    skip() advances the write position over audio the source lost; read() never
+    returns samples from across such a gap.
+    """
+
+    def __init__(self, capacity):
+        self.capacity = int(capacity)
+        self._buf = np.zeros(self.capacity, dtype=np.int16)
+        self.written = 0  # total samples written; publishing is a single int store
+        self.write_time = 0.0  # perf_counter of the newest write
+        self.read_pos = 0
+        self.dropped = 0
+        self.skipped = 0  # samples of source gaps (device overruns)
+        self._gaps = deque()  # (start, end) positions of gaps not yet passed by the reader
+
+    def skip(self, n):
+        """Mark the next n sample positions as lost audio."""
+        if n <= 0:
+            return
+        # Published before written moves, so the reader never sees the gap as samples
+        self._gaps.append((self.written, self.written + n))
+        self.skipped += n
+        self.written += n
+
+    def write(self, samples):
+        n = len(samples)
+        if n == 0:
+            return
+        if n > self.capacity:
+            samples = samples[-self.capacity:]
+            self.written += n - self.capacity
+            n = self.capacity
+        start = self.written % self.capacity
+        first = min(n, self.capacity - start)
+        self._buf[start:start + first] = samples[:first]
+        if first < n:
+            self._buf[:n - first] = samples[first:]
+        self.write_time = time.perf_counter()
+        self.written += n
+
+    def read(self):
+        """
+        (samples, start_pos): a copy of what was written since the last read, up
+        to the next gap. Call again until it returns no samples.
+        """
+        end = self.written
+        if end - self.read_pos > self.capacity:
+            self.dropped += end - self.capacity - self.read_pos
+            self.read_pos = end - self.capacity
+        gaps = self._gaps
+        while gaps and gaps[0][0] <= self.read_pos:
+            self.read_pos = max(self.read_pos, gaps.popleft()[1])
+        if gaps and gaps[0][0] < end:
+            end = gaps[0][0]
+        start = self.read_pos
+        n = end - start
+        if n <= 0:
+            return np.zeros(0, dtype=np.int16), start
+        i = start % self.capacity
+        first = min(n, self.capacity - i)
+        out = np.empty(n, dtype=np.int16)
+        out[:first] = self._buf[i:i + first]
+        if first < n:
+            out[first:] = self._buf[:n - first]
+        self.read_pos = end
+        return out, start
+
+
+class Utterance:
+    """One segmented phrase: samples plus where it sat in the stream and when its end was detected."""
+
+    __slots__ = ("samples", "sample_rate", "start", "end", "detected_pos", "detected_at", "cut", "speech_end_at")
+
+    def __init__(self, samples, sample_rate, start, end, detected_pos, detected_at, cut=False):
+        self.samples = samples
+        self.sample_rate = sample_rate
+        self.start = start  # stream position of the first sample (including pre-roll)
+        self.end = end  # stream position just after the last speech frame
+        self.detected_pos = detected_pos  # stream position when the end was decided
+        self.detected_at = detected_at  # perf_counter when the end was decided
+        self.cut = cut  # True if cut at JARVIS_VAD_MAX_UTTERANCE_S rather than by silence
+        self.speech_end_at = None  # perf_counter when the last speech sample arrived (real-time sources)
+
+    @property
+    def duration(self):
+        return len(self.samples) / self.sample_rate
+
+    def end_lag(self):
+        """Seconds of stream between the end of speech and its detection (the silence hangover)."""
+        return (self.detected_pos - self.end) / self.sample_rate
+
+
+class EnergySegmenter:
+    """
+    Incremental energy VAD. Audio is scored in fixed frames by RMS against an
+    adaptive noise floor. Speech starts after JARVIS_VAD_START_MS above
+    floor * START_RATIO. It ends after JARVIS_VAD_END_SILENCE_MS below
+    floor * END_RATIO (hysteresis). Outside speech the floor follows the room:
+    it drops quickly and rises slowly.
+
+    An optional listener(event, payload) follows speech as it happens, for
+    streaming recognizers: ("start", stream position), then ("audio", samples)
+    as frames arrive, then ("end", Utterance, or None if the segment was
+    rejected or broken by a gap).
+    """
+
+    def __init__(self, sample_rate, frame_ms=None):
+        self.sample_rate = sample_rate
+        self.frame_len = int(sample_rate * (frame_ms or config.JARVIS_VAD_FRAME_MS) / 1000)
+        frame_s = self.frame_len / sample_rate
+        self.start_frames = max(1, round(config.JARVIS_VAD_START_MS / 1000 / frame_s))
+        self.end_frames = max(1, round(config.JARVIS_VAD_END_SILENCE_MS / 1000 / frame_s))
+        self.min_frames = max(1, round(config.JARVIS_VAD_MIN_SPEECH_MS / 1000 / frame_s))
+        self.max_frames = max(self.min_frames, round(config.JARVIS_VAD_MAX_UTTERANCE_S / frame_s))
+        self.start_ratio = config.JARVIS_VAD_START_RATIO
+        self.end_ratio = config.JARVIS_VAD_END_RATIO
+        self.min_energy = config.JARVIS_VAD_MIN_ENERGY
+        self.floor_down = config.JARVIS_VAD_FLOOR_DOWN
+        self.floor_up = config.JARVIS_VAD_FLOOR_UP
+        self.noise_floor = None
+        self._pending = np.zeros(0, dtype=np.int16)
+        self._pos = 0  # stream position of the first sample of _pending
+        self._pre_roll = deque(maxlen=max(1, round(config.JARVIS_VAD_PRE_ROLL_MS / 1000 / frame_s)))
+        self._frames = []
+        self._start = 0
+        self._voiced = 0  # consecutive loud frames while waiting for speech to start
+        self._silent = 0  # consecutive quiet frames inside speech
+        self._speech_frames = 0
+        self._last_voiced_end = 0
+        self.in_speech = False
+        self.rejected = 0  # segments shorter than JARVIS_VAD_MIN_SPEECH_MS
+        self.cut = 0  # utterances cut at the maximum length
+        self.listener = None
+        self._sent = 0  # frames of the current utterance already passed to the listener
+
+    def feed(self, samples, start=None):
+        """Score new samples; returns the list of utterances that ended in them."""
+        if start is not None and start != self._pos + len(self._pending):
+            # The ring skipped audio: drop the partial frame and any utterance spanning the gap
+            self._pending = np.zeros(0, dtype=np.int16)
+            self._pos = start
+            if self.in_speech and self.listener is not None:
+                self.listener("end", None)
+            self._reset_speech()
+        if len(self._pending):
+            samples = np.concatenate((self._pending, samples))
+        n = len(samples) // self.frame_len
+        frames = samples[:n * self.frame_len].reshape(n, self.frame_len)
+        self._pending = samples[n * self.frame_len:]
+        if not n:
+            return []
+        rms = np.sqrt(np.mean(frames.astype(np.float32) ** 2, axis=1))
+        out = []
+        pos = self._pos
+        now = time.perf_counter()
+        for frame, energy in zip(frames, rms.tolist()):
+            utterance = self._step(frame, energy, pos, now)
+            if utterance is not None:
+                out.append(utterance)
+            pos += self.frame_len
+        self._pos = pos
+        if self.in_speech:
+            self._flush()
+        return out
+
+    def _step(self, frame, energy, pos, now):
+        if self.noise_floor is None:
+            self.noise_floor = max(energy, 1.0)
+        floor = self.noise_floor
+        end = pos + self.frame_len
+        if not self.in_speech:
+            if energy > max(floor * self.start_ratio, self.min_energy):
+                self._voiced += 1
+                if self._voiced >= self.start_frames:
+                    # Speech confirmed: pre-roll holds the onset frames and a little lead-in
+                    self.in_speech = True
+                    self._frames = list(self._pre_roll)
+                    self._frames.append(frame)
+                    self._start = end - self.frame_len * len(self._frames)
+                    self._speech_frames = self._voiced
+                    self._silent = 0
+                    self._last_voiced_end = end
+                    self._pre_roll.clear()
+                    self._sent = 0
+                    if self.listener is not None:
+                        self.listener("start", self._start)
+                    return None
+            else:
+                self._voiced = 0
+                rate = self.floor_down if energy < floor else self.floor_up
+                self.noise_floor = max(1.0, floor + rate * (energy - floor))
+            self._pre_roll.append(frame)
+            return None
+        self._frames.append(frame)
+        if energy > max(floor * self.end_ratio, self.min_energy):
+            self._silent = 0
+            self._speech_frames += 1
+            self._last_voiced_end = end
+        else:
+            self._silent += 1
+        if self._silent >= self.end_frames:
+            return self._finish(end, now, cut=False)
+        if len(self._frames) >= self.max_frames:
+            self.cut += 1
+            return self._finish(end, now, cut=True)
+        return None
+
+    def _flush(self):
+        if self.listener is not None and self._sent < len(self._frames):
+            self.listener("audio", np.concatenate(self._frames[self._sent:]))
+            self._sent = len(self._frames)
+
+    def _finish(self, pos, now, cut):
+        self._flush()
+        frames, start, speech, last_voiced = self._frames, self._start, self._speech_frames, self._last_voiced_end
+        self._reset_speech()
+        utterance = None
+        if speech < self.min_frames:
+            self.rejected += 1
+        else:
+            # Trim the trailing silence hangover, keep one frame of tail
+            keep = (min(last_voiced + self.frame_len, pos) - start) // self.frame_len
+            samples = np.concatenate(frames[:keep])
+            utterance = Utterance(samples, self.sample_rate, start, last_voiced, pos, now, cut=cut)
+        if self.listener is not None:
+            self.listener("end", utterance)
+        return utterance
+
+    def _reset_speech(self):
+        self.in_speech = False
+        self._frames = []
+        self._voiced = 0
+        self._silent = 0
+        self._speech_frames = 0
+
+
+class AudioStream:
+    """
+    Capture thread: source -> AudioRing. Segmenter thread: ring -> EnergySegmenter
+    -> bounded utterance queue. When the queue is full the oldest utterance is
+    dropped, so a slow recognizer never stalls a microphone; a file or array
+    source waits for room instead. With speech_events=True
+    the segmenter's start/audio/end events are queued on `speech` instead, for
+    recognizers that decode while the user is still talking.
+    """
+
+    def __init__(self, source=None, ring_seconds=None, queue_size=None, on_utterance=None, speech_events=False):
+        self.source = source or MicrophoneSource()
+        self.on_utterance = on_utterance  # optional hook, called on the segmenter thread
+        self.speech_events = speech_events
+        self.speech = queue.Queue()
+        self.ring_seconds = ring_seconds or config.JARVIS_STT_RING_SECONDS
+        self.utterances = queue.Queue(maxsize=queue_size or config.JARVIS_STT_QUEUE_SIZE)
+        self.ring = None
+        self.segmenter = None
+        self.utterances_dropped = 0
+        self.emitted = 0
+        self.finished = threading.Event()  # set once a finite source is exhausted and segmented
+        self._wake = threading.Event()
+        self._capturing_done = False
+        self._lost_seen = 0
+        self._running = False
+        self._threads = []
+
+    def start(self):
+        self.source.open()
+        rate = self.source.sample_rate
+        self.ring = AudioRing(int(rate * self.ring_seconds))
+        self.segmenter = EnergySegmenter(rate)
+        if self.speech_events:
+            self.segmenter.listener = self._on_speech
+        self._running = True
+        self._capturing_done = False
+        self._lost_seen = self.source.lost_samples
+        self.finished.clear()
+        self._threads = [
+            threading.Thread(target=self._capture_loop, name="audio-capture", daemon=True),
+            threading.Thread(target=self._segment_loop, name="audio-segment", daemon=True),
+        ]
+        for t in self._threads:
+            t.start()
+
+    def _capture_loop(self):
+        while self._running:
+            try:
+                samples = self.source.read()
+            except Exception:
+                time.sleep(0.05)
+                continue
+            if samples is None:
+                break
+            if not self.source.realtime:
+                # A file can wait for the segmenter; a device cannot, so only it may overrun the ring
+                while self._running and self.ring.written + len(samples) - self.ring.read_pos > self.ring.capacity:
+                    time.sleep(0.001)
+            lost = self.source.lost_samples
+            if lost != self._lost_seen:
+                # Audio the device dropped: advance the stream position so timestamps stay true
+                self.ring.skip(lost - self._lost_seen)
+                self._lost_seen = lost
+            self.ring.write(samples)
+            self._wake.set()
+        self._capturing_done = True
+        self._wake.set()
+
+    def _segment_loop(self):
+        while self._running:
+            self._wake.wait(timeout=0.1)
+            self._wake.clear()
+            done = self._capturing_done
+            while True:
+                samples, start = self.ring.read()
+                if not len(samples):
+                    break
+                # A start past the previous read's end is a gap; the segmenter drops speech spanning it
+                utterances = self.segmenter.feed(samples, start)
+                if not self.speech_events:
+                    for utterance in utterances:
+                        self._emit(utterance)
+            if done and self.ring.read_pos >= self.ring.written:
+                self.finished.set()
+                return
+
+    def _on_speech(self, event, payload):
+        if event == "end" and payload is not None:
+            self._stamp(payload)
+            self.emitted += 1
+            if self.on_utterance is not None:
+                self.on_utterance(payload)
+        self.speech.put((event, payload))
+
+    def _stamp(self, utterance):
+        if self.source.realtime:
+            # Back-date from the ring's write clock: samples arrive at the sample rate
+            written, write_time = self.ring.written, self.ring.write_time
+            utterance.speech_end_at = write_time - (written - utterance.end) / utterance.sample_rate
+
+    def _emit(self, utterance):
+        self.emitted += 1
+        self._stamp(utterance)
+        if self.on_utterance is not None:
+            self.on_utterance(utterance)
+        if not self.source.realtime:
+            # A file can wait for the recognizer, as capture waits for the ring; nothing is dropped
+            while self._running:
+                try:
+                    self.utterances.put(utterance, timeout=0.1)
+                    return
+                except queue.Full:
+                    pass
+            return
+        while True:
+            try:
+                self.utterances.put_nowait(utterance)
+                return
+            except queue.Full:
+                try:
+                    self.utterances.get_nowait()
+                    self.utterances_dropped += 1
+                except queue.Empty:
+                    pass
+
+    def stop(self):
+        self._running = False
+        self._wake.set()
+        for t in self._threads:
+            t.join(timeout=1.0)
+        self._threads = []
+        self.source.close()
+
+    def stats(self):
+        """Audio and utterance loss counters for the stream."""
+        ring, seg = self.ring, self.segmenter
+        rate = self.source.sample_rate
+        return {
+            "seconds_captured": ring.written / rate if ring else 0.0,
+            "device_overflows": self.source.overflows,
+            "device_lost_seconds": self.source.lost_samples / rate,
+            "ring_dropped_samples": ring.dropped if ring else 0,
+            "utterances": self.emitted,
+            "utterances_dropped": self.utterances_dropped,
+            "utterances_cut": seg.cut if seg else 0,
+            "segments_rejected": seg.rejected if seg else 0,
+            "noise_floor": seg.noise_floor if seg else None,
+        }
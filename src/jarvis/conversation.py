@@ -1,11 +1,20 @@
 """
 Jarvis conversation: LLM integration for natural dialogue and game commentary.
+Replies are cached (response_cache.py) by prompt and banded game state, and the
+next wave's commentary is prefetched in the background so a wave start can use
+a ready line instead of waiting on the API. The *_async variants run on the
+JarvisService event loop with one shared AsyncOpenAI client.
 """
 
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 import sys
 import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 import config
+from .response_cache import ResponseCache
 
 try:
     import openai
@@ -17,14 +26,23 @@ except Exception:
 class JarvisConversation:
     """Generate Jarvis responses from game context and user speech."""
 
-    def __init__(self, system_prompt=None):
+    def __init__(self, system_prompt=None, cache=None, client=None, async_client=None):
         self.system_prompt = system_prompt or config.JARVIS_SYSTEM_PROMPT
-        self._client = None
-        if OPENAI_AVAILABLE:
+        self._client = client  # anything with OpenAI's chat.completions.create
+        self._aclient = async_client  # AsyncOpenAI-style client for respond_async (built lazily)
+        self._owns_client = client is None
+        self.timeouts = 0
+        if self._client is None and OPENAI_AVAILABLE:
             try:
                 self._client = openai.OpenAI(api_key=config.OPENAI_API_KEY)
             except Exception:
                 self._client = None
+        if cache is None and config.JARVIS_CACHE_ENABLED:
+            cache = ResponseCache()
+        self.cache = cache or None  # cache=False disables caching
+        self._prefetch_pool = None
+        self._prefetching = set()
+        self._prefetch_lock = threading.Lock()
         self._messages = []
 
     def set_game_context(self, health, energy, score, wave):
@@ -33,29 +51,85 @@ class JarvisConversation:
             f"Current game state: health={health}, energy={energy}, score={score}, wave={wave}. "
         )
 
-    def respond(self, user_text, health=None, energy=None, score=None, wave=None):
-        """Get Jarvis reply to user_text. Optional game state for context."""
+    def _chat_request(self, user_text, health, energy, score, wave):
+        """(cache key, cached reply, completion kwargs) for a reply to user_text."""
         if health is not None:
             self.set_game_context(health, energy or 0, score or 0, wave or 1)
         context = getattr(self, "_game_context", "")
+        key = cached = None
+        if self.cache is not None:
+            state = (health, energy or 0, score or 0, wave or 1) if health is not None else None
+            key = self.cache.key("respond", user_text, state)
+            cached = self.cache.get(key)
+        kwargs = {
+            "model": "gpt-4o-mini",
+            "messages": [
+                {"role": "system", "content": self.system_prompt + " " + context},
+                {"role": "user", "content": user_text},
+            ],
+            "max_tokens": 80,
+            "temperature": 0.7,
+        }
+        return key, cached, kwargs
+
+    def _store_reply(self, resp, key, t0):
+        text = resp.choices[0].message.content.strip() if resp.choices else None
+        if text and key is not None:
+            self.cache.put(key, text, time.perf_counter() - t0)
+        return text
+
+    def respond(self, user_text, health=None, energy=None, score=None, wave=None):
+        """Get Jarvis reply to user_text. Optional game state for context."""
         if not self._client:
+            if health is not None:
+                self.set_game_context(health, energy or 0, score or 0, wave or 1)
             return self._fallback_response(user_text)
+        key, cached, kwargs = self._chat_request(user_text, health, energy, score, wave)
+        if cached:
+            return cached
         try:
-            messages = [
-                {"role": "system", "content": self.system_prompt + " " + context},
-                {"role": "user", "content": user_text},
-            ]
-            resp = self._client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=messages,
-                max_tokens=80,
-                temperature=0.7,
-            )
-            text = resp.choices[0].message.content.strip() if resp.choices else None
+            t0 = time.perf_counter()
+            text = self._store_reply(self._client.chat.completions.create(**kwargs), key, t0)
             return text or self._fallback_response(user_text)
         except Exception:
             return self._fallback_response(user_text)
 
+    async def respond_async(self, user_text, health=None, energy=None, score=None, wave=None, timeout=None):
+        """
+        respond() on the asyncio loop with the shared AsyncOpenAI client. Gives up
+        after `timeout` seconds with the fallback line; cancellation propagates.
+        """
+        aclient = self._async_client()
+        if aclient is None:
+            if not self._client:
+                return self.respond(user_text, health, energy, score, wave)
+            # Sync client only (e.g. injected): keep the loop free
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(None, self.respond, user_text, health, energy, score, wave)
+        key, cached, kwargs = self._chat_request(user_text, health, energy, score, wave)
+        if cached:
+            return cached
+        try:
+            t0 = time.perf_counter()
+            resp = await asyncio.wait_for(aclient.chat.completions.create(**kwargs), timeout)
+            return self._store_reply(resp, key, t0) or self._fallback_response(user_text)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            return self._fallback_response(user_text)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            return self._fallback_response(user_text)
+
+    def _async_client(self):
+        """One AsyncOpenAI client (and HTTP connection pool) reused for every async request."""
+        if self._aclient is None and OPENAI_AVAILABLE and self._client is not None and self._owns_client:
+            try:
+                self._aclient = openai.AsyncOpenAI(api_key=config.OPENAI_API_KEY)
+            except Exception:
+                self._aclient = None
+        return self._aclient
+
     def _fallback_response(self, user_text):
         t = (user_text or "").lower()
         if "status" in t or "health" in t:
@@ -66,20 +140,88 @@ class JarvisConversation:
             return "Focus on the incoming hostiles."
         return "I'm here, sir. How may I assist?"
 
-    def commentary_wave_start(self, wave):
-        """Short line for wave start."""
-        if self._client:
-            try:
-                r = self._client.chat.completions.create(
-                    model="gpt-4o-mini",
-                    messages=[
-                        {"role": "system", "content": self.system_prompt + " Reply in one short sentence."},
-                        {"role": "user", "content": f"Wave {wave} is starting. Give a brief Jarvis-style line."},
-                    ],
-                    max_tokens=30,
-                )
-                if r.choices:
-                    return r.choices[0].message.content.strip()
-            except Exception:
-                pass
+    def commentary_wave_start(self, wave, wait=True):
+        """
+        Short line for wave start. With wait=False this never calls the API: it
+        returns the cached (prefetched) line or the stock one.
+        """
+        key = self.cache.key("wave", str(wave)) if self.cache is not None else None
+        if key is not None:
+            cached = self.cache.get(key)
+            if cached:
+                return cached
+        if self._client and wait:
+            line = self._fetch_wave_line(wave, key)
+            if line:
+                return line
         return f"Wave {wave} incoming, sir."
+
+    def _wave_request(self, wave):
+        return {
+            "model": "gpt-4o-mini",
+            "messages": [
+                {"role": "system", "content": self.system_prompt + " Reply in one short sentence."},
+                {"role": "user", "content": f"Wave {wave} is starting. Give a brief Jarvis-style line."},
+            ],
+            "max_tokens": 30,
+        }
+
+    def _fetch_wave_line(self, wave, key):
+        try:
+            t0 = time.perf_counter()
+            return self._store_reply(self._client.chat.completions.create(**self._wave_request(wave)), key, t0)
+        except Exception:
+            return None
+
+    async def prefetch_wave_async(self, wave, timeout=None):
+        """prefetch_wave() as a coroutine on the caller's loop (JarvisService); True if a line was cached."""
+        if not (self._client or self._aclient) or self.cache is None:
+            return False
+        key = self.cache.key("wave", str(wave))
+        with self._prefetch_lock:
+            if wave in self._prefetching or key in self.cache:
+                return False
+            self._prefetching.add(wave)
+        try:
+            aclient = self._async_client()
+            if aclient is None:
+                loop = asyncio.get_running_loop()
+                line = await loop.run_in_executor(None, self._fetch_wave_line, wave, key)
+            else:
+                t0 = time.perf_counter()
+                resp = await asyncio.wait_for(aclient.chat.completions.create(**self._wave_request(wave)), timeout)
+                line = self._store_reply(resp, key, t0)
+            if line:
+                self.cache.prefetched += 1
+            return bool(line)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            return False
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            return False
+        finally:
+            with self._prefetch_lock:
+                self._prefetching.discard(wave)
+
+    def prefetch_wave(self, wave):
+        """Fetch the commentary for `wave` on a background thread unless it is cached or in flight."""
+        if not self._client or self.cache is None:
+            return None
+        key = self.cache.key("wave", str(wave))
+        with self._prefetch_lock:
+            if wave in self._prefetching or key in self.cache:
+                return None
+            self._prefetching.add(wave)
+            if self._prefetch_pool is None:
+                self._prefetch_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="jarvis-prefetch")
+
+        def run():
+            try:
+                if self._fetch_wave_line(wave, key):
+                    self.cache.prefetched += 1
+            finally:
+                with self._prefetch_lock:
+                    self._prefetching.discard(wave)
+        return self._prefetch_pool.submit(run)
@@ -0,0 +1,262 @@
+"""
+Fast path for Jarvis voice commands. One compiled keyword grammar over the game
+vocabulary (status, health, energy, score, wave, help, pause, resume) maps short
+utterances to intents. Those are answered locally from live game state in
+microseconds. Anything the grammar does not cover, and any long open-ended
+sentence, is escalated to the LLM. A misheard word still matches if it is one
+edit away from a long vocabulary word, but never for pause/resume: a near miss
+must not change the game. For the same reason pause/resume only fire when the
+whole utterance is the command ("jarvis, pause the game"). "Hold on, what wave
+is it" gets the wave readout, and "don't pause" goes to the LLM.
+"""
+
+import re
+import time
+from bisect import bisect_right
+from collections import deque
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+import config
+
+import numpy as np
+
+# intent: keywords and phrases that trigger it
+INTENTS = {
+    "pause": ("pause", "freeze", "hold on", "hold position", "stop the game"),
+    "resume": ("resume", "unpause", "continue", "carry on", "go on", "start again"),
+    "help": ("help", "how do i", "how to", "controls", "instructions", "what do i do"),
+    "status": ("status", "sitrep", "report", "systems", "how am i doing", "how are we doing"),
+    "health": ("health", "hp", "armor", "armour", "hull", "damage", "integrity"),
+    "energy": ("energy", "power", "charge", "battery", "repulsors", "repulsor"),
+    "score": ("score", "points", "kills"),
+    "wave": ("wave", "round", "level", "enemies", "hostiles"),
+}
+READOUTS = ("health", "energy", "score", "wave")
+ACTIONS = {"pause": "pause", "resume": "resume"}
+# Earlier intents win when an utterance matches several (answers before actions)
+PRIORITY = tuple(i for i in INTENTS if i not in ACTIONS) + tuple(ACTIONS)
+# Words allowed around a pause/resume phrase that still count as the whole command
+COMMAND_FILLERS = frozenset(("jarvis", "hey", "ok", "okay", "please", "now", "the", "game"))
+ESCALATE = "llm"  # stats key for utterances sent to the LLM
+# Everyday words one edit from a fuzzy keyword ("change" / charge, "wealth" / health)
+FUZZY_STOPWORDS = frozenset((
+    "wealth", "heath", "stealth", "statue", "stratus", "resort", "repost",
+    "joints", "pints", "paints", "pointy", "change", "charged", "amour",
+))
+
+# Latency histogram bucket upper edges in seconds: 1-2-5 steps from 1 us to 10 s
+LATENCY_BUCKETS = tuple(m * 10.0 ** e for e in range(-6, 1) for m in (1, 2, 5)) + (10.0,)
+
+_WORD = re.compile(r"[a-z0-9']+")
+
+
+def _bucket_label(seconds):
+    if seconds < 1e-3:
+        return f"<{seconds * 1e6:g}us"
+    if seconds < 1.0:
+        return f"<{seconds * 1e3:g}ms"
+    return f"<{seconds:g}s"
+
+
+def _deletions(word):
+    return {word[:i] + word[i + 1:] for i in range(len(word))}
+
+
+def _strip_fillers(words):
+    start, end = 0, len(words)
+    while start < end and words[start] in COMMAND_FILLERS:
+        start += 1
+    while end > start and words[end - 1] in COMMAND_FILLERS:
+        end -= 1
+    return words[start:end]
+
+
+def _within_one_edit(a, b):
+    if a == b:
+        return True
+    if abs(len(a) - len(b)) > 1:
+        return False
+    if len(a) == len(b):
+        diff = [i for i in range(len(a)) if a[i] != b[i]]
+        # One substitution, or two neighbouring letters swapped
+        return len(diff) == 1 or (len(diff) == 2 and diff[1] == diff[0] + 1
+                                  and a[diff[0]] == b[diff[1]] and a[diff[1]] == b[diff[0]])
+    short, long_ = (a, b) if len(a) < len(b) else (b, a)
+    return short in _deletions(long_)
+
+
+class IntentMatch:
+    """Result of a grammar match: intent name and the words that triggered it."""
+
+    __slots__ = ("intent", "keyword", "fuzzy")
+
+    def __init__(self, intent, keyword, fuzzy=False):
+        self.intent = intent
+        self.keyword = keyword
+        self.fuzzy = fuzzy  # matched a misheard word within one edit
+
+    @property
+    def action(self):
+        """Game action for the intent ("pause", "resume") or None."""
+        return ACTIONS.get(self.intent)
+
+
+class IntentStats:
+    """Hit counts and latency (rolling samples plus a fixed 1-2-5 histogram) per intent."""
+
+    def __init__(self, window=None):
+        self.window = window or config.JARVIS_STT_STATS_WINDOW
+        self.hits = {}
+        self.fuzzy = 0
+        self._samples = {}
+        self._histograms = {}
+
+    def record(self, intent, seconds, fuzzy=False):
+        self.hits[intent] = self.hits.get(intent, 0) + 1
+        if fuzzy:
+            self.fuzzy += 1
+        samples = self._samples.get(intent)
+        if samples is None:
+            samples = self._samples[intent] = deque(maxlen=self.window)
+            self._histograms[intent] = [0] * (len(LATENCY_BUCKETS) + 1)
+        samples.append(seconds)
+        self._histograms[intent][bisect_right(LATENCY_BUCKETS, seconds)] += 1
+
+    def stats(self):
+        total = sum(self.hits.values())
+        out = {"utterances": total, "local_share": 0.0, "fuzzy_matches": self.fuzzy, "intents": {}}
+        if not total:
+            return out
+        out["local_share"] = 1.0 - self.hits.get(ESCALATE, 0) / total
+        for intent, hits in sorted(self.hits.items(), key=lambda kv: -kv[1]):
+            us = 1e6 * np.asarray(self._samples[intent], dtype=np.float64)
+            counts = self._histograms[intent]
+            histogram = {_bucket_label(edge): n for edge, n in zip(LATENCY_BUCKETS, counts) if n}
+            if counts[-1]:
+                histogram[f">={LATENCY_BUCKETS[-1]:g}s"] = counts[-1]
+            out["intents"][intent] = {
+                "hits": hits,
+                "hit_rate": hits / total,
+                "mean_us": float(us.mean()),
+                "p50_us": float(np.percentile(us, 50)),
+                "p95_us": float(np.percentile(us, 95)),
+                "histogram": histogram,
+            }
+        return out
+
+
+class IntentMatcher:
+    """
+    Keyword grammar compiled into one regex (longest phrase first), plus a
+    deletion index for single-edit fuzzy matches against keywords of at least
+    JARVIS_INTENT_FUZZY_MIN_LEN letters (short ones like "wave" or "help" are
+    one edit from too many everyday words). Action intents only match exactly,
+    and only when nothing but fillers surrounds the phrase.
+    respond() returns (reply, action) for local intents, or None to escalate.
+    """
+
+    def __init__(self, intents=None, max_words=None, fuzzy_min_len=None):
+        self.intents = intents or INTENTS
+        self.max_words = max_words or config.JARVIS_INTENT_MAX_WORDS
+        self.fuzzy_min_len = fuzzy_min_len or config.JARVIS_INTENT_FUZZY_MIN_LEN
+        self._keyword_intent = {}
+        for intent, keywords in self.intents.items():
+            for keyword in keywords:
+                self._keyword_intent.setdefault(keyword, intent)
+        alternatives = sorted(self._keyword_intent, key=len, reverse=True)
+        self._grammar = re.compile(r"\b(?:" + "|".join(re.escape(k) for k in alternatives) + r")\b")
+        self._fuzzy_index = {}
+        for keyword, intent in self._keyword_intent.items():
+            if " " in keyword or len(keyword) < self.fuzzy_min_len or intent in ACTIONS:
+                continue
+            for key in _deletions(keyword) | {keyword}:
+                self._fuzzy_index.setdefault(key, []).append(keyword)
+        self.stats = IntentStats()
+
+    def match(self, text):
+        """IntentMatch for a short command, or None if it should go to the LLM."""
+        text = (text or "").lower()
+        words = _WORD.findall(text)
+        if not words or len(words) > self.max_words:
+            return None
+        normalized = " ".join(words)
+        found = {}
+        for m in self._grammar.finditer(normalized):
+            keyword = m.group(0)
+            intent = self._keyword_intent[keyword]
+            if intent in ACTIONS and _strip_fillers(words) != _strip_fillers(keyword.split()):
+                # Part of a longer sentence, or negated ("don't pause"): not a command
+                continue
+            found.setdefault(intent, keyword)
+        fuzzy = False
+        if not found:
+            for word in words:
+                keyword = self._fuzzy(word)
+                if keyword is not None:
+                    found.setdefault(self._keyword_intent[keyword], keyword)
+                    fuzzy = True
+        if not found:
+            return None
+        if sum(1 for name in READOUTS if name in found) > 1:
+            # "health and energy?" -> the full status readout
+            return IntentMatch("status", " ".join(found[n] for n in READOUTS if n in found), fuzzy)
+        for intent in PRIORITY:
+            if intent in found:
+                return IntentMatch(intent, found[intent], fuzzy)
+        intent, keyword = next(iter(found.items()))
+        return IntentMatch(intent, keyword, fuzzy)
+
+    def _fuzzy(self, word):
+        if len(word) < self.fuzzy_min_len - 1 or word in FUZZY_STOPWORDS:
+            return None
+        candidates = set(self._fuzzy_index.get(word, ()))
+        for key in _deletions(word):
+            candidates.update(self._fuzzy_index.get(key, ()))
+        best = None
+        for keyword in candidates:
+            if _within_one_edit(word, keyword) and (best is None or len(keyword) > len(best)):
+                best = keyword
+        return best
+
+    def respond(self, text, health, energy, score, wave):
+        """(reply, action) answered locally, or None to escalate; timed into stats either way."""
+        t0 = time.perf_counter()
+        match = self.match(text)
+        if match is None:
+            return None
+        reply = self.reply(match.intent, health, energy, score, wave)
+        self.stats.record(match.intent, time.perf_counter() - t0, match.fuzzy)
+        return reply, match.action
+
+    def record_escalation(self, seconds):
+        """Time an utterance spent on the LLM path (called by the assistant)."""
+        self.stats.record(ESCALATE, seconds)
+
+    def reply(self, intent, health, energy, score, wave):
+        health = max(0, int(health))
+        energy = max(0, int(energy))
+        health_pct = round(100 * health / config.PLAYER_MAX_HEALTH)
+        energy_pct = round(100 * energy / config.PLAYER_MAX_ENERGY)
+        if intent == "status":
+            return (f"Armor at {health_pct} percent, repulsors at {energy_pct} percent. "
+                    f"Wave {wave}, score {score}, sir.")
+        if intent == "health":
+            if health_pct < 30:
+                return f"Armor integrity at {health_pct} percent. I'd advise evasive action, sir."
+            return f"Armor integrity at {health_pct} percent, sir."
+        if intent == "energy":
+            if energy_pct < 25:
+                return f"Repulsors at {energy_pct} percent. Close your fists to recharge, sir."
+            return f"Repulsors at {energy_pct} percent, sir."
+        if intent == "score":
+            return f"Score stands at {score}, sir."
+        if intent == "wave":
+            return f"We're on wave {wave}, sir."
+        if intent == "help":
+            return "Open your palms to aim. Pull your hand back then release to fire. Close your fist to recharge."
+        if intent == "pause":
+            return "Holding position, sir."
+        if intent == "resume":
+            return "Resuming, sir."
+        return None
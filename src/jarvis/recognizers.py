@@ -0,0 +1,270 @@
+"""
+Pluggable speech recognizers for SpeechToText. All backends take mono int16 audio
+through the same interface:
+- begin(sample_rate) starts an utterance.
+- accept(samples) feeds a chunk and returns the current partial hypothesis, or None.
+- finish() returns the final text, or None.
+
+Streaming backends (Vosk, running locally on the CPU) decode while the user is
+still speaking, so partial results arrive mid-phrase. Cloud backends (Google,
+Whisper API) buffer the audio and make one request in finish(). Every backend
+takes the recognition language (JARVIS_STT_LANGUAGE by default).
+"""
+
+import io
+import json
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+import config
+
+import numpy as np
+
+try:
+    import speech_recognition as sr
+    SR_AVAILABLE = True
+except ImportError:
+    SR_AVAILABLE = False
+    sr = None
+
+try:
+    import openai
+    OPENAI_AVAILABLE = bool(config.OPENAI_API_KEY)
+except Exception:
+    OPENAI_AVAILABLE = False
+
+try:
+    import vosk
+    vosk.SetLogLevel(-1)
+    VOSK_AVAILABLE = True
+except Exception:
+    VOSK_AVAILABLE = False
+    vosk = None
+
+
+class Recognizer:
+    """Base recognizer: buffers an utterance and transcribes it in finish()."""
+
+    name = "base"
+    streaming = False  # True if accept() decodes incrementally and can return partials
+
+    def __init__(self):
+        self.sample_rate = config.JARVIS_STT_SAMPLE_RATE
+        self._chunks = []
+
+    def available(self):
+        return True
+
+    def load(self):
+        """Load models ahead of the first utterance (no-op for cloud backends)."""
+
+    def begin(self, sample_rate):
+        self.sample_rate = sample_rate
+        self._chunks = []
+
+    def accept(self, samples):
+        self._chunks.append(np.asarray(samples, dtype=np.int16))
+        return None
+
+    def finish(self):
+        samples = np.concatenate(self._chunks) if self._chunks else np.zeros(0, dtype=np.int16)
+        self._chunks = []
+        if not len(samples):
+            return None
+        return self._transcribe(samples)
+
+    def _transcribe(self, samples):
+        return None
+
+    def transcribe(self, samples, sample_rate):
+        """Whole-utterance convenience: begin, accept everything, finish."""
+        self.begin(sample_rate)
+        self.accept(samples)
+        return self.finish()
+
+
+class FunctionRecognizer(Recognizer):
+    """Wraps a plain (samples, sample_rate) -> text callable."""
+
+    name = "function"
+
+    def __init__(self, fn, name=None):
+        super().__init__()
+        self.fn = fn
+        if name:
+            self.name = name
+
+    def _transcribe(self, samples):
+        return self.fn(samples, self.sample_rate)
+
+
+def _audio_data(samples, sample_rate):
+    return sr.AudioData(np.asarray(samples, dtype="<i2").tobytes(), sample_rate, 2)
+
+
+class GoogleRecognizer(Recognizer):
+    """speech_recognition's free Google Web Speech endpoint (network round trip per utterance)."""
+
+    name = "google"
+
+    def __init__(self, language=None):
+        super().__init__()
+        self.language = language or config.JARVIS_STT_LANGUAGE
+        self._recognizer = sr.Recognizer() if SR_AVAILABLE else None
+
+    def available(self):
+        return self._recognizer is not None
+
+    def _transcribe(self, samples):
+        if self._recognizer is None:
+            return None
+        try:
+            return self._recognizer.recognize_google(_audio_data(samples, self.sample_rate), language=self.language)
+        except Exception:
+            return None
+
+
+class WhisperAPIRecognizer(Recognizer):
+    """OpenAI Whisper API (network round trip per utterance)."""
+
+    name = "whisper"
+
+    def __init__(self, language=None):
+        super().__init__()
+        self.language = language or config.JARVIS_STT_LANGUAGE
+        self._client = None
+
+    def available(self):
+        return SR_AVAILABLE and OPENAI_AVAILABLE
+
+    def _transcribe(self, samples):
+        if not self.available():
+            return None
+        try:
+            if self._client is None:
+                self._client = openai.OpenAI(api_key=config.OPENAI_API_KEY)
+            wav = io.BytesIO(_audio_data(samples, self.sample_rate).get_wav_data())
+            wav.name = "audio.wav"
+            resp = self._client.audio.transcriptions.create(model="whisper-1", file=wav, language=self.language)
+            return resp.text.strip() or None
+        except Exception:
+            return None
+
+
+_vosk_models = {}
+
+
+def vosk_model_path(model=None, language=None):
+    """Model folder for model, or for the language's JARVIS_VOSK_MODELS entry; None if it has none."""
+    model = model or config.JARVIS_VOSK_MODELS.get(language or config.JARVIS_STT_LANGUAGE)
+    if not model:
+        return None
+    return model if os.path.isabs(model) else os.path.join(config.MODELS_DIR, model)
+
+
+def _vosk_model(path):
+    """Loaded once per path and shared (the small English model takes ~1 s and ~50 MB)."""
+    model = _vosk_models.get(path)
+    if model is None:
+        model = _vosk_models[path] = vosk.Model(path)
+    return model
+
+
+class VoskRecognizer(Recognizer):
+    """
+    Offline Kaldi decoding with Vosk on the CPU, fed chunk by chunk. The optional
+    JARVIS_VOSK_GRAMMAR limits decoding to known phrases, which makes it faster
+    and more accurate for commands.
+    """
+
+    name = "vosk"
+    streaming = True
+
+    def __init__(self, model=None, grammar=None, language=None):
+        super().__init__()
+        self.language = language or config.JARVIS_STT_LANGUAGE
+        self.model_path = vosk_model_path(model, self.language)
+        self.grammar = config.JARVIS_VOSK_GRAMMAR if grammar is None else grammar
+        self._rec = None
+        self._rec_rate = None
+        self._segments = []  # text of segments Vosk already closed at pauses inside the utterance
+        self._partial = None
+
+    def available(self):
+        return VOSK_AVAILABLE and self.model_path is not None and os.path.isdir(self.model_path)
+
+    def load(self):
+        if self.available():
+            _vosk_model(self.model_path)
+
+    def begin(self, sample_rate):
+        self.sample_rate = sample_rate
+        self._segments = []
+        self._partial = None
+        if self._rec is not None and self._rec_rate == sample_rate:
+            self._rec.Reset()
+            return
+        model = _vosk_model(self.model_path)
+        if self.grammar:
+            self._rec = vosk.KaldiRecognizer(model, sample_rate, json.dumps(list(self.grammar) + ["[unk]"]))
+        else:
+            self._rec = vosk.KaldiRecognizer(model, sample_rate)
+        self._rec_rate = sample_rate
+
+    def accept(self, samples):
+        data = np.asarray(samples, dtype="<i2").tobytes()
+        if self._rec.AcceptWaveform(data):
+            # Vosk closed a segment on its own at a pause; later results start after it
+            self._keep(json.loads(self._rec.Result()).get("text", ""))
+            tail = ""
+        else:
+            tail = json.loads(self._rec.PartialResult()).get("partial", "")
+        text = " ".join(self._segments + ([tail] if tail else []))
+        if text:
+            self._partial = text
+        return self._partial
+
+    def finish(self):
+        self._keep(json.loads(self._rec.FinalResult()).get("text", ""))
+        text = " ".join(self._segments)
+        self._segments = []
+        self._partial = None
+        return text or None
+
+    def _keep(self, text):
+        if text and text != "[unk]":
+            self._segments.append(text)
+
+
+BACKENDS = {
+    "vosk": VoskRecognizer,
+    "google": GoogleRecognizer,
+    "whisper": WhisperAPIRecognizer,
+}
+
+
+def make_recognizer(backend=None, exclude=(), language=None):
+    """
+    Recognizer for JARVIS_STT_BACKEND. "auto" prefers the local Vosk model if it is
+    installed, then the Whisper API if an OpenAI key is set, then Google. A named
+    backend that is not available (package, key or model missing) warns and falls
+    back the same way instead of failing later on the listening thread.
+    """
+    backend = backend or config.JARVIS_STT_BACKEND
+    if backend != "auto":
+        recognizer = BACKENDS[backend](language=language)
+        if recognizer.available():
+            return recognizer
+        exclude = tuple(exclude) + (backend,)
+    for name in ("vosk", "whisper", "google"):
+        if name in exclude:
+            continue
+        recognizer = BACKENDS[name](language=language)
+        if recognizer.available():
+            break
+    else:
+        recognizer = GoogleRecognizer(language=language)
+    if backend != "auto":
+        fallback = recognizer.name if recognizer.available() else "none"
+        print(f"[Jarvis] speech backend {backend!r} is not available; falling back to {fallback}")
+    return recognizer
@@ -0,0 +1,177 @@
+"""
+LRU + TTL cache for Jarvis LLM replies, with an optional SQLite tier so lines
+survive between sessions. Keys combine the reply kind, the normalized prompt,
+and the game state in coarse bands (health and energy in 10% steps, score by
+magnitude). A recurring question in a similar situation therefore reuses the
+earlier answer instead of a new chat completion.
+"""
+
+import math
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+import config
+
+_WORD = re.compile(r"[a-z0-9']+")
+
+
+def normalize_prompt(text):
+    """Lowercase words only: "Status, Jarvis?" and "status jarvis" share a key."""
+    return " ".join(_WORD.findall((text or "").lower()))
+
+
+def _band(value, maximum, step_pct):
+    pct = 100.0 * max(0.0, float(value)) / maximum
+    return int(min(100.0, pct) // step_pct)
+
+
+def state_bucket(health, energy, score, wave):
+    """Game state in the coarse bands the cache keys on."""
+    step = config.JARVIS_CACHE_STATE_BAND_PCT
+    health_band = _band(health, config.PLAYER_MAX_HEALTH, step)
+    energy_band = _band(energy, config.PLAYER_MAX_ENERGY, step)
+    score_band = int(math.log10(score)) + 1 if score and score > 0 else 0  # 0, 1-9, 10-99, ...
+    return f"h{health_band}e{energy_band}s{score_band}w{wave}"
+
+
+class ResponseCache:
+    """
+    In-memory LRU of at most `capacity` entries, each valid for `ttl` seconds.
+    With a db_path, misses fall through to a SQLite table (entries valid for
+    disk_ttl seconds) and new entries are written to both tiers. Thread-safe.
+    """
+
+    def __init__(self, capacity=None, ttl=None, db_path=None, disk_ttl=None, clock=time.time):
+        self.capacity = capacity or config.JARVIS_CACHE_CAPACITY
+        self.ttl = config.JARVIS_CACHE_TTL if ttl is None else ttl
+        self.disk_ttl = config.JARVIS_CACHE_DISK_TTL if disk_ttl is None else disk_ttl
+        self.db_path = config.JARVIS_CACHE_DB if db_path is None else db_path
+        self.clock = clock  # wall clock: disk entries must age across sessions
+        self._entries = OrderedDict()  # key -> (value, expires_at, API seconds the reply cost)
+        self._lock = threading.Lock()
+        self._db = None
+        if self.db_path:
+            try:
+                self._db = sqlite3.connect(self.db_path, check_same_thread=False)
+                self._db.execute(
+                    "CREATE TABLE IF NOT EXISTS responses"
+                    " (key TEXT PRIMARY KEY, value TEXT NOT NULL, created REAL NOT NULL, cost REAL NOT NULL)"
+                )
+                self._db.commit()
+            except sqlite3.Error:
+                self._db = None
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evictions = 0
+        self.prefetched = 0
+        self.saved_seconds = 0.0  # API time avoided: each hit credits what its reply cost to fetch
+        self._fetch_seconds = {}  # kind -> (total API seconds, count) of stored replies
+
+    @staticmethod
+    def key(kind, prompt="", state=None):
+        """Cache key for a reply kind, prompt and optional (health, energy, score, wave)."""
+        bucket = state_bucket(*state) if state is not None else ""
+        return f"{kind}|{normalize_prompt(prompt)}|{bucket}"
+
+    def get(self, key):
+        now = self.clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires_at, cost = entry
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    self.memory_hits += 1
+                    self.saved_seconds += cost
+                    return value
+                del self._entries[key]
+                self.expired += 1
+            row = self._disk_get(key, now)
+            if row is not None:
+                value, cost = row
+                self.disk_hits += 1
+                self.saved_seconds += cost
+                self._store(key, value, now, cost)
+                return value
+            self.misses += 1
+            return None
+
+    def put(self, key, value, fetch_seconds=None):
+        """Store a reply; fetch_seconds (the API time it cost) feeds the saved-latency estimate."""
+        if not value:
+            return
+        now = self.clock()
+        cost = fetch_seconds or 0.0
+        with self._lock:
+            if fetch_seconds is not None:
+                kind = key.split("|", 1)[0]
+                total, count = self._fetch_seconds.get(kind, (0.0, 0))
+                self._fetch_seconds[kind] = (total + fetch_seconds, count + 1)
+            self._store(key, value, now, cost)
+            if self._db is not None:
+                try:
+                    self._db.execute("INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?)", (key, value, now, cost))
+                    self._db.commit()
+                except sqlite3.Error:
+                    pass
+
+    def __contains__(self, key):
+        """Fresh in either tier; does not count as a lookup (a disk entry is loaded into memory)."""
+        now = self.clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] > now:
+                return True
+            row = self._disk_get(key, now)
+            if row is None:
+                return False
+            self._store(key, row[0], now, row[1])
+            return True
+
+    def _store(self, key, value, now, cost):
+        self._entries[key] = (value, now + self.ttl, cost)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def _disk_get(self, key, now):
+        if self._db is None:
+            return None
+        try:
+            row = self._db.execute("SELECT value, created, cost FROM responses WHERE key = ?", (key,)).fetchone()
+        except sqlite3.Error:
+            return None
+        if row is None or row[1] + self.disk_ttl <= now:
+            return None
+        return row[0], row[2]
+
+    def stats(self):
+        """Hit ratio per tier and API latency avoided."""
+        hits = self.memory_hits + self.disk_hits
+        lookups = hits + self.misses
+        fetch_ms = {kind: 1000.0 * total / count for kind, (total, count) in self._fetch_seconds.items() if count}
+        return {
+            "entries": len(self._entries),
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_ratio": hits / lookups if lookups else 0.0,
+            "expired": self.expired,
+            "evictions": self.evictions,
+            "prefetched": self.prefetched,
+            "mean_api_ms": fetch_ms,
+            "saved_ms": 1000.0 * self.saved_seconds,
+        }
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
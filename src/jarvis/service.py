@@ -0,0 +1,316 @@
+"""
+Jarvis service: a single asyncio event loop on its own thread does everything
+Jarvis does after an event (intent replies, LLM requests, speech). The render
+loop and the STT thread only post events, which costs microseconds.
+
+Speech lines wait in a bounded priority queue. A combat callout (wave start)
+preempts a command reply, and a command reply preempts chit-chat. A line older
+than its max age is dropped instead of spoken late. When the queue is full, the
+least urgent line is dropped. LLM requests share one AsyncOpenAI client and
+give up after JARVIS_LLM_TIMEOUT. A new question cancels the one still in flight.
+"""
+
+import asyncio
+import heapq
+import itertools
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+import config
+
+# Speech priorities: lower is more urgent
+COMBAT = 0
+COMMAND = 1
+CHAT = 2
+PRIORITY_NAMES = ("combat", "command", "chat")
+
+
+class SpeechJob:
+    """One line to speak, stamped with when its triggering event was posted."""
+
+    __slots__ = ("priority", "text", "created", "deadline", "seq")
+
+    def __init__(self, priority, text, created, max_age, seq):
+        self.priority = priority
+        self.text = text
+        self.created = created
+        self.deadline = created + max_age
+        self.seq = seq
+
+    def __lt__(self, other):
+        return (self.priority, self.seq) < (other.priority, other.seq)
+
+
+class SpeechQueue:
+    """
+    Bounded priority queue of SpeechJobs, used on the loop thread only. get()
+    returns the most urgent line that is still fresh. A full queue drops its
+    oldest least-urgent line, or rejects the new one if that is less urgent still.
+    """
+
+    def __init__(self, maxsize, clock):
+        self.maxsize = maxsize
+        self.clock = clock
+        self._heap = []
+        self._ready = asyncio.Event()
+        self.dropped_full = [0, 0, 0]
+        self.dropped_stale = [0, 0, 0]
+
+    def __len__(self):
+        return len(self._heap)
+
+    def put(self, job):
+        """Queue job; returns the job dropped to make room (possibly job itself), or None."""
+        dropped = None
+        if len(self._heap) >= self.maxsize:
+            worst = max(self._heap, key=lambda j: (j.priority, -j.seq))
+            if job.priority > worst.priority:
+                self.dropped_full[job.priority] += 1
+                return job
+            self._heap.remove(worst)
+            heapq.heapify(self._heap)
+            self.dropped_full[worst.priority] += 1
+            dropped = worst
+        heapq.heappush(self._heap, job)
+        self._ready.set()
+        return dropped
+
+    async def get(self):
+        while True:
+            while not self._heap:
+                self._ready.clear()
+                await self._ready.wait()
+            job = heapq.heappop(self._heap)
+            if self.clock() > job.deadline:
+                self.dropped_stale[job.priority] += 1
+                continue
+            return job
+
+
+class JarvisService:
+    """
+    Owns the Jarvis event loop thread. wave_started, voice_input, say and
+    prefetch_wave are safe to call from any thread and never block.
+    """
+
+    def __init__(self, conversation, tts, intents=None, state_callback=None, action_callback=None,
+                 profiler=None, queue_size=None, llm_timeout=None, clock=time.perf_counter):
+        self.conversation = conversation
+        self.tts = tts  # TextToSpeech-like: async synthesize(text), blocking play(text, path), stop()
+        self.intents = intents
+        self.state_callback = state_callback  # () -> (health, energy, score, wave)
+        self.action_callback = action_callback  # (action), called on the loop thread
+        self.profiler = profiler
+        self.queue_size = queue_size or config.JARVIS_SPEECH_QUEUE_SIZE
+        self.llm_timeout = config.JARVIS_LLM_TIMEOUT if llm_timeout is None else llm_timeout
+        self.max_age = (
+            config.JARVIS_COMBAT_LINE_MAX_AGE, config.JARVIS_COMMAND_LINE_MAX_AGE, config.JARVIS_CHAT_LINE_MAX_AGE,
+        )
+        self.clock = clock
+        self._loop = None
+        self._thread = None
+        self._audio = None  # the one thread blocking playback runs on
+        self._queue = None
+        self._speaking = None  # (job, task) while a line is being synthesized or played
+        self._chat_task = None
+        self._tasks = set()
+        self._seq = itertools.count()
+        self.posted = 0
+        self.spoken = [0, 0, 0]
+        self.preempted = [0, 0, 0]
+        self.superseded = 0
+        self._latency = [deque(maxlen=config.JARVIS_STT_STATS_WINDOW) for _ in PRIORITY_NAMES]
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._loop = asyncio.new_event_loop()
+        self._audio = ThreadPoolExecutor(max_workers=1, thread_name_prefix="jarvis-audio")
+        started = threading.Event()
+        self._thread = threading.Thread(target=self._run, args=(started,), name="jarvis-loop", daemon=True)
+        self._thread.start()
+        started.wait()
+
+    def stop(self, timeout=2.0):
+        """Cancel pending requests and speech, then stop the loop thread."""
+        if self._thread is None:
+            return
+        self.tts.stop()
+        try:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+        except RuntimeError:
+            pass
+        self._thread.join(timeout)
+        self._audio.shutdown(wait=False)
+        self._thread = None
+
+    def _run(self, started):
+        loop = self._loop
+        asyncio.set_event_loop(loop)
+        self._queue = SpeechQueue(self.queue_size, self.clock)
+        self._spawn(self._speaker())
+        loop.call_soon(started.set)
+        try:
+            loop.run_forever()
+            pending = asyncio.all_tasks(loop)
+            for task in pending:
+                task.cancel()
+            loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+        finally:
+            loop.close()
+
+    # Thread-safe entry points: they only schedule work on the loop
+
+    def post(self, fn, *args):
+        """Run fn(*args) on the loop thread; False if the service is not running."""
+        loop = self._loop
+        if loop is None:
+            return False
+        try:
+            loop.call_soon_threadsafe(fn, *args)
+        except RuntimeError:  # loop closed
+            return False
+        self.posted += 1
+        return True
+
+    def wave_started(self, wave):
+        return self.post(self._on_wave, wave, self.clock())
+
+    def voice_input(self, text):
+        return self.post(self._on_voice, text, self.clock())
+
+    def say(self, text, priority=CHAT):
+        return self.post(self._enqueue, priority, text, self.clock())
+
+    def prefetch_wave(self, wave):
+        return self.post(self._prefetch, wave)
+
+    # Loop thread
+
+    def _scope(self, name):
+        return self.profiler.scope(name) if self.profiler is not None else nullcontext()
+
+    def _spawn(self, coro):
+        task = self._loop.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    def _game_state(self):
+        if self.state_callback:
+            try:
+                return tuple(self.state_callback())
+            except Exception:
+                pass
+        return 100, 100, 0, 1
+
+    def _on_wave(self, wave, posted_at):
+        with self._scope("jarvis.wave_line"):
+            # Prefetched line or the stock one; the API is never waited on here
+            line = self.conversation.commentary_wave_start(wave, wait=False)
+        self._enqueue(COMBAT, line, posted_at)
+        self._prefetch(wave + 1)
+
+    def _prefetch(self, wave):
+        self._spawn(self.conversation.prefetch_wave_async(wave, self.llm_timeout))
+
+    def _on_voice(self, text, posted_at):
+        if not text or not text.strip():
+            return
+        state = self._game_state()
+        local = None
+        if self.intents is not None:
+            with self._scope("jarvis.intent"):
+                local = self.intents.respond(text, *state)
+        if local is not None:
+            response, action = local
+            if action and self.action_callback:
+                try:
+                    self.action_callback(action)
+                except Exception:
+                    pass
+            self._enqueue(COMMAND, response, posted_at)
+            return
+        if self._chat_task is not None and not self._chat_task.done():
+            # The pilot has moved on: drop the older question's request
+            self._chat_task.cancel()
+            self.superseded += 1
+        self._chat_task = self._spawn(self._chat(text, state, posted_at))
+
+    async def _chat(self, text, state, posted_at):
+        t0 = time.perf_counter()
+        response = await self.conversation.respond_async(text, *state, timeout=self.llm_timeout)
+        t1 = time.perf_counter()
+        if self.profiler is not None:
+            self.profiler.record("jarvis.respond", t0, t1)
+        if self.intents is not None:
+            self.intents.record_escalation(t1 - t0)
+        self._enqueue(CHAT, response, posted_at)
+
+    def _enqueue(self, priority, text, posted_at):
+        if not text or not text.strip():
+            return
+        job = SpeechJob(priority, text, posted_at, self.max_age[priority], next(self._seq))
+        if self._queue.put(job) is job:
+            return
+        speaking = self._speaking
+        if speaking is not None and priority < speaking[0].priority and not speaking[1].done():
+            self.preempted[speaking[0].priority] += 1
+            speaking[1].cancel()
+
+    async def _speaker(self):
+        while True:
+            job = await self._queue.get()
+            task = self._loop.create_task(self._speak(job))
+            self._speaking = (job, task)
+            try:
+                # wait() rather than await: a preempted line must not cancel the speaker
+                await asyncio.wait((task,))
+            except asyncio.CancelledError:
+                task.cancel()
+                raise
+            finally:
+                self._speaking = None
+
+    async def _speak(self, job):
+        try:
+            path = await self.tts.synthesize(job.text)
+            self._latency[job.priority].append(self.clock() - job.created)
+            self.spoken[job.priority] += 1
+            await self._loop.run_in_executor(self._audio, self.tts.play, job.text, path)
+        except asyncio.CancelledError:
+            self.tts.stop()
+            raise
+        except Exception:
+            pass
+
+    def stats(self):
+        """Per-priority speech counts, drops and event-to-speech latency; request cancellations."""
+        queue = self._queue
+        per_priority = {}
+        for p, name in enumerate(PRIORITY_NAMES):
+            lat = sorted(self._latency[p])
+            per_priority[name] = {
+                "spoken": self.spoken[p],
+                "preempted": self.preempted[p],
+                "dropped_stale": queue.dropped_stale[p] if queue is not None else 0,
+                "dropped_full": queue.dropped_full[p] if queue is not None else 0,
+                "p50_ms": 1000.0 * lat[len(lat) // 2] if lat else None,
+                "max_ms": 1000.0 * lat[-1] if lat else None,
+            }
+        return {
+            "posted": self.posted,
+            "queued": len(queue) if queue is not None else 0,
+            "superseded": self.superseded,
+            "llm_timeouts": self.conversation.timeouts,
+            "speech": per_priority,
+        }
@@ -1,5 +1,11 @@
 """
-Speech-to-text for Jarvis voice commands. Uses Whisper API or fallback.
+Speech-to-text for Jarvis voice commands. Recognition is pluggable
+(recognizers.py): a local Vosk model when installed, else the Whisper API or
+Google. By default the microphone stays open. A streaming pipeline
+(audio_stream.py) segments speech with an adaptive energy VAD. A streaming
+recognizer decodes each utterance while it is being spoken, so short commands
+can fire from a partial result; the other backends transcribe each utterance as
+soon as it ends.
 """
 
 import sys
@@ -7,9 +13,14 @@ import os
 import threading
 import queue
 import time
+from collections import deque
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 import config
 
+import numpy as np
+from .audio_stream import AudioStream
+from .recognizers import make_recognizer
+
 try:
     import speech_recognition as sr
     SR_AVAILABLE = True
@@ -17,63 +28,190 @@ except ImportError:
     SR_AVAILABLE = False
     sr = None
 
-try:
-    import openai
-    OPENAI_AVAILABLE = bool(config.OPENAI_API_KEY)
-except Exception:
-    OPENAI_AVAILABLE = False
-
 
 class SpeechToText:
     """Listen for voice and return text. Optional Whisper for accuracy."""
 
-    def __init__(self, language="en", use_whisper=False):
+    def __init__(self, language=None, use_whisper=False, streaming=None, stream=None, recognizer=None):
         self.language = language or config.JARVIS_STT_LANGUAGE
-        self.use_whisper = use_whisper and OPENAI_AVAILABLE
-        self._recognizer = sr.Recognizer() if SR_AVAILABLE else None
+        self.streaming = config.JARVIS_STT_STREAMING if streaming is None else streaming
+        self.recognizer = recognizer or make_recognizer(
+            exclude=() if use_whisper else ("whisper",), language=self.language,
+        )
+        self._sr = sr.Recognizer() if SR_AVAILABLE else None
         self._listening = False
         self._queue = queue.Queue()
+        self.stream = stream  # AudioStream for streaming mode (default: built on the microphone)
+        self.early_commands = tuple(config.JARVIS_EARLY_COMMANDS)
+        self.recognized = 0
+        self.no_text = 0
+        self.partials = 0
+        self.early = 0  # commands answered from a partial hypothesis before the utterance ended
+        self.early_corrected = 0  # ...whose final transcript said more, and was delivered as well
+        window = config.JARVIS_STT_STATS_WINDOW
+        self._latencies = {name: deque(maxlen=window)
+                           for name in ("end_detect", "recognize", "end_to_text", "early_lead")}
 
     def listen_once(self, timeout=3.0):
         """Block and return one phrase or None."""
-        if not SR_AVAILABLE or self._recognizer is None:
+        if not SR_AVAILABLE or self._sr is None:
             return None
         try:
             with sr.Microphone() as source:
-                self._recognizer.adjust_for_ambient_noise(source, duration=0.3)
-                audio = self._recognizer.listen(source, timeout=timeout, phrase_time_limit=5)
-            if self.use_whisper and OPENAI_AVAILABLE:
-                return self._whisper_transcribe(audio)
-            return self._recognizer.recognize_google(audio, language=self.language)
-        except sr.UnknownValueError:
-            return None
-        except sr.RequestError:
-            return None
+                self._sr.adjust_for_ambient_noise(source, duration=0.3)
+                audio = self._sr.listen(source, timeout=timeout, phrase_time_limit=5)
+            samples = np.frombuffer(audio.get_raw_data(convert_width=2), dtype="<i2")
+            return self.recognizer.transcribe(samples, audio.sample_rate)
         except Exception:
             return None
 
-    def _whisper_transcribe(self, audio):
-        try:
-            import io
-            wav = io.BytesIO(audio.get_wav_data())
-            wav.name = "audio.wav"
-            client = openai.OpenAI(api_key=config.OPENAI_API_KEY)
-            resp = client.audio.transcriptions.create(model="whisper-1", file=wav)
-            return resp.text.strip() or None
-        except Exception:
-            return None
+    def transcribe(self, samples, sample_rate):
+        """Text for mono int16 samples, or None."""
+        return self.recognizer.transcribe(samples, sample_rate)
 
-    def start_listening_background(self, callback):
-        """Run listening in a thread and call callback(text) when phrase detected."""
-        def run():
-            while self._listening:
-                text = self.listen_once(timeout=2)
-                if text and callback:
-                    callback(text)
+    def start_listening_background(self, callback, partial_callback=None):
+        """
+        Run listening in a thread and call callback(text) when phrase detected.
+        partial_callback(text), if given, gets each new partial hypothesis.
+        """
         self._listening = True
-        t = threading.Thread(target=run, daemon=True)
+        self.recognizer.load()
+        if self.stream is None and self.streaming and SR_AVAILABLE:
+            self.stream = AudioStream()
+        if self.stream is not None:
+            self.stream.speech_events = self.recognizer.streaming
+            try:
+                self.stream.start()
+            except Exception:
+                self.stream = None  # no usable input stream: fall back to per-phrase listening
+        if self.stream is None:
+            target, args = self._phrase_loop, (callback,)
+        elif self.recognizer.streaming:
+            target, args = self._speech_loop, (callback, partial_callback)
+        else:
+            target, args = self._stream_loop, (callback,)
+        t = threading.Thread(target=target, args=args, daemon=True)
         t.start()
         return t
 
+    def _phrase_loop(self, callback):
+        while self._listening:
+            text = self.listen_once(timeout=2)
+            if text and callback:
+                callback(text)
+
+    def _stream_loop(self, callback):
+        """Whole utterances from the VAD, one recognizer call each."""
+        stream = self.stream
+        while self._listening:
+            try:
+                utterance = stream.utterances.get(timeout=0.2)
+            except queue.Empty:
+                if stream.finished.is_set():
+                    break  # a file source ran out and every utterance was handled
+                continue
+            t0 = time.perf_counter()
+            text = self.recognizer.transcribe(utterance.samples, utterance.sample_rate)
+            self._deliver(utterance, text, t0, callback)
+
+    def _speech_loop(self, callback, partial_callback):
+        """Audio fed to a streaming recognizer as it is spoken; partials can answer a command early."""
+        stream = self.stream
+        recognizer = self.recognizer
+        active = False
+        fired_at = fired_text = None
+        last_partial = None
+        stable = 0  # samples of audio the partial has held for
+        stable_needed = 0
+        while self._listening:
+            try:
+                event, payload = stream.speech.get(timeout=0.2)
+            except queue.Empty:
+                if stream.finished.is_set():
+                    break
+                continue
+            if event == "start":
+                recognizer.begin(stream.source.sample_rate)
+                active = True
+                fired_at = fired_text = last_partial = None
+                stable = 0
+                stable_needed = stream.source.sample_rate * config.JARVIS_PARTIAL_STABLE_MS / 1000
+            elif event == "audio" and active:
+                partial = recognizer.accept(payload)
+                if not partial:
+                    continue
+                if partial != last_partial:
+                    # Held from the next chunk on: a new word resets the count
+                    last_partial = partial
+                    stable = 0
+                    self.partials += 1
+                    if partial_callback:
+                        partial_callback(partial)
+                else:
+                    stable += len(payload)
+                if fired_at is None and stable >= stable_needed and self._is_command(partial):
+                    fired_at = time.perf_counter()
+                    fired_text = partial.strip().lower()
+                    self.early += 1
+                    if callback:
+                        callback(partial)
+            elif event == "end" and active:
+                active = False
+                t0 = time.perf_counter()
+                text = recognizer.finish()
+                if payload is None:
+                    continue  # too short or broken by dropped audio
+                if fired_at is not None:
+                    # Already answered from the partial; record how far ahead of the speech end it was
+                    if payload.speech_end_at is not None:
+                        self._latencies["early_lead"].append(payload.speech_end_at - fired_at)
+                    if not text or text.strip().lower() == fired_text:
+                        self.recognized += 1
+                        continue
+                    # The pilot kept talking ("help me understand why..."): the full sentence goes out too
+                    self.early_corrected += 1
+                self._deliver(payload, text, t0, callback)
+
+    def _is_command(self, text):
+        return text.strip().lower() in self.early_commands
+
+    def _deliver(self, utterance, text, t0, callback):
+        t1 = time.perf_counter()
+        self._latencies["recognize"].append(t1 - t0)
+        if utterance.speech_end_at is not None:
+            self._latencies["end_detect"].append(utterance.detected_at - utterance.speech_end_at)
+            self._latencies["end_to_text"].append(t1 - utterance.speech_end_at)
+        if not text:
+            self.no_text += 1
+            return
+        self.recognized += 1
+        if callback:
+            callback(text)
+
     def stop_listening(self):
         self._listening = False
+        if self.stream is not None:
+            self.stream.stop()
+
+    def stats(self):
+        """Utterance-end-to-text latency (ms) and audio loss counters."""
+        latency = {}
+        for name, values in self._latencies.items():
+            ms = 1000.0 * np.asarray(values, dtype=np.float64)
+            latency[name] = {
+                "count": len(ms),
+                "mean_ms": float(ms.mean()) if len(ms) else 0.0,
+                "p50_ms": float(np.percentile(ms, 50)) if len(ms) else 0.0,
+                "p95_ms": float(np.percentile(ms, 95)) if len(ms) else 0.0,
+            }
+        return {
+            "mode": "streaming" if self.stream is not None else "per-phrase",
+            "recognizer": self.recognizer.name,
+            "recognized": self.recognized,
+            "no_text": self.no_text,
+            "partials": self.partials,
+            "early_commands": self.early,
+            "early_corrected": self.early_corrected,
+            "latency": latency,
+            "stream": self.stream.stats() if self.stream is not None else None,
+        }
@@ -7,6 +7,7 @@ import os
 import asyncio
 import threading
 import tempfile
+import time
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 import config
 
@@ -37,11 +38,17 @@ def _run_async(coro):
 
 
 class TextToSpeech:
-    """Speak text with Jarvis-style voice."""
+    """
+    Speak text with Jarvis-style voice. speak() blocks; JarvisService instead awaits
+    synthesize() on its event loop and runs play() on its single audio thread, and
+    stop() cuts a line short when a combat callout preempts it.
+    """
 
     def __init__(self, voice=None):
         self.voice = voice or config.JARVIS_TTS_VOICE
         self._engine = None
+        self._mixer = None
+        self._stop = threading.Event()
         if PYTTSX_AVAILABLE and not EDGE_AVAILABLE:
             try:
                 self._engine = pyttsx3.init()
@@ -53,44 +60,74 @@ class TextToSpeech:
         """Synchronous speak (blocks until done or async in thread)."""
         if not text or not text.strip():
             return
+        path = None
         if EDGE_AVAILABLE:
-            self._speak_edge(text)
-        elif self._engine:
-            self._engine.say(text)
-            self._engine.runAndWait()
-        else:
-            print(f"[Jarvis] {text}")
+            try:
+                path = _run_async(self.synthesize(text))
+            except Exception:
+                path = None
+        self.play(text, path)
 
-    def _speak_edge(self, text):
-        async def _do():
-            communicate = edge_tts.Communicate(text, self.voice)
-            fd, path = tempfile.mkstemp(suffix=".mp3")
-            os.close(fd)
-            await communicate.save(path)
-            return path
+    async def synthesize(self, text):
+        """Edge TTS to a temporary mp3; None when Edge TTS is unavailable (play() then speaks the text)."""
+        if not EDGE_AVAILABLE:
+            return None
+        communicate = edge_tts.Communicate(text, self.voice)
+        fd, path = tempfile.mkstemp(suffix=".mp3")
+        os.close(fd)
         try:
-            path = _run_async(_do())
+            await communicate.save(path)
+        except BaseException:
+            _unlink(path)
+            raise
+        return path
+
+    def play(self, text, path=None):
+        """Blocking playback of a synthesized file (deleted afterwards), else pyttsx3 or print."""
+        self._stop.clear()
+        if path is not None:
             try:
-                from pygame import mixer
-                mixer.init()
+                mixer = self._get_mixer()
                 mixer.music.load(path)
                 mixer.music.play()
-                while mixer.music.get_busy():
-                    pass
+                while mixer.music.get_busy() and not self._stop.is_set():
+                    time.sleep(0.02)
+                mixer.music.stop()
+                return
             except Exception:
                 pass
+            finally:
+                _unlink(path)
+        if self._engine:
+            self._engine.say(text)
+            self._engine.runAndWait()
+        else:
+            print(f"[Jarvis] {text}")
+
+    def stop(self):
+        """Interrupt play() (from another thread)."""
+        self._stop.set()
+        if self._engine:
             try:
-                os.unlink(path)
+                self._engine.stop()
             except Exception:
                 pass
-        except Exception:
-            if self._engine:
-                self._engine.say(text)
-                self._engine.runAndWait()
-            else:
-                print(f"[Jarvis] {text}")
+
+    def _get_mixer(self):
+        if self._mixer is None:
+            from pygame import mixer
+            mixer.init()
+            self._mixer = mixer
+        return self._mixer
 
     def speak_async(self, text):
         """Non-blocking: run speak in a thread."""
         t = threading.Thread(target=self.speak, args=(text,), daemon=True)
         t.start()
+
+
+def _unlink(path):
+    try:
+        os.unlink(path)
+    except Exception:
+        pass
@@ -1,50 +1,51 @@
 """
 Jarvis voice assistant: ties STT, conversation, and TTS for game commentary.
+Known commands (status, health, pause, ...) are answered locally by the intent
+matcher; only open-ended speech goes to the LLM. All of that runs on the
+JarvisService event loop (service.py); callers only post events.
 """
 
 import sys
 import os
-import threading
-import queue
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 import config
 from .speech_to_text import SpeechToText
 from .text_to_speech import TextToSpeech
 from .conversation import JarvisConversation
+from .intents import IntentMatcher
+from .service import JarvisService, CHAT
 
 
 class JarvisVoiceAssistant:
     """Full conversational Jarvis: listen, respond via LLM, speak."""
 
-    def __init__(self, game_state_callback=None):
+    def __init__(self, game_state_callback=None, profiler=None, action_callback=None):
         self.game_state_callback = game_state_callback  # () -> (health, energy, score, wave)
+        self.action_callback = action_callback  # (action) for voice commands such as "pause"
+        self.profiler = profiler  # optional FrameProfiler; responses are traced as jarvis.*
         self.stt = SpeechToText(language=config.JARVIS_STT_LANGUAGE, use_whisper=bool(config.OPENAI_API_KEY))
         self.tts = TextToSpeech(voice=config.JARVIS_TTS_VOICE)
         self.conversation = JarvisConversation()
+        self.intents = IntentMatcher()
+        self.service = JarvisService(
+            self.conversation, self.tts, intents=self.intents, state_callback=game_state_callback,
+            action_callback=action_callback, profiler=profiler,
+        )
+        self.service.start()
+        self.service.prefetch_wave(1)
         self._listening = False
         self._thread = None
-        self._response_queue = queue.Queue()
 
-    def say(self, text, async_=True):
-        """Have Jarvis speak (optionally non-blocking)."""
+    def say(self, text, async_=True, priority=CHAT):
+        """Have Jarvis speak: queued on the service, or blocking with async_=False."""
         if async_:
-            self.tts.speak_async(text)
+            self.service.say(text, priority)
         else:
             self.tts.speak(text)
 
     def on_voice_input(self, text):
-        """Called when user speech is recognized."""
-        if not text or not text.strip():
-            return
-        health, energy, score, wave = 100, 100, 0, 1
-        if self.game_state_callback:
-            try:
-                health, energy, score, wave = self.game_state_callback()
-            except Exception:
-                pass
-        response = self.conversation.respond(text, health=health, energy=energy, score=score, wave=wave)
-        if response:
-            self.say(response, async_=True)
+        """Called when user speech is recognized (on the STT thread); only posts it to the service."""
+        self.service.voice_input(text)
 
     def start_listening(self):
         """Start background voice listener."""
@@ -57,7 +58,21 @@ class JarvisVoiceAssistant:
         self._listening = False
         self.stt.stop_listening()
 
+    def stop(self):
+        """Stop listening and shut the service loop down."""
+        self.stop_listening()
+        self.service.stop()
+
     def wave_started(self, wave):
-        """Optional: Jarvis announces new wave."""
-        line = self.conversation.commentary_wave_start(wave)
-        self.say(line, async_=True)
+        """Jarvis announces the new wave (posts a combat callout; returns immediately)."""
+        self.service.wave_started(wave)
+
+    def stats(self):
+        """Intent hit rates and latency histograms, reply cache metrics, speech queue and input stats."""
+        cache = self.conversation.cache
+        return {
+            "intents": self.intents.stats.stats(),
+            "cache": cache.stats() if cache is not None else None,
+            "service": self.service.stats(),
+            "stt": self.stt.stats(),
+        }
@@ -1,12 +1,35 @@
-from .camera import CameraCapture
-from .hand_tracker import HandTracker
-from .gesture_detector import GestureDetector, HandState
-from .yolo_detector import YOLODetector
-
-__all__ = [
-    "CameraCapture",
-    "HandTracker",
-    "GestureDetector",
-    "HandState",
-    "YOLODetector",
-]
+"""
+Vision package. Submodules load on first attribute access, so importing
+src.vision.gesture_detector (NumPy only) does not pull in OpenCV, MediaPipe or
+YOLO; the vision startup task imports those off the main thread.
+"""
+
+import importlib
+
+_EXPORTS = {
+    "CameraCapture": ".camera",
+    "HandTracker": ".hand_tracker",
+    "GestureDetector": ".gesture_detector",
+    "HandState": ".gesture_detector",
+    "YOLODetector": ".yolo_detector",
+    "DetectionScheduler": ".detection_tracker",
+    "IoUTracker": ".detection_tracker",
+    "VisionWorker": ".vision_worker",
+    "GestureSnapshot": ".vision_worker",
+    "MultiModelExecutor": ".model_executor",
+    "LandmarkRecorder": ".recording",
+    "ReplayCapture": ".recording",
+    "ReplayHandsBackend": ".recording",
+    "load_recording": ".recording",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
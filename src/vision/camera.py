@@ -1,5 +1,8 @@
 """
 Threaded webcam capture for hand tracking and optional YOLO overlay.
+Frames are decoded straight into a preallocated ring of NumPy buffers, so the
+capture thread does not allocate per frame and consumers can borrow the newest
+frame as a read-only view without copying.
 """
 
 import threading
@@ -15,45 +18,105 @@ import config
 class CameraCapture:
     """Threaded camera capture; provides latest frame for vision pipeline."""
 
-    def __init__(self, camera_index=None, width=None, height=None):
+    def __init__(self, camera_index=None, width=None, height=None, ring_size=None, source=None):
         self.camera_index = camera_index if camera_index is not None else config.CAMERA_INDEX
         self.width = width or config.CAMERA_WIDTH
         self.height = height or config.CAMERA_HEIGHT
+        # A ring of N slots keeps a borrowed view intact for N-1 further captures
+        self.ring_size = max(2, ring_size or config.CAMERA_RING_SIZE)
+        self._source = source  # anything with cv2.VideoCapture's read/isOpened/set/release
         self._cap = None
-        self._frame = None
+        self._ring = []
+        self._views = []
+        self._stamps = [0.0] * self.ring_size  # capture time (perf_counter) per slot
+        self._seq = 0  # sequence number of the newest published frame (0 = none yet)
         self._lock = threading.Lock()
         self._running = False
         self._thread = None
 
-    def start(self):
-        self._cap = cv2.VideoCapture(self.camera_index)
+    def open(self):
+        """Open the source and allocate the ring without starting the capture thread."""
+        self._cap = self._source if self._source is not None else cv2.VideoCapture(self.camera_index)
         if not self._cap.isOpened():
             raise RuntimeError("Could not open camera")
         self._cap.set(cv2.CAP_PROP_FRAME_WIDTH, self.width)
         self._cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.height)
+        self._alloc_ring((self.height, self.width, 3))
+
+    def start(self):
+        self.open()
         self._running = True
         self._thread = threading.Thread(target=self._capture_loop, daemon=True)
         self._thread.start()
         # Wait for first frame
         for _ in range(30):
-            with self._lock:
-                if self._frame is not None:
-                    break
+            if self._seq:
+                break
             time.sleep(0.05)
 
+    def _alloc_ring(self, shape, dtype=np.uint8):
+        ring = [np.empty(shape, dtype=dtype) for _ in range(self.ring_size)]
+        views = []
+        for buf in ring:
+            v = buf.view()
+            v.flags.writeable = False
+            views.append(v)
+        with self._lock:
+            self._ring = ring
+            self._views = views
+
+    def grab(self):
+        """
+        Decode one frame into the next ring slot and publish it. Returns False if the read failed.
+        Called by the capture thread; after open() it can also drive capture synchronously.
+        """
+        seq = self._seq + 1
+        slot = seq % self.ring_size
+        buf = self._ring[slot]
+        ret, frame = self._cap.read(image=buf)
+        if not ret or frame is None:
+            return False
+        if frame is not buf:
+            # Driver ignored the requested size (or the buffer): adopt the real shape once
+            if frame.shape != buf.shape or frame.dtype != buf.dtype:
+                self._alloc_ring(frame.shape, frame.dtype)
+                buf = self._ring[slot]
+            np.copyto(buf, frame)
+        self._stamps[slot] = time.perf_counter()
+        # Publishing is a single int store; readers index the ring by it
+        self._seq = seq
+        return True
+
     def _capture_loop(self):
         while self._running and self._cap and self._cap.isOpened():
-            ret, frame = self._cap.read()
-            if ret:
-                with self._lock:
-                    self._frame = frame.copy()
-            else:
+            if not self.grab():
                 time.sleep(0.02)
 
+    @property
+    def seq(self):
+        """Sequence number of the newest frame (monotonic; 0 before the first frame)."""
+        return self._seq
+
+    def borrow(self):
+        """
+        Return (frame_view, seq, capture_time) for the newest frame without copying,
+        or (None, 0, 0.0). The view is read-only and stays valid until ring_size - 1
+        newer frames are captured; check is_valid(seq) after use or copy it to keep it.
+        """
+        seq = self._seq
+        if not seq:
+            return None, 0, 0.0
+        slot = seq % self.ring_size
+        return self._views[slot], seq, self._stamps[slot]
+
+    def is_valid(self, seq):
+        """True while the slot for frame seq has not been reused by the capture thread."""
+        return seq > 0 and self._seq - seq < self.ring_size - 1
+
     def read(self):
-        """Return latest BGR frame or None."""
-        with self._lock:
-            return self._frame.copy() if self._frame is not None else None
+        """Return latest BGR frame or None (an owned copy; see borrow() for zero-copy)."""
+        frame, _, _ = self.borrow()
+        return frame.copy() if frame is not None else None
 
     def stop(self):
         self._running = False
@@ -0,0 +1,193 @@
+"""
+Frame-skipping YOLO scheduling with cheap temporal tracking.
+DetectionScheduler runs full YOLO inference only every Nth frame (fixed, or
+adapted from measured inference latency against a per-frame CPU budget) and
+IoUTracker carries boxes between runs with IoU association and constant-velocity
+prediction, so the overlay gets stable boxes with persistent IDs every frame.
+"""
+
+import math
+import time
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+import config
+
+import numpy as np
+from .yolo_detector import DETECTION_DTYPE
+
+TRACK_DTYPE = np.dtype(DETECTION_DTYPE.descr + [("track_id", np.int32)])
+
+
+def iou_matrix(a, b):
+    """Pairwise IoU between (N, 4) and (M, 4) xyxy boxes."""
+    if len(a) == 0 or len(b) == 0:
+        return np.zeros((len(a), len(b)), dtype=np.float32)
+    x1 = np.maximum(a[:, None, 0], b[None, :, 0])
+    y1 = np.maximum(a[:, None, 1], b[None, :, 1])
+    x2 = np.minimum(a[:, None, 2], b[None, :, 2])
+    y2 = np.minimum(a[:, None, 3], b[None, :, 3])
+    inter = np.clip(x2 - x1, 0, None) * np.clip(y2 - y1, 0, None)
+    area_a = (a[:, 2] - a[:, 0]) * (a[:, 3] - a[:, 1])
+    area_b = (b[:, 2] - b[:, 0]) * (b[:, 3] - b[:, 1])
+    return inter / np.maximum(area_a[:, None] + area_b[None, :] - inter, 1e-9)
+
+
+def _boxes(detections):
+    return np.stack([detections["x1"], detections["y1"], detections["x2"], detections["y2"]], axis=1).astype(np.float32)
+
+
+class IoUTracker:
+    """Greedy IoU association with constant-velocity box prediction; tracks are kept as parallel arrays."""
+
+    def __init__(self, iou_threshold=None, max_misses=None, velocity_smoothing=0.5):
+        self.iou_threshold = config.YOLO_TRACK_IOU if iou_threshold is None else iou_threshold
+        self.max_misses = config.YOLO_TRACK_MAX_MISSES if max_misses is None else max_misses
+        self.velocity_smoothing = velocity_smoothing
+        self._next_id = 1
+        self.boxes = np.empty((0, 4), dtype=np.float32)
+        self.velocity = np.empty((0, 4), dtype=np.float32)  # px per second, per box edge
+        self.class_id = np.empty(0, dtype=np.int32)
+        self.confidence = np.empty(0, dtype=np.float32)
+        self.ids = np.empty(0, dtype=np.int32)
+        self.misses = np.empty(0, dtype=np.int32)
+        self._time = None
+
+    def predict(self, t):
+        """Boxes advanced to time t (does not change track state)."""
+        if self._time is None or len(self.boxes) == 0:
+            return self.boxes
+        return self.boxes + self.velocity * (t - self._time)
+
+    def update(self, detections, t):
+        """Associate a DETECTION_DTYPE array observed at time t; returns the tracks as TRACK_DTYPE."""
+        det_boxes = _boxes(detections) if len(detections) else np.empty((0, 4), dtype=np.float32)
+        predicted = self.predict(t)
+        dt = (t - self._time) if self._time is not None else 0.0
+        iou = iou_matrix(predicted, det_boxes)
+        matched_tracks, matched_dets = [], []
+        if iou.size:
+            # Greedy: best remaining pair first, same-class only
+            iou = np.where(self.class_id[:, None] == detections["class_id"][None, :], iou, 0.0)
+            order = np.argsort(iou, axis=None)[::-1]
+            used_t, used_d = set(), set()
+            for flat in order:
+                ti, di = divmod(int(flat), iou.shape[1])
+                if iou[ti, di] < self.iou_threshold:
+                    break
+                if ti in used_t or di in used_d:
+                    continue
+                used_t.add(ti)
+                used_d.add(di)
+                matched_tracks.append(ti)
+                matched_dets.append(di)
+        mt = np.array(matched_tracks, dtype=np.intp)
+        md = np.array(matched_dets, dtype=np.intp)
+        if len(mt):
+            if dt > 1e-6:
+                measured = (det_boxes[md] - self.boxes[mt]) / dt
+                a = self.velocity_smoothing
+                self.velocity[mt] = a * measured + (1 - a) * self.velocity[mt]
+            self.boxes[mt] = det_boxes[md]
+            self.confidence[mt] = detections["confidence"][md]
+            self.misses[mt] = 0
+        # Unmatched tracks coast on their prediction and age out
+        unmatched = np.ones(len(self.boxes), dtype=bool)
+        unmatched[mt] = False
+        self.boxes[unmatched] = predicted[unmatched]
+        self.misses[unmatched] += 1
+        keep = self.misses <= self.max_misses
+        self._select(keep)
+        # Unmatched detections start new tracks
+        new = np.ones(len(det_boxes), dtype=bool)
+        new[md] = False
+        n_new = int(new.sum())
+        if n_new:
+            self.boxes = np.concatenate([self.boxes, det_boxes[new]])
+            self.velocity = np.concatenate([self.velocity, np.zeros((n_new, 4), dtype=np.float32)])
+            self.class_id = np.concatenate([self.class_id, detections["class_id"][new]])
+            self.confidence = np.concatenate([self.confidence, detections["confidence"][new]])
+            self.ids = np.concatenate([self.ids, np.arange(self._next_id, self._next_id + n_new, dtype=np.int32)])
+            self.misses = np.concatenate([self.misses, np.zeros(n_new, dtype=np.int32)])
+            self._next_id += n_new
+        self._time = t
+        return self.as_array(self.boxes)
+
+    def _select(self, mask):
+        self.boxes = self.boxes[mask]
+        self.velocity = self.velocity[mask]
+        self.class_id = self.class_id[mask]
+        self.confidence = self.confidence[mask]
+        self.ids = self.ids[mask]
+        self.misses = self.misses[mask]
+
+    def as_array(self, boxes):
+        out = np.empty(len(boxes), dtype=TRACK_DTYPE)
+        out["x1"], out["y1"], out["x2"], out["y2"] = boxes[:, 0], boxes[:, 1], boxes[:, 2], boxes[:, 3]
+        out["class_id"] = self.class_id
+        out["confidence"] = self.confidence
+        out["track_id"] = self.ids
+        return out
+
+    def __len__(self):
+        return len(self.ids)
+
+
+class DetectionScheduler:
+    """
+    Runs YOLODetector every Nth frame and tracks boxes in between.
+    every_n > 0 fixes the interval; every_n == 0 adapts it so the amortized
+    inference cost stays within cpu_budget_ms per frame.
+    """
+
+    def __init__(self, detector, every_n=None, cpu_budget_ms=None, tracker=None, max_interval=30):
+        self.detector = detector
+        self.every_n = config.YOLO_DETECT_EVERY_N if every_n is None else every_n
+        self.cpu_budget_ms = config.YOLO_CPU_BUDGET_MS if cpu_budget_ms is None else cpu_budget_ms
+        self.tracker = tracker or IoUTracker()
+        self.max_interval = max_interval
+        self._frames = 0
+        self._inferences = 0
+        self._since_inference = None
+        self._infer_ms = None  # EMA of measured inference latency
+        self._total_infer_ms = 0.0
+
+    def set_cpu_budget(self, ms):
+        """Target average inference cost per frame (ms) for adaptive scheduling."""
+        self.cpu_budget_ms = ms
+
+    @property
+    def interval(self):
+        """Frames between inferences currently in effect."""
+        if self.every_n > 0:
+            return self.every_n
+        if self._infer_ms is None or self.cpu_budget_ms <= 0:
+            return 1
+        return max(1, min(self.max_interval, math.ceil(self._infer_ms / self.cpu_budget_ms)))
+
+    def process(self, frame_bgr, t=None):
+        """Detections for this frame as a TRACK_DTYPE array (fresh or propagated)."""
+        t = time.perf_counter() if t is None else t
+        self._frames += 1
+        if self._since_inference is None or self._since_inference + 1 >= self.interval:
+            t0 = time.perf_counter()
+            detections = self.detector.detect_array(frame_bgr)
+            ms = 1000.0 * (time.perf_counter() - t0)
+            self._infer_ms = ms if self._infer_ms is None else 0.8 * self._infer_ms + 0.2 * ms
+            self._total_infer_ms += ms
+            self._inferences += 1
+            self._since_inference = 0
+            return self.tracker.update(detections, t)
+        self._since_inference += 1
+        return self.tracker.as_array(self.tracker.predict(t))
+
+    def stats(self):
+        return {
+            "frames": self._frames,
+            "inferences": self._inferences,
+            "interval": self.interval,
+            "inference_ms": self._infer_ms or 0.0,
+            "amortized_ms_per_frame": self._total_infer_ms / self._frames if self._frames else 0.0,
+            "cpu_budget_ms": self.cpu_budget_ms,
+            "tracks": len(self.tracker),
+        }
@@ -5,7 +5,9 @@ Open palm = aim, pull back = charge, release = fire, closed fist = recharge.
 
 from enum import Enum
 from collections import deque
+from operator import itemgetter
 import time
+import numpy as np
 
 
 class HandState(Enum):
@@ -16,11 +18,145 @@ class HandState(Enum):
     RECHARGING = 4
 
 
+# Member lookups on an Enum class cost ~0.15 us each; the per-frame paths use these
+_IDLE, _AIMING, _CHARGING, _FIRING, _RECHARGING = HandState
+
+NUM_LANDMARKS = 21
+# MediaPipe indices: finger tips are compared with the PIP joint below them
+FINGER_TIPS = (8, 12, 16, 20)
+FINGER_PIPS = (6, 10, 14, 18)
+THUMB_TIP, THUMB_IP = 4, 3
+WRIST, MIDDLE_MCP = 0, 9
+THUMB_SPREAD = 0.05
+
+
+def _feature_matrix():
+    """
+    (63, 9) projection from flattened landmarks to the linear gesture features:
+    4 finger curls (tip.y - pip.y), thumb dy, thumb dx, aim x, aim y, wrist z.
+    """
+    m = np.zeros((NUM_LANDMARKS * 3, 9), dtype=np.float32)
+    for col, (tip, pip) in enumerate(zip(FINGER_TIPS, FINGER_PIPS)):
+        m[tip * 3 + 1, col] = 1.0
+        m[pip * 3 + 1, col] = -1.0
+    m[THUMB_TIP * 3 + 1, 4], m[THUMB_IP * 3 + 1, 4] = 1.0, -1.0
+    m[THUMB_TIP * 3, 5], m[THUMB_IP * 3, 5] = 1.0, -1.0
+    m[WRIST * 3, 6] = m[MIDDLE_MCP * 3, 6] = 0.5
+    m[WRIST * 3 + 1, 7] = m[MIDDLE_MCP * 3 + 1, 7] = 0.5
+    m[WRIST * 3 + 2, 8] = 1.0
+    return m
+
+
+FEATURE_MATRIX = _feature_matrix()
+# The landmarks the features read, picked in one call per live frame: the x of the
+# first four, the y of all twelve and the wrist z (see project_landmark_objects)
+FEATURE_LANDMARKS = (WRIST, THUMB_IP, THUMB_TIP, MIDDLE_MCP) + FINGER_PIPS + FINGER_TIPS
+_pick_feature_landmarks = itemgetter(*FEATURE_LANDMARKS)
+
+
+def _compact_matrix():
+    """(17, 9) rows of FEATURE_MATRIX in project_landmark_objects' coordinate order."""
+    rows = [i * 3 for i in FEATURE_LANDMARKS[:4]] + [i * 3 + 1 for i in FEATURE_LANDMARKS] + [WRIST * 3 + 2]
+    if np.delete(FEATURE_MATRIX, rows, axis=0).any():
+        raise ValueError("FEATURE_MATRIX reads a coordinate project_landmark_objects does not gather")
+    return FEATURE_MATRIX[rows].astype(np.float64)
+
+
+COMPACT_MATRIX = _compact_matrix()
+
+
+def landmarks_to_array(multi_hand_landmarks, out=None):
+    """
+    Convert hands to one (hands, 21, 3) float32 array in a single pass.
+    Each hand may be a MediaPipe NormalizedLandmarkList, a list of objects with
+    .x .y .z, a list of (x, y, z) tuples, or an array already in that shape.
+    out: optional preallocated array with at least len(multi_hand_landmarks) rows.
+    """
+    n = len(multi_hand_landmarks)
+    if out is None or out.shape[0] < n:
+        out = np.empty((n, NUM_LANDMARKS, 3), dtype=np.float32)
+    out = out[:n]
+    if n == 0:
+        return out
+    first = multi_hand_landmarks[0]
+    first = first.landmark if hasattr(first, "landmark") else first
+    if not isinstance(first, np.ndarray) and hasattr(first[0], "x"):
+        # Landmark objects: one flat list of every coordinate, one buffer write
+        coords = []
+        extend = coords.extend
+        for hand in multi_hand_landmarks:
+            for p in (hand.landmark if hasattr(hand, "landmark") else hand)[:NUM_LANDMARKS]:
+                extend((p.x, p.y, p.z))
+        out.reshape(-1)[:] = coords
+        return out
+    for i, hand in enumerate(multi_hand_landmarks):
+        pts = hand.landmark if hasattr(hand, "landmark") else hand
+        out[i] = np.asarray(pts, dtype=np.float32)[:NUM_LANDMARKS, :3]
+    return out
+
+
+def project_features(hands):
+    """(hands, 9) linear features for a (hands, 21, 3) array in one matrix product."""
+    return hands.reshape(len(hands), -1) @ FEATURE_MATRIX
+
+
+def projection_buffers(hands):
+    """Reusable (flat coords, coords rows, features) arrays for project_landmark_objects."""
+    flat = np.empty(hands * len(COMPACT_MATRIX))
+    return flat, flat.reshape(hands, -1), np.empty((hands, FEATURE_MATRIX.shape[1]))
+
+
+def project_landmark_objects(multi_hand_landmarks, buffers=None):
+    """
+    (hands, 9) features straight from MediaPipe landmark objects: only the
+    coordinates FEATURE_MATRIX uses are read, then one product with COMPACT_MATRIX.
+    buffers: optional projection_buffers(len(multi_hand_landmarks)), filled in place.
+    """
+    coords = []
+    for hand in multi_hand_landmarks:
+        # Unpacked by name and read into one tuple: ~3x faster than a comprehension per axis
+        (wrist, thumb_ip, thumb_tip, mid_mcp, pip1, pip2, pip3, pip4,
+         tip1, tip2, tip3, tip4) = _pick_feature_landmarks(getattr(hand, "landmark", hand))
+        coords += (
+            wrist.x, thumb_ip.x, thumb_tip.x, mid_mcp.x,
+            wrist.y, thumb_ip.y, thumb_tip.y, mid_mcp.y, pip1.y, pip2.y, pip3.y, pip4.y,
+            tip1.y, tip2.y, tip3.y, tip4.y,
+            wrist.z,
+        )
+    if buffers is None:
+        return np.array(coords).reshape(len(multi_hand_landmarks), -1).dot(COMPACT_MATRIX)
+    flat, rows, out = buffers
+    flat[:] = coords
+    return np.dot(rows, COMPACT_MATRIX, out=out)
+
+
+def classify(c0, c1, c2, c3, thumb_dy, thumb_dx):
+    """
+    The open-palm / fist rule on finger curls (< 0 extended, > 0 curled; image y
+    grows downward) and thumb offsets. Written with & | so it takes Python floats
+    or NumPy columns alike. Returns (is_open, is_fist).
+    """
+    is_open = ((c0 < 0) & (c1 < 0) & (c2 < 0) & (c3 < 0)) | (thumb_dy < 0) | (abs(thumb_dx) > THUMB_SPREAD)
+    is_fist = (c0 > 0) & (c1 > 0) & (c2 > 0) & (c3 > 0)
+    return is_open, is_fist
+
+
+def hand_features(hands):
+    """
+    Batched gesture features for a (hands, 21, 3) array.
+    Returns (aim (hands, 2), z (hands,), is_open (hands,), is_fist (hands,)).
+    """
+    f = project_features(hands)
+    is_open, is_fist = classify(*f[:, :6].T)
+    return f[:, 6:8], f[:, 8], is_open, is_fist
+
+
 class HandGestureState:
     """State for one hand (left or right)."""
 
-    def __init__(self, pull_back_threshold=0.03, smoothing=0.2, charge_frames=3):
-        self.state = HandState.IDLE
+    def __init__(self, pull_back_threshold=0.03, smoothing=0.2, charge_frames=3, clock=None):
+        self.state = _IDLE
+        self._clock = clock or time.perf_counter  # injectable for replays and headless runs
         self.pull_back_threshold = pull_back_threshold
         self.smoothing = smoothing
         self.charge_frames = charge_frames
@@ -28,105 +164,63 @@ class HandGestureState:
         self._aim_pos = (0.5, 0.5)  # normalized x, y
         self._last_fire_time = 0.0
         self._fire_cooldown = 0.15
+        self.fires = 0  # shots so far; a new shot is a change in this count, not a FIRING state
         self._was_charging = False
 
-    def _point(self, landmarks, i):
-        p = landmarks[i]
-        if hasattr(p, "x"):
-            return (p.x, p.y, p.z)
-        return p
-
     def update(self, landmarks, handedness="Right"):
         """
         Update state from MediaPipe hand landmarks.
         landmarks: list of 21 (x, y, z) or objects with .x .y .z
         """
-        if not landmarks or len(landmarks) < 21:
-            self.state = HandState.IDLE
+        if landmarks is None or len(landmarks) < NUM_LANDMARKS:
+            self.state = _IDLE
             return
-        wrist = self._point(landmarks, 0)
-        mid_mcp = self._point(landmarks, 9)
-        x = (wrist[0] + mid_mcp[0]) / 2
-        y = (wrist[1] + mid_mcp[1]) / 2
-        z = wrist[2]
-        self._z_history.append((time.perf_counter(), z))
+        c0, c1, c2, c3, thumb_dy, thumb_dx, x, y, z = project_features(landmarks_to_array([landmarks]))[0].tolist()
+        self.update_features(x, y, z, *classify(c0, c1, c2, c3, thumb_dy, thumb_dx))
+
+    def update_features(self, x, y, z, is_open, is_fist):
+        """Update state from precomputed features (see hand_features)."""
+        now = self._clock()
+        history = self._z_history
+        history.append((now, z))
         # Smooth aim position
-        self._aim_pos = (
-            self._aim_pos[0] * (1 - self.smoothing) + x * self.smoothing,
-            self._aim_pos[1] * (1 - self.smoothing) + y * self.smoothing,
-        )
-        is_open = self._is_open_palm(landmarks)
-        is_fist = self._is_closed_fist(landmarks)
+        s = self.smoothing
+        k = 1 - s
+        ax, ay = self._aim_pos
+        self._aim_pos = (ax * k + x * s, ay * k + y * s)
         if is_fist:
-            self.state = HandState.RECHARGING
+            self.state = _RECHARGING
             self._was_charging = False
             return
         if not is_open:
-            self.state = HandState.IDLE
+            self.state = _IDLE
             self._was_charging = False
             return
         # Open palm: check for pull-back then release (fire)
-        z_velocity = self._z_velocity()
-        now = time.perf_counter()
         if now - self._last_fire_time < self._fire_cooldown:
-            self.state = HandState.AIMING
+            self.state = _AIMING
             return
-        if z_velocity > self.pull_back_threshold:
+        # z velocity over the history window (pull-back > 0, push forward < 0)
+        z_velocity = 0.0
+        if len(history) >= 5:
+            t0, z0 = history[0]
+            dt = now - t0
+            if dt >= 1e-6:
+                z_velocity = (z - z0) / dt
+        threshold = self.pull_back_threshold
+        if z_velocity > threshold:
             self._was_charging = True
-            self.state = HandState.CHARGING
-        elif self._was_charging and z_velocity < -self.pull_back_threshold:
-            self.state = HandState.FIRING
+            self.state = _CHARGING
+        elif self._was_charging and z_velocity < -threshold:
+            self.state = _FIRING
             self._last_fire_time = now
+            self.fires += 1
             self._was_charging = False
         else:
-            self.state = HandState.AIMING
-            if abs(z_velocity) < self.pull_back_threshold * 0.5:
+            self.state = _AIMING
+            if abs(z_velocity) < threshold * 0.5:
                 self._was_charging = False
 
-    def _z_velocity(self):
-        if len(self._z_history) < 5:
-            return 0.0
-        t0, z0 = self._z_history[0]
-        t1, z1 = self._z_history[-1]
-        dt = t1 - t0
-        if dt < 1e-6:
-            return 0.0
-        return (z1 - z0) / dt
-
-    def _is_open_palm(self, landmarks):
-        """True if fingers are extended (open palm)."""
-        try:
-            p4, p3 = self._point(landmarks, 4), self._point(landmarks, 3)
-            p8, p6 = self._point(landmarks, 8), self._point(landmarks, 6)
-            p12, p10 = self._point(landmarks, 12), self._point(landmarks, 10)
-            p16, p14 = self._point(landmarks, 16), self._point(landmarks, 14)
-            p20, p18 = self._point(landmarks, 20), self._point(landmarks, 18)
-            thumb_open = p4[1] < p3[1] or abs(p4[0] - p3[0]) > 0.05
-            index_open = p8[1] < p6[1]
-            middle_open = p12[1] < p10[1]
-            ring_open = p16[1] < p14[1]
-            pinky_open = p20[1] < p18[1]
-            return (index_open and middle_open and ring_open and pinky_open) or thumb_open
-        except (IndexError, AttributeError):
-            return False
-
-    def _is_closed_fist(self, landmarks):
-        """True if all fingers are curled (fist)."""
-        try:
-            p8, p6 = self._point(landmarks, 8), self._point(landmarks, 6)
-            p12, p10 = self._point(landmarks, 12), self._point(landmarks, 10)
-            p16, p14 = self._point(landmarks, 16), self._point(landmarks, 14)
-            p20, p18 = self._point(landmarks, 20), self._point(landmarks, 18)
-            p4, p2 = self._point(landmarks, 4), self._point(landmarks, 2)
-            index_curled = p8[1] > p6[1]
-            middle_curled = p12[1] > p10[1]
-            ring_curled = p16[1] > p14[1]
-            pinky_curled = p20[1] > p18[1]
-            thumb_curled = abs(p4[0] - p2[0]) < 0.08 and p4[1] > p2[1]
-            return index_curled and middle_curled and ring_curled and pinky_curled
-        except (IndexError, AttributeError):
-            return False
-
     @property
     def aim_position(self):
         """Normalized (x, y) in [0,1] for screen mapping."""
@@ -136,30 +230,82 @@ class HandGestureState:
 class GestureDetector:
     """Dual-hand gesture detector for repulsor control."""
 
-    def __init__(self, pull_back_threshold=0.03, smoothing=0.2):
-        self.left = HandGestureState(pull_back_threshold, smoothing)
-        self.right = HandGestureState(pull_back_threshold, smoothing)
+    def __init__(self, pull_back_threshold=0.03, smoothing=0.2, clock=None):
+        self.left = HandGestureState(pull_back_threshold, smoothing, clock=clock)
+        self.right = HandGestureState(pull_back_threshold, smoothing, clock=clock)
+        self._last_seq = None
+        self._updates = 0
+        self._skipped = 0
+        self._buffers = {}  # hand count -> projection_buffers, reused every frame
 
-    def update(self, multi_hand_landmarks, multi_handedness):
+    def update(self, multi_hand_landmarks, multi_handedness, seq=None):
         """
         Update both hands from MediaPipe results.
         multi_hand_landmarks: list of 21 landmark lists
         multi_handedness: list of handedness labels ("Left", "Right")
+        seq: optional frame sequence number; a repeated seq keeps the current states.
         """
-        self.left.state = HandState.IDLE
-        self.right.state = HandState.IDLE
-        if not multi_hand_landmarks:
+        if seq is not None and seq == self._last_seq:
+            self._skipped += 1
             return
-        for landmarks, handedness in zip(multi_hand_landmarks, multi_handedness or []):
-            if hasattr(handedness, "classification") and handedness.classification:
-                label = handedness.classification[0].label
-            else:
-                label = "Right"
-            lm_list = list(landmarks.landmark) if hasattr(landmarks, "landmark") else landmarks
-            if label == "Left":
-                self.left.update(lm_list, label)
-            else:
-                self.right.update(lm_list, label)
+        self._last_seq = seq
+        self._updates += 1
+        self.left.state = _IDLE
+        self.right.state = _IDLE
+        if multi_hand_landmarks is None or len(multi_hand_landmarks) == 0:
+            return
+        labels = []
+        for handedness in multi_handedness or ():
+            try:
+                labels.append(handedness.classification[0].label)
+            except (AttributeError, IndexError):
+                labels.append(handedness if isinstance(handedness, str) else "Right")
+        # zip() semantics: hands without a handedness entry are ignored
+        n = len(labels)
+        if n >= len(multi_hand_landmarks):
+            n = len(multi_hand_landmarks)
+            hands = multi_hand_landmarks
+        elif n:
+            hands = multi_hand_landmarks[:n]
+        else:
+            return
+        buffers = self._buffers.get(n)
+        if buffers is None:
+            buffers = self._buffers[n] = projection_buffers(n)
+        try:
+            features = project_landmark_objects(hands, buffers)
+        except AttributeError:  # (x, y, z) rows or arrays rather than landmark objects
+            features = project_features(landmarks_to_array(hands))
+        self._apply(features, labels)
+
+    def update_array(self, hands, labels, seq=None):
+        """Update both hands from a (hands, 21, 3) landmark array and matching labels."""
+        if seq is not None and seq == self._last_seq:
+            self._skipped += 1
+            return
+        self._last_seq = seq
+        self._updates += 1
+        self.left.state = _IDLE
+        self.right.state = _IDLE
+        n = min(len(hands), len(labels))
+        if n:
+            self._apply(project_features(hands[:n]), labels)
+
+    def _apply(self, features, labels):
+        # features: (hands, 9) from one batched projection. With one or two rows,
+        # NumPy's per-call overhead outweighs the comparisons, so classify() runs
+        # on the rows as Python floats.
+        left, right = self.left, self.right
+        for label, (c0, c1, c2, c3, thumb_dy, thumb_dx, x, y, z) in zip(labels, features.tolist()):
+            is_open, is_fist = classify(c0, c1, c2, c3, thumb_dy, thumb_dx)
+            (left if label == "Left" else right).update_features(x, y, z, is_open, is_fist)
+
+    def stats(self):
+        """Gesture updates run vs skipped as duplicate frames."""
+        return {
+            "updates": self._updates,
+            "skipped": self._skipped,
+        }
 
     def get_left_state(self):
         return self.left.state
@@ -167,6 +313,12 @@ class GestureDetector:
     def get_right_state(self):
         return self.right.state
 
+    def get_left_fires(self):
+        return self.left.fires
+
+    def get_right_fires(self):
+        return self.right.fires
+
     def get_left_aim(self):
         return self.left.aim_position
 
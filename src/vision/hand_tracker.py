@@ -1,8 +1,14 @@
 """
 MediaPipe Hands integration for dual-hand tracking.
 Provides 21 landmarks per hand for the gesture detector.
+Optional ROI mode: once hands are locked, only a padded, downscaled crop around
+them is converted and sent to MediaPipe; landmarks are mapped back to
+full-frame normalized coordinates so the gesture detector is unaffected. Crops
+run on their own MediaPipe graph: its tracking state would be wrong for the
+full frame, and the other way round.
 """
 
+import time
 import cv2
 import numpy as np
 import sys
@@ -16,6 +22,32 @@ except ImportError:
     mp = None
 
 
+class RoiPolicy:
+    """When and how HandTracker crops around previously tracked hands."""
+
+    def __init__(self, enabled=None, padding=None, max_side=None, max_area=None, refresh_frames=None, quantum=16):
+        self.enabled = config.HAND_ROI_ENABLED if enabled is None else enabled
+        # Box grows by this fraction of its size on every side
+        self.padding = config.HAND_ROI_PADDING if padding is None else padding
+        # Longer crop side is downscaled to at most this many pixels before inference
+        self.max_side = max_side or config.HAND_ROI_MAX_SIDE
+        # Crops covering more than this fraction of the frame run full-frame instead
+        self.max_area = config.HAND_ROI_MAX_AREA if max_area is None else max_area
+        # Full-frame pass every N frames so hands entering outside the crop are found
+        self.refresh_frames = config.HAND_ROI_REFRESH_FRAMES if refresh_frames is None else refresh_frames
+        self.quantum = quantum  # crop edges snap to this grid so the input size rarely changes
+
+    def as_dict(self):
+        return {
+            "enabled": self.enabled,
+            "padding": self.padding,
+            "max_side": self.max_side,
+            "max_area": self.max_area,
+            "refresh_frames": self.refresh_frames,
+            "quantum": self.quantum,
+        }
+
+
 class HandTracker:
     """Real-time hand tracking using MediaPipe Hands."""
 
@@ -24,39 +56,177 @@ class HandTracker:
         max_num_hands=2,
         min_detection_confidence=0.6,
         min_tracking_confidence=0.5,
+        backend=None,
+        roi_policy=None,
     ):
         self.max_num_hands = max_num_hands
         self.min_detection_confidence = min_detection_confidence
         self.min_tracking_confidence = min_tracking_confidence
         self._hands = None
-        if mp:
-            self._hands = mp.solutions.hands.Hands(
-                static_image_mode=False,
-                max_num_hands=max_num_hands,
-                min_detection_confidence=min_detection_confidence,
-                min_tracking_confidence=min_tracking_confidence,
-            )
+        self._roi_hands = None
+        if backend is not None:
+            # Anything with process(rgb) -> results and close(), e.g. recording.ReplayHandsBackend
+            self._hands = backend
+        elif mp:
+            self._hands = self._new_hands()
         self._mp_hands = mp
         self._gesture_detector = None
+        self._recorder = None
+        self._inferences = 0
+        # ROI tracking state; replay backends locate frames by pixel tags and cannot be cropped
+        self.roi_policy = roi_policy or RoiPolicy()
+        if not getattr(self._hands, "supports_roi", True):
+            self.roi_policy.enabled = False
+        if self.roi_policy.enabled:
+            # An injected backend is used as is; MediaPipe gets a second graph for crops
+            self._roi_hands = self._new_hands() if backend is None else backend
+        self._roi = None  # (x0, y0, x1, y1) pixels in the full frame
+        self._locked_hands = 0
+        self._since_full = 0
+        self._roi_runs = 0
+        self._roi_fallbacks = 0
+        self._full_runs = 0
+        self._roi_time = 0.0
+        self._full_time = 0.0
+
+    def _new_hands(self):
+        return mp.solutions.hands.Hands(
+            static_image_mode=False,
+            max_num_hands=self.max_num_hands,
+            min_detection_confidence=self.min_detection_confidence,
+            min_tracking_confidence=self.min_tracking_confidence,
+        )
 
     def set_gesture_detector(self, detector):
         self._gesture_detector = detector
 
-    def process(self, frame_bgr):
+    def set_recorder(self, recorder):
+        """Record every inference result (recording.LandmarkRecorder); None to stop."""
+        self._recorder = recorder
+
+    def warm_up(self, shape=None):
+        """
+        Run one inference on a blank frame so graph setup and first-call allocation
+        happen now (on a startup thread) instead of on the first live frame.
+        The ROI graph, if any, gets a blank crop. Does not touch ROI state, the
+        recorder or stats.
+        """
+        if self._hands is None:
+            return
+        h, w = shape[:2] if shape else (config.CAMERA_HEIGHT, config.CAMERA_WIDTH)
+        self._hands.process(np.zeros((h, w, 3), dtype=np.uint8))
+        if self._roi_hands is not None and self._roi_hands is not self._hands:
+            side = min(self.roi_policy.max_side, h, w)
+            self._roi_hands.process(np.zeros((side, side, 3), dtype=np.uint8))
+
+    def process(self, frame_bgr, seq=None):
         """
         Process a BGR frame (e.g. from OpenCV). Returns multi_hand_landmarks and multi_handedness.
+        seq: optional frame sequence number (CameraCapture.borrow), passed to the recorder and
+        gesture detector. Callers skip frames they have already seen (see VisionWorker).
         """
         if self._hands is None:
             return None, None
-        rgb = cv2.cvtColor(frame_bgr, cv2.COLOR_BGR2RGB)
-        results = self._hands.process(rgb)
+        self._inferences += 1
+        results = None
+        policy = self.roi_policy
+        if policy.enabled and self._roi_hands is not None and self._roi is not None and self._since_full < policy.refresh_frames:
+            results = self._process_roi(frame_bgr)
+        if results is None:
+            results = self._process_full(frame_bgr)
+        if policy.enabled:
+            self._update_roi(results.multi_hand_landmarks, frame_bgr.shape)
+        if self._recorder:
+            self._recorder.write_results(results.multi_hand_landmarks, results.multi_handedness, seq=seq or 0)
         if self._gesture_detector and results.multi_hand_landmarks:
             self._gesture_detector.update(
                 results.multi_hand_landmarks,
                 results.multi_handedness,
+                seq=seq,
             )
         return results.multi_hand_landmarks, results.multi_handedness
 
+    def _process_full(self, frame_bgr):
+        t0 = time.perf_counter()
+        results = self._hands.process(cv2.cvtColor(frame_bgr, cv2.COLOR_BGR2RGB))
+        self._full_time += time.perf_counter() - t0
+        self._full_runs += 1
+        self._since_full = 0
+        return results
+
+    def _process_roi(self, frame_bgr):
+        """Run on the cropped ROI; None when fewer hands than locked were found (fall back)."""
+        t0 = time.perf_counter()
+        x0, y0, x1, y1 = self._roi
+        crop = frame_bgr[y0:y1, x0:x1]
+        cw, ch = x1 - x0, y1 - y0
+        scale = min(1.0, self.roi_policy.max_side / max(cw, ch))
+        if scale < 1.0:
+            crop = cv2.resize(crop, (max(1, int(cw * scale)), max(1, int(ch * scale))), interpolation=cv2.INTER_AREA)
+        results = self._roi_hands.process(cv2.cvtColor(crop, cv2.COLOR_BGR2RGB))
+        found = results.multi_hand_landmarks
+        if not found or len(found) < self._locked_hands:
+            # The wasted attempt is charged to ROI time so the reported speedup stays honest
+            self._roi_time += time.perf_counter() - t0
+            self._roi_fallbacks += 1
+            self._roi = None
+            return None
+        # Crop-normalized -> full-frame normalized (z shares x's scale in MediaPipe)
+        h, w = frame_bgr.shape[:2]
+        ox, oy, sx, sy = x0 / w, y0 / h, cw / w, ch / h
+        for hand in found:
+            for lm in hand.landmark:
+                lm.x = ox + lm.x * sx
+                lm.y = oy + lm.y * sy
+                lm.z = lm.z * sx
+        self._roi_time += time.perf_counter() - t0
+        self._roi_runs += 1
+        self._since_full += 1
+        return results
+
+    def _update_roi(self, multi_hand_landmarks, shape):
+        """Next crop: padded union of all hand boxes, or None to run full-frame."""
+        if not multi_hand_landmarks:
+            self._roi = None
+            self._locked_hands = 0
+            return
+        xs = [lm.x for hand in multi_hand_landmarks for lm in hand.landmark]
+        ys = [lm.y for hand in multi_hand_landmarks for lm in hand.landmark]
+        h, w = shape[:2]
+        policy = self.roi_policy
+        bx0, bx1, by0, by1 = min(xs) * w, max(xs) * w, min(ys) * h, max(ys) * h
+        pad = policy.padding * max(bx1 - bx0, by1 - by0)
+        q = policy.quantum
+        x0 = max(0, int((bx0 - pad) // q * q))
+        y0 = max(0, int((by0 - pad) // q * q))
+        x1 = min(w, int(-(-(bx1 + pad) // q) * q))
+        y1 = min(h, int(-(-(by1 + pad) // q) * q))
+        self._locked_hands = len(multi_hand_landmarks)
+        if x1 - x0 < q or y1 - y0 < q or (x1 - x0) * (y1 - y0) > policy.max_area * w * h:
+            self._roi = None
+            return
+        self._roi = (x0, y0, x1, y1)
+
+    @property
+    def roi(self):
+        """Current crop (x0, y0, x1, y1) in pixels, or None when running full-frame."""
+        return self._roi
+
+    def stats(self):
+        """Inferences run, plus ROI mode timings."""
+        full_ms = 1000.0 * self._full_time / self._full_runs if self._full_runs else 0.0
+        roi_ms = 1000.0 * self._roi_time / self._roi_runs if self._roi_runs else 0.0
+        return {
+            "inferences": self._inferences,
+            "roi_policy": self.roi_policy.as_dict(),
+            "full_frame_runs": self._full_runs,
+            "roi_runs": self._roi_runs,
+            "roi_fallbacks": self._roi_fallbacks,
+            "full_frame_ms": full_ms,
+            "roi_ms": roi_ms,
+            "roi_speedup": full_ms / roi_ms if roi_ms > 0 and full_ms > 0 else None,
+        }
+
     def draw_landmarks(self, frame_bgr, multi_hand_landmarks, multi_handedness):
         """Draw hand landmarks and connections on frame for debug overlay."""
         if not self._mp_hands or not multi_hand_landmarks:
@@ -72,5 +242,8 @@ class HandTracker:
         return frame_bgr
 
     def close(self):
+        if self._roi_hands is not None and self._roi_hands is not self._hands:
+            self._roi_hands.close()
+        self._roi_hands = None
         if self._hands:
             self._hands.close()
@@ -0,0 +1,329 @@
+"""
+Process-based multi-model vision executor.
+Runs HandTracker and YOLODetector (or any model factory) in separate worker
+processes so CPU inference overlaps despite the GIL. Frames travel through a
+multiprocessing.shared_memory ring (one memcpy, no pickling of arrays); results
+come back tagged with the frame sequence number and the caller keeps the newest
+result per model without ever waiting on the slower one. Each worker answers on
+its own pipe, so a worker that dies cannot wedge the others, and its pipe closing
+is how the executor notices.
+"""
+
+import multiprocessing as mp
+import time
+from multiprocessing.connection import wait as wait_connections
+from multiprocessing import shared_memory
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+import config
+
+import numpy as np
+
+
+def hands_model():
+    """Factory run inside the worker: frame -> ((hands, 21, 3) float32 array, labels)."""
+    from src.vision.hand_tracker import HandTracker
+    from src.vision.gesture_detector import landmarks_to_array
+
+    tracker = HandTracker(
+        min_detection_confidence=config.HAND_TRACKING_CONFIDENCE,
+        min_tracking_confidence=config.MIN_HAND_PRESENCE,
+    )
+    if config.STARTUP_WARMUP:
+        tracker.warm_up()
+
+    def run(frame):
+        landmarks, handedness = tracker.process(frame)
+        if not landmarks:
+            return np.empty((0, 21, 3), dtype=np.float32), []
+        labels = [h.classification[0].label if h.classification else "Right" for h in handedness or []]
+        n = min(len(landmarks), len(labels))
+        return landmarks_to_array(landmarks[:n]), labels[:n]
+
+    return run
+
+
+def yolo_model():
+    """
+    Factory run inside the worker: frame -> TRACK_DTYPE array (pickles as one buffer).
+    Full inference runs only every Nth frame; tracked boxes fill the frames in between.
+    """
+    from src.vision.yolo_detector import YOLODetector
+    from src.vision.detection_tracker import DetectionScheduler
+
+    detector = YOLODetector(confidence=config.YOLO_CONFIDENCE)
+    if config.STARTUP_WARMUP:
+        detector.warm_up()
+    scheduler = DetectionScheduler(detector)
+    return scheduler.process
+
+
+# Control messages travel on the worker's result pipe; they use negative slot numbers
+_READY = -1
+_FAILED = -2
+
+MODEL_FACTORIES = {
+    "hands": hands_model,
+    "yolo": yolo_model,
+}
+
+
+class SharedFrameRing:
+    """Fixed number of frame slots in one shared memory block."""
+
+    def __init__(self, shape, slots, dtype=np.uint8, name=None):
+        self.shape = tuple(shape)
+        self.slots = slots
+        self.dtype = np.dtype(dtype)
+        size = int(np.prod(self.shape)) * self.dtype.itemsize * slots
+        self._owner = name is None
+        self._shm = shared_memory.SharedMemory(name=name, create=self._owner, size=size if self._owner else 0)
+        self._array = np.ndarray((slots,) + self.shape, dtype=self.dtype, buffer=self._shm.buf)
+
+    @property
+    def name(self):
+        return self._shm.name
+
+    def write(self, slot, frame):
+        np.copyto(self._array[slot], frame)
+
+    def view(self, slot):
+        return self._array[slot]
+
+    def close(self):
+        self._array = None
+        self._shm.close()
+        if self._owner:
+            try:
+                self._shm.unlink()
+            except FileNotFoundError:
+                pass
+
+
+def _worker_main(name, factory, shm_name, shape, slots, jobs, results):
+    """Worker process loop: build the model once, then run it on each slot it is handed."""
+    ring = SharedFrameRing(shape, slots, name=shm_name)
+    try:
+        try:
+            run = factory()
+        except Exception as exc:
+            results.send((name, 0, 0.0, 0.0, _FAILED, exc))
+            return
+        results.send((name, 0, 0.0, 0.0, _READY, None))
+        while True:
+            job = jobs.recv()
+            if job is None:
+                break
+            slot, seq, timestamp = job
+            t0 = time.perf_counter()
+            try:
+                payload = run(ring.view(slot))
+            except Exception as exc:
+                payload = exc
+            results.send((name, seq, timestamp, time.perf_counter() - t0, slot, payload))
+    except (EOFError, KeyboardInterrupt):
+        pass
+    finally:
+        ring.close()
+
+
+class ModelResult:
+    """Newest output of one model, tagged with the frame it came from."""
+
+    __slots__ = ("model", "seq", "timestamp", "latency", "payload")
+
+    def __init__(self, model, seq, timestamp, latency, payload):
+        self.model = model
+        self.seq = seq
+        self.timestamp = timestamp
+        self.latency = latency
+        self.payload = payload
+
+
+class MultiModelExecutor:
+    """
+    One worker process per model. submit() hands a frame to every idle worker and
+    skips busy ones; poll()/latest() expose the newest result per model. poll() also
+    notices a worker that died (e.g. a native crash in the model), frees its slot and
+    respawns it up to VISION_PROCESS_MAX_RESTARTS times before reporting it failed.
+    """
+
+    def __init__(self, models=None, frame_shape=None, slots=None, factories=None):
+        self.models = tuple(models or config.VISION_PROCESS_MODELS)
+        self.frame_shape = tuple(frame_shape or (config.CAMERA_HEIGHT, config.CAMERA_WIDTH, 3))
+        self._factories = dict(MODEL_FACTORIES)
+        self._factories.update(factories or {})
+        # Every model can hold one slot while the newest frame is being written to another
+        self.slots = slots or len(self.models) + 1
+        self._ctx = mp.get_context("spawn")
+        self._ring = None
+        self._results = {}  # model -> receiving end of its result pipe
+        self._procs = {}
+        self._conns = {}
+        self._busy = {}  # model -> slot in use, or None
+        self._ready = set()
+        self._failed = {}  # model -> exception raised while building it
+        self._latest = {}
+        self.max_restarts = config.VISION_PROCESS_MAX_RESTARTS
+        self._counts = {m: {"submitted": 0, "completed": 0, "skipped_busy": 0, "errors": 0, "latency": 0.0,
+                            "restarts": 0} for m in self.models}
+
+    def start(self):
+        self._ring = SharedFrameRing(self.frame_shape, self.slots)
+        for name in self.models:
+            self._spawn(name)
+
+    def _spawn(self, name):
+        jobs_recv, jobs_send = self._ctx.Pipe(duplex=False)
+        results_recv, results_send = self._ctx.Pipe(duplex=False)
+        proc = self._ctx.Process(
+            target=_worker_main,
+            args=(name, self._factories[name], self._ring.name, self.frame_shape, self.slots, jobs_recv, results_send),
+            name=f"vision-{name}",
+            daemon=True,
+        )
+        proc.start()
+        # Only the child keeps these ends, so its exit closes the result pipe (EOF in poll())
+        jobs_recv.close()
+        results_send.close()
+        self._procs[name] = proc
+        self._conns[name] = jobs_send
+        self._results[name] = results_recv
+        self._busy[name] = None
+
+    def wait_ready(self, timeout=30.0):
+        """Block until every worker has built its model (or timeout). Returns True if all are ready."""
+        end = time.perf_counter() + timeout
+        while len(self._ready) + len(self._failed) < len(self.models) and time.perf_counter() < end:
+            self.poll(timeout=0.05)
+        return len(self._ready) == len(self.models)
+
+    def submit(self, frame, seq, timestamp=None, still_valid=None):
+        """
+        Copy frame into shared memory once and dispatch it to all idle, ready workers. Never blocks.
+        still_valid: optional seq -> bool checked after the copy (e.g. CameraCapture.is_valid for a
+        borrowed view); a frame overwritten mid-copy is not dispatched and submit returns 0.
+        """
+        idle = []
+        for m in self.models:
+            if m not in self._ready:
+                continue
+            if self._busy[m] is None:
+                idle.append(m)
+            else:
+                self._counts[m]["skipped_busy"] += 1
+        if not idle:
+            return 0
+        in_use = {s for s in self._busy.values() if s is not None}
+        slot = next(s for s in range(self.slots) if s not in in_use)
+        if frame.shape != self.frame_shape:
+            raise ValueError(f"frame shape {frame.shape} != executor shape {self.frame_shape}")
+        self._ring.write(slot, frame)
+        if still_valid is not None and not still_valid(seq):
+            return 0
+        ts = time.perf_counter() if timestamp is None else timestamp
+        for m in idle:
+            self._conns[m].send((slot, seq, ts))
+            self._busy[m] = slot
+            self._counts[m]["submitted"] += 1
+        return len(idle)
+
+    def poll(self, timeout=0.0):
+        """
+        Drain finished results; keeps only the newest seq per model. A worker whose pipe
+        closed has exited: its slot is freed and it is respawned or reported failed.
+        Returns number drained.
+        """
+        owners = {conn: name for name, conn in self._results.items()}
+        n = 0
+        for conn in wait_connections(list(owners), timeout):
+            name = owners[conn]
+            try:
+                while conn.poll():
+                    self._handle(conn.recv())
+                    n += 1
+            except (EOFError, OSError):
+                self._worker_exited(name)
+        return n
+
+    def _handle(self, item):
+        name, seq, timestamp, latency, slot, payload = item
+        if slot == _READY:
+            self._ready.add(name)
+            return
+        if slot == _FAILED:
+            self._failed[name] = payload
+            return
+        self._busy[name] = None
+        counts = self._counts[name]
+        if isinstance(payload, Exception):
+            counts["errors"] += 1
+            return
+        counts["completed"] += 1
+        counts["latency"] += latency
+        current = self._latest.get(name)
+        if current is None or seq > current.seq:
+            self._latest[name] = ModelResult(name, seq, timestamp, latency, payload)
+
+    def _worker_exited(self, name):
+        """Free the slot of a worker that exited without being stopped; respawn or report it."""
+        proc = self._procs.pop(name)
+        proc.join(timeout=1.0)
+        self._results.pop(name).close()
+        try:
+            self._conns.pop(name).close()
+        except OSError:
+            pass
+        self._busy[name] = None
+        self._ready.discard(name)
+        if name in self._failed:
+            return  # the model never built; _FAILED already carries the reason
+        counts = self._counts[name]
+        if counts["restarts"] >= self.max_restarts:
+            self._failed[name] = RuntimeError(
+                f"vision-{name} worker exited with code {proc.exitcode} after {counts['restarts']} restarts"
+            )
+            return
+        counts["restarts"] += 1
+        self._spawn(name)
+
+    def latest(self, model):
+        """Newest ModelResult for model, or None."""
+        return self._latest.get(model)
+
+    def stats(self):
+        out = {}
+        for m, c in self._counts.items():
+            res = self._latest.get(m)
+            out[m] = {
+                "ready": m in self._ready,
+                "error": repr(self._failed[m]) if m in self._failed else None,
+                "submitted": c["submitted"],
+                "completed": c["completed"],
+                "skipped_busy": c["skipped_busy"],
+                "errors": c["errors"],
+                "restarts": c["restarts"],
+                "mean_latency_ms": 1000.0 * c["latency"] / c["completed"] if c["completed"] else 0.0,
+                "latest_seq": res.seq if res else 0,
+            }
+        return out
+
+    def stop(self):
+        for name, conn in self._conns.items():
+            try:
+                conn.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+        for proc in self._procs.values():
+            proc.join(timeout=2.0)
+            if proc.is_alive():
+                proc.terminate()
+        for conn in self._results.values():
+            conn.close()
+        self._procs.clear()
+        self._conns.clear()
+        self._results.clear()
+        if self._ring:
+            self._ring.close()
+            self._ring = None
@@ -0,0 +1,370 @@
+"""
+Landmark recording and offline replay for the vision/gesture pipeline.
+Record MediaPipe landmarks once with a webcam, then benchmark HandTracker +
+GestureDetector headless by replaying them in place of the camera and model.
+
+File format (little endian): header "STTLMK1\\0", u16 version, u16 width, u16 height;
+then per frame f64 timestamp, u32 seq, u8 hand count, and per hand u8 handedness
+(0 = Left, 1 = Right) followed by 21 x 3 float32 landmarks.
+
+CLI:
+    python -m src.vision.recording record session.lmk --seconds 30
+    python -m src.vision.recording replay session.lmk [--realtime] [--loop N]
+"""
+
+import argparse
+import struct
+import time
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+import config
+
+import numpy as np
+from .gesture_detector import GestureDetector, HandState, NUM_LANDMARKS, landmarks_to_array
+
+MAGIC = b"STTLMK1\0"
+VERSION = 1
+_HEADER = struct.Struct("<8sHHH")
+_FRAME = struct.Struct("<dIB")
+_HAND_BYTES = 1 + NUM_LANDMARKS * 3 * 4
+_LABELS = ("Left", "Right")
+# Replay frames carry their recording index in the first pixels (same byte in all
+# channels, so BGR->RGB conversion does not disturb it)
+_TAG_PIXELS = 4
+
+
+class RecordedFrame:
+    """One recorded MediaPipe result: timestamp, camera seq, (hands, 21, 3) landmarks, labels."""
+
+    __slots__ = ("timestamp", "seq", "hands", "labels")
+
+    def __init__(self, timestamp, seq, hands, labels):
+        self.timestamp = timestamp
+        self.seq = seq
+        self.hands = hands
+        self.labels = labels
+
+
+class LandmarkRecorder:
+    """Append landmark frames to a compact binary file."""
+
+    def __init__(self, path, width=None, height=None):
+        self.path = path
+        self.frames = 0
+        self._fh = open(path, "wb")
+        self._fh.write(_HEADER.pack(MAGIC, VERSION, width or config.CAMERA_WIDTH, height or config.CAMERA_HEIGHT))
+
+    def write(self, timestamp, seq, hands, labels):
+        """hands: (n, 21, 3) array-like; labels: n handedness strings."""
+        n = min(len(hands), len(labels))
+        parts = [_FRAME.pack(timestamp, seq & 0xFFFFFFFF, n)]
+        if n:
+            arr = np.ascontiguousarray(hands[:n], dtype="<f4")
+            for i in range(n):
+                parts.append(bytes((0 if labels[i] == "Left" else 1,)))
+                parts.append(arr[i].tobytes())
+        self._fh.write(b"".join(parts))
+        self.frames += 1
+
+    def write_results(self, multi_hand_landmarks, multi_handedness, seq=0, timestamp=None):
+        """Record raw MediaPipe results (None/empty means no hands in this frame)."""
+        timestamp = time.perf_counter() if timestamp is None else timestamp
+        if not multi_hand_landmarks:
+            self.write(timestamp, seq, (), ())
+            return
+        labels = []
+        for h in multi_handedness or []:
+            labels.append(h.classification[0].label if getattr(h, "classification", None) else "Right")
+        n = min(len(multi_hand_landmarks), len(labels))
+        self.write(timestamp, seq, landmarks_to_array(multi_hand_landmarks[:n]), labels[:n])
+
+    def close(self):
+        if self._fh:
+            self._fh.close()
+            self._fh = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def load_recording(path):
+    """Read a recording. Returns (frames, (width, height))."""
+    with open(path, "rb") as fh:
+        data = fh.read()
+    magic, version, width, height = _HEADER.unpack_from(data, 0)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"{path}: not a landmark recording (version {VERSION})")
+    frames = []
+    off = _HEADER.size
+    while off + _FRAME.size <= len(data):
+        timestamp, seq, n = _FRAME.unpack_from(data, off)
+        off += _FRAME.size
+        hands = np.empty((n, NUM_LANDMARKS, 3), dtype=np.float32)
+        labels = []
+        for i in range(n):
+            labels.append(_LABELS[data[off]])
+            hands[i] = np.frombuffer(data, dtype="<f4", count=NUM_LANDMARKS * 3, offset=off + 1).reshape(NUM_LANDMARKS, 3)
+            off += _HAND_BYTES
+        frames.append(RecordedFrame(timestamp, seq, hands, labels))
+    return frames, (width, height)
+
+
+class ReplayCapture:
+    """
+    cv2.VideoCapture stand-in for CameraCapture(source=...). Emits blank frames tagged
+    with their recording index, either as fast as possible or at the recorded pace.
+    """
+
+    def __init__(self, frames, width=None, height=None, realtime=False, loops=1):
+        self.frames = frames
+        self.width = width or config.CAMERA_WIDTH
+        self.height = height or config.CAMERA_HEIGHT
+        self.realtime = realtime
+        self.loops = loops
+        self._index = 0
+        self._t0 = None
+        self._opened = True
+
+    def isOpened(self):
+        return self._opened
+
+    def set(self, prop, value):
+        return True
+
+    def read(self, image=None):
+        total = len(self.frames) * self.loops
+        if not self._opened or self._index >= total:
+            self._opened = False
+            return False, None
+        i = self._index % len(self.frames)
+        if self.realtime:
+            frame = self.frames[i]
+            if self._t0 is None or i == 0:
+                self._t0 = time.perf_counter() - (frame.timestamp - self.frames[0].timestamp)
+            delay = self._t0 + (frame.timestamp - self.frames[0].timestamp) - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+        shape = (self.height, self.width, 3)
+        if image is None or image.shape != shape:
+            image = np.zeros(shape, dtype=np.uint8)
+        tag = i.to_bytes(_TAG_PIXELS, "little")
+        for c in range(_TAG_PIXELS):
+            image[0, c, :] = tag[c]
+        self._index += 1
+        return True, image
+
+    def release(self):
+        self._opened = False
+
+
+class _Landmark:
+    __slots__ = ("x", "y", "z")
+
+    def __init__(self, x, y, z):
+        self.x, self.y, self.z = x, y, z
+
+
+class _LandmarkList:
+    __slots__ = ("landmark",)
+
+    def __init__(self, points):
+        self.landmark = [_Landmark(x, y, z) for x, y, z in points]
+
+
+class _Category:
+    __slots__ = ("label",)
+
+    def __init__(self, label):
+        self.label = label
+
+
+class _Classification:
+    __slots__ = ("classification",)
+
+    def __init__(self, label):
+        self.classification = [_Category(label)]
+
+
+class _Results:
+    __slots__ = ("multi_hand_landmarks", "multi_handedness")
+
+    def __init__(self, multi_hand_landmarks, multi_handedness):
+        self.multi_hand_landmarks = multi_hand_landmarks
+        self.multi_handedness = multi_handedness
+
+
+class ReplayHandsBackend:
+    """
+    Drop-in for mediapipe Hands in HandTracker(backend=...): returns the recorded
+    landmarks for the frame tagged by ReplayCapture, in MediaPipe's result layout.
+    """
+
+    supports_roi = False  # the frame tag lives in the top-left pixels, which a crop would drop
+
+    def __init__(self, frames):
+        self._results = []
+        for f in frames:
+            if len(f.hands):
+                self._results.append(_Results(
+                    [_LandmarkList(h.tolist()) for h in f.hands],
+                    [_Classification(label) for label in f.labels],
+                ))
+            else:
+                self._results.append(_Results(None, None))
+
+    def process(self, rgb):
+        index = int.from_bytes(bytes(rgb[0, :_TAG_PIXELS, 0].tolist()), "little")
+        return self._results[index % len(self._results)]
+
+    def close(self):
+        pass
+
+
+class RecordedClock:
+    """
+    Gesture clock for replays: reads the recorded timestamp of the frame being
+    replayed, so z velocity and fire cooldowns match the session rather than the
+    replay speed. Each extra loop is shifted by the recording's span so time
+    keeps moving forward.
+    """
+
+    def __init__(self, frames):
+        self.frames = frames
+        first, last = frames[0].timestamp, frames[-1].timestamp
+        step = (last - first) / (len(frames) - 1) if len(frames) > 1 else 1.0 / 30  # mean frame interval
+        self.span = last - first + step
+        self.now = first
+
+    def __call__(self):
+        return self.now
+
+    def seek(self, index):
+        """Move to replayed frame index (counting across loops); returns its recorded frame."""
+        loop, i = divmod(index, len(self.frames))
+        frame = self.frames[i]
+        self.now = frame.timestamp + loop * self.span
+        return frame
+
+
+def _percentiles(samples, qs=(50, 95, 99)):
+    if not samples:
+        return {f"p{q}": 0.0 for q in qs}
+    arr = np.asarray(samples) * 1000.0
+    return {f"p{q}": float(np.percentile(arr, q)) for q in qs}
+
+
+def replay(path, realtime=False, loops=1, timeline=True):
+    """Run the recording through CameraCapture -> HandTracker -> GestureDetector synchronously."""
+    from .camera import CameraCapture
+    from .hand_tracker import HandTracker
+
+    frames, (width, height) = load_recording(path)
+    if not frames:
+        raise ValueError(f"{path}: recording has no frames")
+    camera = CameraCapture(width=width, height=height, source=ReplayCapture(frames, width, height, realtime, loops))
+    camera.open()
+    tracker = HandTracker(backend=ReplayHandsBackend(frames))
+    clock = RecordedClock(frames)
+    detector = GestureDetector(
+        pull_back_threshold=config.PULL_BACK_THRESHOLD, smoothing=config.GESTURE_SMOOTHING, clock=clock,
+    )
+    stages = {"read": [], "track": [], "gesture": [], "total": []}
+    events = []
+    last = (HandState.IDLE, HandState.IDLE)
+    t_start = time.perf_counter()
+    processed = 0
+    while True:
+        t0 = time.perf_counter()
+        if not camera.grab():
+            break
+        frame, seq, _ = camera.borrow()
+        t1 = time.perf_counter()
+        landmarks, handedness = tracker.process(frame, seq=seq)
+        t2 = time.perf_counter()
+        clock.seek(seq - 1)
+        if landmarks:
+            detector.update(landmarks, handedness, seq=seq)
+        t3 = time.perf_counter()
+        stages["read"].append(t1 - t0)
+        stages["track"].append(t2 - t1)
+        stages["gesture"].append(t3 - t2)
+        stages["total"].append(t3 - t0)
+        processed += 1
+        state = (detector.get_left_state(), detector.get_right_state())
+        if timeline and state != last:
+            # The clock's running time, so later loops follow the first instead of restarting at 0
+            events.append((clock() - frames[0].timestamp, state))
+            last = state
+    elapsed = time.perf_counter() - t_start
+    camera.stop()
+    return {
+        "frames": processed,
+        "seconds": elapsed,
+        "fps": processed / elapsed if elapsed > 0 else 0.0,
+        "stages_ms": {name: _percentiles(v) for name, v in stages.items()},
+        "events": events,
+    }
+
+
+def record(path, seconds):
+    """Record landmarks from the live webcam through HandTracker for the given duration."""
+    from .camera import CameraCapture
+    from .hand_tracker import HandTracker
+
+    camera = CameraCapture()
+    tracker = HandTracker(
+        min_detection_confidence=config.HAND_TRACKING_CONFIDENCE,
+        min_tracking_confidence=config.MIN_HAND_PRESENCE,
+    )
+    camera.start()
+    last_seq = 0
+    with LandmarkRecorder(path, camera.width, camera.height) as rec:
+        tracker.set_recorder(rec)
+        end = time.perf_counter() + seconds
+        while time.perf_counter() < end:
+            frame, seq, _ = camera.borrow()
+            if frame is None or seq == last_seq:
+                time.sleep(0.002)
+                continue
+            last_seq = seq
+            tracker.process(frame, seq=seq)
+        frames = rec.frames
+    camera.stop()
+    tracker.close()
+    return frames
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Record or replay hand landmarks for offline benchmarking.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_rec = sub.add_parser("record", help="record landmarks from the webcam")
+    p_rec.add_argument("path")
+    p_rec.add_argument("--seconds", type=float, default=30.0)
+    p_rep = sub.add_parser("replay", help="replay a recording and report throughput and latency")
+    p_rep.add_argument("path")
+    p_rep.add_argument("--realtime", action="store_true", help="pace frames at the recorded timestamps")
+    p_rep.add_argument("--loop", type=int, default=1, help="replay the recording N times")
+    p_rep.add_argument("--no-timeline", action="store_true", help="do not print gesture events")
+    args = parser.parse_args(argv)
+
+    if args.command == "record":
+        n = record(args.path, args.seconds)
+        print(f"Recorded {n} frames to {args.path}")
+        return
+    report = replay(args.path, realtime=args.realtime, loops=args.loop, timeline=not args.no_timeline)
+    print(f"{report['frames']} frames in {report['seconds']:.3f} s -> {report['fps']:.1f} frames/s")
+    print(f"{'stage':<10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for name, p in report["stages_ms"].items():
+        print(f"{name:<10}{p['p50']:>10.3f}{p['p95']:>10.3f}{p['p99']:>10.3f}")
+    if report["events"]:
+        print("gesture timeline (s, left, right):")
+        for t, (left, right) in report["events"]:
+            print(f"  {t:8.3f}  {left.name:<10} {right.name}")
+
+
+if __name__ == "__main__":
+    main()
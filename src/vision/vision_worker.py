@@ -0,0 +1,269 @@
+"""
+Background vision worker: camera read, hand tracking and gesture detection off the render thread.
+The newest gesture snapshot is published to a latest-wins slot that the game loop reads in O(1).
+With VISION_MULTIPROCESS the models run in worker processes (model_executor) and the
+thread only moves frames and results.
+"""
+
+import threading
+import time
+from collections import deque
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+import config
+
+from .camera import CameraCapture
+from .hand_tracker import HandTracker
+from .gesture_detector import GestureDetector
+from .model_executor import MultiModelExecutor
+
+
+STAGES = ("read", "track", "gesture", "total", "capture_to_publish")
+
+
+class GestureSnapshot:
+    """Immutable result of one vision pass. Fire counters are cumulative so no shot is lost between reads."""
+
+    __slots__ = (
+        "seq", "timestamp", "frame_seq", "capture_time",
+        "left_state", "right_state",
+        "left_aim", "right_aim",
+        "left_fires", "right_fires",
+        "detections", "detections_seq",
+    )
+
+    def __init__(
+        self, seq, timestamp, left_state, right_state, left_aim, right_aim,
+        left_fires, right_fires, frame_seq=0, capture_time=0.0,
+        detections=None, detections_seq=0,
+    ):
+        self.seq = seq
+        self.timestamp = timestamp
+        self.frame_seq = frame_seq
+        self.capture_time = capture_time
+        self.left_state = left_state
+        self.right_state = right_state
+        self.left_aim = left_aim
+        self.right_aim = right_aim
+        self.left_fires = left_fires
+        self.right_fires = right_fires
+        # Newest YOLO output (multi-process mode with "yolo" enabled) and its frame seq
+        self.detections = detections
+        self.detections_seq = detections_seq
+
+    def age(self, now=None):
+        """Seconds since the snapshot was published."""
+        return (now if now is not None else time.perf_counter()) - self.timestamp
+
+
+class VisionWorker:
+    """Owns CameraCapture, HandTracker and GestureDetector and runs them on a daemon thread."""
+
+    def __init__(self, camera=None, hand_tracker=None, gesture_detector=None, stats_window=None, executor=None,
+                 profiler=None):
+        self.camera = camera or CameraCapture()
+        self.profiler = profiler  # optional FrameProfiler; stage spans go to its trace as vision.*
+        self.gesture_detector = gesture_detector or GestureDetector(
+            pull_back_threshold=config.PULL_BACK_THRESHOLD,
+            smoothing=config.GESTURE_SMOOTHING,
+        )
+        # Multi-process mode: models live in worker processes, created on the first frame
+        self.executor = executor
+        self._use_processes = executor is not None or (config.VISION_MULTIPROCESS and hand_tracker is None)
+        self.hand_tracker = hand_tracker
+        if self.hand_tracker is None and not self._use_processes:
+            self.hand_tracker = HandTracker(
+                min_detection_confidence=config.HAND_TRACKING_CONFIDENCE,
+                min_tracking_confidence=config.MIN_HAND_PRESENCE,
+            )
+        if self.hand_tracker is not None:
+            # The worker drives the detector itself so gesture time is measured separately
+            self.hand_tracker.set_gesture_detector(None)
+        window = stats_window or config.VISION_STATS_WINDOW
+        self._latencies = {name: deque(maxlen=window) for name in STAGES}
+        self._snapshot = None  # latest-wins slot: a single reference swap, atomic under the GIL
+        self._running = False
+        self._thread = None
+        self._seq = 0
+        self._started_at = 0.0
+        self._frame_seq = 0
+        self._camera_skipped = 0  # camera frames overwritten before the worker got to them
+        self._duplicate_polls = 0  # polls that found no new frame and skipped inference
+        self._inferences = 0  # new frames run through the hand model (or dispatched to the model processes)
+        self._stale_frames = 0  # borrowed frames overwritten by the camera during inference, results dropped
+        self._hands_seq = 0
+        # Reader-side counters (touched only by the thread calling latest())
+        self._last_read_seq = 0
+        self._consumed = 0
+        self._dropped = 0
+
+    def start(self):
+        """Start the camera and the worker thread. Raises if the camera cannot be opened."""
+        if self._running:
+            return
+        self.camera.start()
+        self._running = True
+        self._started_at = time.perf_counter()
+        target = self._run_processes if self._use_processes else self._run
+        self._thread = threading.Thread(target=target, name="vision-worker", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        detector = self.gesture_detector
+        while self._running:
+            t0 = time.perf_counter()
+            frame, frame_seq, captured = self.camera.borrow()
+            t1 = time.perf_counter()
+            if frame is None or frame_seq == self._frame_seq:
+                # No new camera frame: nothing to infer, wait for the next one
+                if frame is not None:
+                    self._duplicate_polls += 1
+                time.sleep(config.VISION_IDLE_SLEEP)
+                continue
+            if self._frame_seq:
+                self._camera_skipped += max(0, frame_seq - self._frame_seq - 1)
+            self._frame_seq = frame_seq
+            self._inferences += 1
+            landmarks, handedness = self.hand_tracker.process(frame, seq=frame_seq)
+            if not self.camera.is_valid(frame_seq):
+                # The capture thread lapped the ring while we read the view: the result may be torn
+                self._stale_frames += 1
+                continue
+            t2 = time.perf_counter()
+            # Called with no hands too, so a lost hand goes IDLE instead of holding its last state
+            detector.update(landmarks, handedness, seq=frame_seq)
+            t3 = time.perf_counter()
+            self._publish(frame_seq, captured, t3)
+            lat = self._latencies
+            lat["read"].append(t1 - t0)
+            lat["track"].append(t2 - t1)
+            lat["gesture"].append(t3 - t2)
+            lat["total"].append(t3 - t0)
+            if self.profiler is not None:
+                self.profiler.record("vision.read", t0, t1)
+                self.profiler.record("vision.track", t1, t2)
+                self.profiler.record("vision.gesture", t2, t3)
+            # Yield the GIL so the render thread is never starved between inferences
+            time.sleep(0)
+
+    def _run_processes(self):
+        """Submit new frames to the model processes; publish whenever a newer hand result lands."""
+        detector = self.gesture_detector
+        while self._running:
+            t0 = time.perf_counter()
+            frame, frame_seq, captured = self.camera.borrow()
+            if frame is not None and frame_seq != self._frame_seq:
+                if self.executor is None:
+                    self.executor = MultiModelExecutor(frame_shape=frame.shape)
+                    self.executor.start()
+                if self._frame_seq:
+                    self._camera_skipped += max(0, frame_seq - self._frame_seq - 1)
+                self._frame_seq = frame_seq
+                # Busy models skip this frame; the copy into shared memory is the only cost here
+                sent = self.executor.submit(frame, frame_seq, captured, still_valid=self.camera.is_valid)
+                if sent:
+                    self._inferences += 1
+                elif not self.camera.is_valid(frame_seq):
+                    self._stale_frames += 1  # lapped during the copy: not dispatched
+            elif frame is not None:
+                self._duplicate_polls += 1
+            t1 = time.perf_counter()
+            if self.executor is None:
+                time.sleep(config.VISION_IDLE_SLEEP)
+                continue
+            self.executor.poll(timeout=config.VISION_IDLE_SLEEP)
+            hands = self.executor.latest("hands")
+            if hands is None or hands.seq == self._hands_seq:
+                continue
+            self._hands_seq = hands.seq
+            t2 = time.perf_counter()
+            landmarks, labels = hands.payload
+            detector.update_array(landmarks, labels, seq=hands.seq)
+            t3 = time.perf_counter()
+            yolo = self.executor.latest("yolo")
+            self._publish(
+                hands.seq, hands.timestamp, t3,
+                detections=yolo.payload if yolo else None,
+                detections_seq=yolo.seq if yolo else 0,
+            )
+            lat = self._latencies
+            lat["read"].append(t1 - t0)
+            lat["track"].append(hands.latency)
+            lat["gesture"].append(t3 - t2)
+            lat["total"].append(t3 - hands.timestamp)
+            if self.profiler is not None:
+                self.profiler.record("vision.submit", t0, t1)
+                self.profiler.record("vision.gesture", t2, t3)
+
+    def _publish(self, frame_seq, captured, now, detections=None, detections_seq=0):
+        detector = self.gesture_detector
+        self._seq += 1
+        # Fire counts come from the detector: one per shot, however many frames show FIRING
+        self._snapshot = GestureSnapshot(
+            self._seq, now,
+            detector.get_left_state(), detector.get_right_state(),
+            detector.get_left_aim(), detector.get_right_aim(),
+            detector.get_left_fires(), detector.get_right_fires(),
+            frame_seq, captured, detections, detections_seq,
+        )
+        self._latencies["capture_to_publish"].append(now - captured)
+
+    def latest(self):
+        """Newest GestureSnapshot or None. Constant time; never blocks on inference."""
+        snap = self._snapshot
+        if snap is not None and snap.seq != self._last_read_seq:
+            self._dropped += max(0, snap.seq - self._last_read_seq - 1)
+            self._last_read_seq = snap.seq
+            self._consumed += 1
+        return snap
+
+    def stats(self):
+        """Per-stage latency (ms) and throughput counters for the vision pipeline."""
+        elapsed = time.perf_counter() - self._started_at if self._started_at else 0.0
+        stages = {}
+        for name, values in self._latencies.items():
+            samples = sorted(values)
+            if not samples:
+                stages[name] = {"mean_ms": 0.0, "p95_ms": 0.0, "max_ms": 0.0}
+                continue
+            stages[name] = {
+                "mean_ms": 1000.0 * sum(samples) / len(samples),
+                "p95_ms": 1000.0 * samples[min(len(samples) - 1, int(len(samples) * 0.95))],
+                "max_ms": 1000.0 * samples[-1],
+            }
+        snap = self._snapshot
+        polls = self._duplicate_polls + self._inferences
+        return {
+            "published": self._seq,
+            "consumed": self._consumed,
+            "dropped": self._dropped,
+            "camera_frames_skipped": self._camera_skipped,
+            "duplicate_polls": self._duplicate_polls,
+            "inferences": self._inferences,
+            # Share of polls that found no new frame, i.e. inference calls the seq check saved
+            "inference_saved_ratio": self._duplicate_polls / polls if polls else 0.0,
+            "stale_frames": self._stale_frames,
+            "vision_fps": self._seq / elapsed if elapsed > 0 else 0.0,
+            "snapshot_age_ms": 1000.0 * snap.age() if snap is not None else None,
+            "stages": stages,
+            "hand_tracker": self.hand_tracker.stats() if self.hand_tracker else None,
+            "gesture_detector": self.gesture_detector.stats(),
+            "executor": self.executor.stats() if self.executor else None,
+        }
+
+    def is_running(self):
+        return self._running
+
+    def stop(self):
+        self._running = False
+        if self._thread:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+        try:
+            self.camera.stop()
+        finally:
+            if self.executor:
+                self.executor.stop()
+            if self.hand_tracker:
+                self.hand_tracker.close()
@@ -1,6 +1,8 @@
 """
 YOLO11 detector for real-time object detection (AI showcase).
 Runs on GPU when available; can overlay detections on camera feed.
+Results are pulled off the device in one transfer per frame into a structured
+NumPy array (DETECTION_DTYPE); detect() keeps the original list-of-dicts view.
 """
 
 import numpy as np
@@ -17,6 +19,52 @@ try:
 except ImportError:
     YOLO = None
 
+DETECTION_DTYPE = np.dtype([
+    ("x1", np.float32), ("y1", np.float32), ("x2", np.float32), ("y2", np.float32),
+    ("class_id", np.int32), ("confidence", np.float32),
+])
+
+
+def boxes_to_array(boxes):
+    """
+    Convert an ultralytics Boxes object to a DETECTION_DTYPE array with a single
+    device-to-host copy of boxes.data (rows of x1, y1, x2, y2, conf, cls).
+    """
+    if boxes is None or len(boxes) == 0:
+        return np.empty(0, dtype=DETECTION_DTYPE)
+    data = boxes.data
+    if hasattr(data, "cpu"):
+        data = data.cpu().numpy()
+    data = np.asarray(data)
+    out = np.empty(len(data), dtype=DETECTION_DTYPE)
+    out["x1"] = data[:, 0]
+    out["y1"] = data[:, 1]
+    out["x2"] = data[:, 2]
+    out["y2"] = data[:, 3]
+    out["confidence"] = data[:, 4]
+    out["class_id"] = data[:, 5]
+    return out
+
+
+def detections_to_dicts(detections, names):
+    """
+    List-of-dicts view of a DETECTION_DTYPE array (the format detect() has always returned).
+    Tracked arrays (detection_tracker.TRACK_DTYPE) also carry "track_id".
+    """
+    out = []
+    for row in detections.tolist():
+        x1, y1, x2, y2, cid, conf = row[:6]
+        d = {
+            "bbox": (x1, y1, x2, y2),
+            "class_id": cid,
+            "class_name": names.get(cid, "?"),
+            "confidence": conf,
+        }
+        if len(row) > 6:
+            d["track_id"] = row[6]
+        out.append(d)
+    return out
+
 
 class YOLODetector:
     """YOLO11-based object detector for optional AR/overlay effects."""
@@ -26,46 +74,57 @@ class YOLODetector:
         self.device = device or config.YOLO_DEVICE
         self.confidence = confidence or config.YOLO_CONFIDENCE
         self._model = None
+        self.names = {}
         if YOLO_AVAILABLE and YOLO is not None:
             try:
                 self._model = YOLO(self.model_name)
             except Exception:
                 self._model = YOLO("yolo11n.pt")
+            self.names = dict(getattr(self._model, "names", None) or {})
+        # Resolved once: torch import and CUDA probing are not free per frame
+        self._run_device = self.device if self._device_available() else "cpu"
+
+    def _infer(self, source):
+        try:
+            return self._model(source, conf=self.confidence, device=self._run_device, verbose=False)
+        except Exception:
+            return self._model(source, conf=self.confidence, verbose=False)
+
+    def warm_up(self, shape=None):
+        """One inference on a blank frame so weights land on the device before the first live frame."""
+        if self._model is None:
+            return
+        h, w = shape[:2] if shape else (config.CAMERA_HEIGHT, config.CAMERA_WIDTH)
+        self._infer(np.zeros((h, w, 3), dtype=np.uint8))
+
+    def detect_array(self, frame_bgr):
+        """Run detection on a BGR frame. Returns a DETECTION_DTYPE structured array."""
+        if self._model is None:
+            return np.empty(0, dtype=DETECTION_DTYPE)
+        results = self._infer(frame_bgr)
+        if not results:
+            return np.empty(0, dtype=DETECTION_DTYPE)
+        r = results[0]
+        if not self.names and getattr(r, "names", None):
+            self.names = dict(r.names)
+        return boxes_to_array(r.boxes)
+
+    def detect_batch(self, frames_bgr):
+        """Run one batched inference over a list of BGR frames. Returns one array per frame."""
+        if self._model is None or not frames_bgr:
+            return [np.empty(0, dtype=DETECTION_DTYPE) for _ in frames_bgr]
+        results = self._infer(list(frames_bgr))
+        out = [boxes_to_array(r.boxes) for r in results]
+        if not self.names and results and getattr(results[0], "names", None):
+            self.names = dict(results[0].names)
+        return out
 
     def detect(self, frame_bgr):
         """
         Run detection on BGR frame. Returns list of detections:
         [{bbox: (x1,y1,x2,y2), class_id, class_name, confidence}, ...]
         """
-        if self._model is None:
-            return []
-        try:
-            results = self._model(
-                frame_bgr,
-                conf=self.confidence,
-                device=self.device if self._device_available() else "cpu",
-                verbose=False,
-            )
-        except Exception:
-            results = self._model(frame_bgr, conf=self.confidence, verbose=False)
-        out = []
-        if not results or len(results) == 0:
-            return out
-        r = results[0]
-        if r.boxes is None:
-            return out
-        for box in r.boxes:
-            xyxy = box.xyxy[0].cpu().numpy()
-            cid = int(box.cls[0].item())
-            conf = float(box.conf[0].item())
-            name = r.names.get(cid, "?")
-            out.append({
-                "bbox": tuple(map(float, xyxy)),
-                "class_id": cid,
-                "class_name": name,
-                "confidence": conf,
-            })
-        return out
+        return detections_to_dicts(self.detect_array(frame_bgr), self.names)
 
     def _device_available(self):
         try:
@@ -75,10 +134,14 @@ class YOLODetector:
             return False
 
     def draw_detections(self, frame_bgr, detections, color=(0, 255, 0), thickness=2):
-        """Draw bounding boxes and labels on frame."""
+        """Draw bounding boxes and labels on frame (dict list or DETECTION_DTYPE array)."""
+        if isinstance(detections, np.ndarray):
+            detections = detections_to_dicts(detections, self.names)
         for d in detections:
             x1, y1, x2, y2 = map(int, d["bbox"])
             label = f"{d['class_name']} {d['confidence']:.2f}"
+            if "track_id" in d:
+                label = f"#{d['track_id']} {label}"
             cv2.rectangle(frame_bgr, (x1, y1), (x2, y2), color, thickness)
             cv2.putText(
                 frame_bgr, label, (x1, max(0, y1 - 8)),